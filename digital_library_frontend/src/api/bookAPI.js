@@ -7,25 +7,25 @@
       {
         title: 'A Revolução dos Bichos',
         author: 'George Orwell',
-        isbn: '978-85-3590-951-1',
+        isbn: '978-85-3590-951-7',
         read: false,
       },
       {
         title: '1984',
         author: 'George Orwell',
-        isbn: '978-85-3591-482-9',
+        isbn: '978-85-3591-482-5',
         read: true,
       },
       {
         title: 'O Pequeno Príncipe',
         author: 'Antoine de Saint-Exupéry',
-        isbn: '978-85-7827-024-8',
+        isbn: '978-85-7827-024-7',
         read: false,
       },
       {
         title: 'Dom Quixote',
         author: 'Miguel de Cervantes',
-        isbn: '978-8572322521',
+        isbn: '978-8572322522',
         read: false,
       },
     ];
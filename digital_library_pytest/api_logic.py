@@ -1,25 +1,198 @@
 # digital_library_pytest/api_logic.py
 
-from .book_manager import BookManager
+import os
+import threading
+
+from . import metrics
+from .book_manager import DEFAULT_PAGE_SIZE, BookManager
 from .book import Book
+from .concurrent_manager import ShardedBookManager
+from .persistence import PersistentBookManager, load_snapshot
+from .process_manager import ProcessShardedBookManager
+from .serialization import books_json, encode_json, response_json
+from .sqlite_manager import SQLiteBookManager
+
+# Diretório de dados da biblioteca. Quando definido, o gerenciador grava cada operação
+# em um log durável (com snapshots periódicos) e sobrevive a reinícios do processo.
+DATA_DIR_ENV = "DIGITAL_LIBRARY_DATA_DIR"
+
+# Caminho de um banco SQLite. Quando definido, os livros ficam no banco em vez de na
+# memória, permitindo catálogos maiores que a RAM. Tem precedência sobre DATA_DIR_ENV.
+DATABASE_ENV = "DIGITAL_LIBRARY_DB"
+
+# Quantidade de shards. Quando definida (e sem armazenamento configurado acima), a
+# biblioteca em memória é particionada e protegida por locks, para servidores que
+# atendem requisições em várias threads.
+SHARDS_ENV = "DIGITAL_LIBRARY_SHARDS"
+
+# Quantidade de processos. Quando definida (e sem armazenamento configurado acima), a
+# biblioteca é particionada entre processos, cada um com um shard, para que buscas,
+# ordenações e serialização usem vários núcleos em vez de disputar o GIL.
+# Tem precedência sobre DIGITAL_LIBRARY_SHARDS.
+PROCESSES_ENV = "DIGITAL_LIBRARY_PROCESSES"
+
+# Quando "1", a biblioteca em memória (simples ou persistente) usa o armazenamento
+# colunar, que ocupa bem menos memória por livro em catálogos grandes.
+COMPACT_ENV = "DIGITAL_LIBRARY_COMPACT"
+
+
+def _create_library_manager():
+    """
+    Cria o gerenciador usado pela API de acordo com a configuração do ambiente:
+    SQLite se DIGITAL_LIBRARY_DB estiver definido, persistente em log/snapshot se
+    DIGITAL_LIBRARY_DATA_DIR estiver definido, particionado entre processos se
+    DIGITAL_LIBRARY_PROCESSES estiver definido, particionado e seguro para threads se
+    DIGITAL_LIBRARY_SHARDS estiver definido e em memória caso contrário.
+    Todas as variantes expõem os mesmos métodos, então as funções da API não mudam.
+    """
+    database = os.environ.get(DATABASE_ENV)
+    if database:
+        return SQLiteBookManager(database)
+    compact = os.environ.get(COMPACT_ENV) == "1"
+    data_dir = os.environ.get(DATA_DIR_ENV)
+    if data_dir:
+        return PersistentBookManager(data_dir, compact=compact)
+    processes = os.environ.get(PROCESSES_ENV)
+    if processes:
+        return ProcessShardedBookManager(int(processes))
+    shards = os.environ.get(SHARDS_ENV)
+    if shards:
+        return ShardedBookManager(int(shards))
+    return BookManager(compact)
+
+
+# Caminho de um snapshot (veja persistence.write_snapshot) carregado na primeira
+# inicialização de uma biblioteca vazia, no lugar dos livros de exemplo.
+SNAPSHOT_ENV = "DIGITAL_LIBRARY_SNAPSHOT"
+
+# Livros de exemplo para simular um estado inicial do "backend".
+# Isso garante que a UI já tenha alguns dados para exibir ao carregar.
+_SEED_BOOKS = (
+    ("A Revolução dos Bichos", "George Orwell", "978-85-359-0955-5"),
+    ("1984", "George Orwell", "978-85-359-1484-9"),
+    ("Admirável Mundo Novo", "Aldous Huxley", "978-85-250-5600-9"),
+    ("O Senhor dos Anéis", "J.R.R. Tolkien", "978-85-336-1337-9"),
+)
 
 # Simula uma instância "global" do gerenciador de livros para as operações da API.
 # Em um cenário real, esta instância seria gerenciada por um framework web (Flask, FastAPI)
 # e potencialmente interagiria com um banco de dados.
-library_manager = BookManager()
+# É criada apenas no primeiro uso da API (veja get_library_manager), para que importar
+# este módulo não pague pela carga do catálogo; use sempre get_library_manager().
+library_manager = None
+_init_lock = threading.Lock()
 
-# Adiciona alguns livros iniciais para simular um estado inicial do "backend"
-# Isso garante que a UI já tenha alguns dados para exibir ao carregar.
-try:
-    library_manager.add_book(Book("A Revolução dos Bichos", "George Orwell", "978-8535905141"))
-    library_manager.add_book(Book("1984", "George Orwell", "978-8535905142"))
-    library_manager.add_book(Book("Admirável Mundo Novo", "Aldous Huxley", "978-8575225027"))
-    library_manager.add_book(Book("O Senhor dos Anéis", "J.R.R. Tolkien", "978-8535905143"))
-except ValueError:
-    # Ignora se os livros já existirem (útil para reinícios do servidor simulado)
-    pass
+
+def _populate(manager):
+    """
+    Preenche uma biblioteca recém-criada e vazia: carrega o snapshot configurado em
+    DIGITAL_LIBRARY_SNAPSHOT, se houver, ou adiciona os livros de exemplo.
+    Uma biblioteca persistida que já tem livros não é preenchida novamente.
+    """
+    if len(manager) != 0:
+        return
+    snapshot_path = os.environ.get(SNAPSHOT_ENV)
+    if snapshot_path:
+        books, _ = load_snapshot(snapshot_path)
+    else:
+        books = [Book(title, author, isbn) for title, author, isbn in _SEED_BOOKS]
+    manager.add_books(books) # Inserção em massa: um único passo de indexação (por shard)
+
+
+def get_library_manager():
+    """
+    Retorna o gerenciador global da API, criando-o e preenchendo-o no primeiro uso.
+    A inicialização ocorre uma única vez, mesmo com várias threads chamando ao mesmo tempo.
+    """
+    global library_manager
+    manager = library_manager
+    if manager is None:
+        with _init_lock:
+            manager = library_manager
+            if manager is None:
+                manager = _create_library_manager()
+                _populate(manager)
+                library_manager = manager
+    return manager
+
+
+def warm_up():
+    """
+    Inicializa a biblioteca e prepara a listagem completa em cache, para que um
+    worker possa fazer isso antes de aceitar requisições em vez de atrasar a primeira.
+
+    Returns:
+        int: Quantidade de livros carregados.
+    """
+    manager = get_library_manager()
+    _cached_books_data(manager, manager.version)
+    _cached_books_json(manager, manager.version)
+    return len(manager)
+
+
+# Cache da listagem completa: a lista de dicionários montada por get_all_books_api é
+# reaproveitada enquanto o gerenciador (e a versão dele) não mudar.
+_list_cache = {"manager": None, "version": None, "books": None}
+
+# Mesmo cache para o array JSON de get_all_books_json_api. Ao mudar a versão, o
+# array é remontado a partir dos bytes guardados em cada livro (veja Book.to_json),
+# então só os livros incluídos ou marcados desde a última montagem são codificados.
+_json_list_cache = {"manager": None, "version": None, "books": None}
+
+# As funções da API são medidas pelo módulo metrics (contagens, erros e latências,
+# separando o tempo dentro do gerenciador do restante). A instrumentação vem
+# desligada; liga-se com metrics.enable() ou DIGITAL_LIBRARY_METRICS=1.
+
+
+def _book_to_dict(book: Book) -> dict:
+    """
+    Converte um Book no dicionário retornado pelas funções da API.
+    """
+    return {
+        "title": book.title,
+        "author": book.author,
+        "isbn": book.isbn,
+        "read": book.read
+    }
+
+
+def _cached_books_data(manager, version: int) -> list[dict]:
+    """
+    Retorna a lista de dicionários de todos os livros, reaproveitando o cache
+    enquanto o gerenciador e a versão forem os mesmos.
+    """
+    cache = _list_cache
+    if cache["manager"] is manager and cache["version"] == version:
+        return cache["books"]
+    metrics.manager_started()
+    books = manager.list_books()
+    current = manager.version # Relida: uma mutação concluída durante a montagem deixaria a lista à frente da versão
+    metrics.manager_finished()
+    books_data = [_book_to_dict(book) for book in books]
+    if current == version:
+        cache.update(manager=manager, version=version, books=books_data)
+    return books_data
+
+
+def _cached_books_json(manager, version: int) -> bytes:
+    """
+    Retorna o array JSON de todos os livros, reaproveitando o cache enquanto o
+    gerenciador e a versão forem os mesmos.
+    """
+    cache = _json_list_cache
+    if cache["manager"] is manager and cache["version"] == version:
+        return cache["books"]
+    metrics.manager_started()
+    books = manager.list_books()
+    current = manager.version # Relida: uma mutação concluída durante a montagem deixaria a lista à frente da versão
+    metrics.manager_finished()
+    books_data = books_json(books)
+    if current == version:
+        cache.update(manager=manager, version=version, books=books_data)
+    return books_data
 
 
+@metrics.instrumented("add_book")
 def add_book_api(title: str, author: str, isbn: str):
     """
     Simula a lógica de adicionar um livro via API.
@@ -28,44 +201,255 @@ def add_book_api(title: str, author: str, isbn: str):
     """
     try:
         new_book = Book(title, author, isbn)
-        library_manager.add_book(new_book)
+        manager = get_library_manager()
+        metrics.manager_started()
+        manager.add_book(new_book)
+        metrics.manager_finished()
         # Retorna os dados do livro adicionado (como uma API faria)
         return {"success": True, "book": {"title": title, "author": author, "isbn": isbn, "read": False}}
     except ValueError as e:
         # Re-levanta o erro para ser tratado pela camada que chamou (frontend simulado)
         raise e
 
-def get_all_books_api():
+@metrics.instrumented("add_book_json")
+def add_book_json_api(title: str, author: str, isbn: str) -> bytes:
+    """
+    Como add_book_api, mas retorna a resposta já codificada em JSON (UTF-8), para
+    a camada web enviar sem codificá-la de novo. O JSON do livro fica guardado
+    nele e é reaproveitado pelas listagens. Levanta ValueError em caso de falha.
+    """
+    new_book = Book(title, author, isbn)
+    manager = get_library_manager()
+    metrics.manager_started()
+    manager.add_book(new_book)
+    metrics.manager_finished()
+    return response_json("book", new_book.to_json())
+
+@metrics.instrumented("add_books")
+def _add_books_api(books: list[Book]) -> list[str]:
+    """
+    Adiciona livros já criados com uma única chamada ao gerenciador (veja
+    BookManager.add_books com `partial`), recusando os ISBNs que já existem ou se
+    repetem no lote. Usada pelos lotes de escrita de async_api; retorna "added" ou
+    "already_exists" para cada livro, na ordem recebida.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    results = manager.add_books(books, partial=True)
+    metrics.manager_finished()
+    return results
+
+@metrics.instrumented("get_all_books")
+def get_all_books_api(if_none_match: int | None = None):
     """
     Simula a lógica de listar todos os livros via API.
-    Retorna uma lista de dicionários representando os livros.
-    """
-    books_data = []
-    for book in library_manager.list_books():
-        books_data.append({
-            "title": book.title,
-            "author": book.author,
-            "isbn": book.isbn,
-            "read": book.read
-        })
+    Retorna uma lista de dicionários representando os livros e a versão da
+    biblioteca ("version"), que funciona como um ETag.
+
+    Se `if_none_match` for igual à versão atual, nada mudou desde a última leitura
+    do cliente e a resposta volta imediatamente com "not_modified" e sem livros.
+    Caso contrário, a lista serializada é reaproveitada do cache enquanto a versão
+    não mudar; os dicionários são compartilhados entre respostas e não devem ser
+    modificados por quem chama.
+    """
+    manager = get_library_manager()
+    # Lida antes de montar a lista: se uma mutação terminar no meio, a resposta traz
+    # livros mais novos que a versão informada (o cliente só recarrega a mais) e não
+    # entra no cache, pois a versão relida depois da montagem já mudou.
+    version = manager.version
+    if if_none_match is not None and if_none_match == version:
+        return {"success": True, "not_modified": True, "version": version}
+    return {"success": True, "books": list(_cached_books_data(manager, version)), "version": version}
+
+@metrics.instrumented("get_all_books_json")
+def get_all_books_json_api(if_none_match: int | None = None) -> bytes:
+    """
+    Como get_all_books_api, mas retorna a resposta já codificada em JSON (UTF-8).
+    A lista é montada juntando os bytes guardados em cada livro, sem criar
+    dicionários, e fica em cache enquanto a versão não mudar; depois disso, a
+    resposta custa pouco mais que uma cópia de memória.
+    """
+    manager = get_library_manager()
+    version = manager.version # Lida antes de montar a lista; veja get_all_books_api
+    if if_none_match is not None and if_none_match == version:
+        return encode_json({"success": True, "not_modified": True, "version": version})
+    return response_json("books", _cached_books_json(manager, version), version=version)
+
+@metrics.instrumented("get_books_page")
+def get_books_page_api(cursor: int | None = None, limit: int = DEFAULT_PAGE_SIZE):
+    """
+    Simula a lógica de listar livros paginados via API.
+    Retorna no máximo `limit` livros após o cursor, na ordem de inserção, e o
+    cursor da próxima página ("next_cursor", None na última). As páginas são
+    estáveis: inclusões e remoções entre chamadas não fazem livros se repetirem
+    nem serem pulados. Levanta ValueError se o limite for inválido.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    books, next_cursor = manager.books_page(cursor, limit)
+    metrics.manager_finished()
+    return {"success": True, "books": [_book_to_dict(book) for book in books], "next_cursor": next_cursor}
+
+@metrics.instrumented("get_books_page_json")
+def get_books_page_json_api(cursor: int | None = None, limit: int = DEFAULT_PAGE_SIZE) -> bytes:
+    """
+    Como get_books_page_api, mas retorna a resposta já codificada em JSON
+    (UTF-8), juntando os bytes guardados em cada livro da página.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    books, next_cursor = manager.books_page(cursor, limit)
+    metrics.manager_finished()
+    return response_json("books", books_json(books), next_cursor=next_cursor)
+
+@metrics.instrumented("get_sorted_books")
+def get_sorted_books_api(by: str = "title", cursor: list | None = None, limit: int = DEFAULT_PAGE_SIZE,
+                         start: str | None = None, stop: str | None = None):
+    """
+    Simula a lógica de listar livros ordenados por título ou por autor via API,
+    paginados como get_books_page_api. A ordem não diferencia maiúsculas nem
+    acentos e vem dos índices ordenados do gerenciador, sem reordenar o catálogo
+    a cada pedido; `start` e `stop` limitam a faixa (por exemplo, de "M" a "N").
+    O cursor é uma lista opaca devolvida em "next_cursor". Levanta ValueError se
+    a ordenação, o cursor ou o limite forem inválidos.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    books, next_cursor = manager.sorted_page(by, cursor, limit, start, stop)
+    metrics.manager_finished()
+    return {
+        "success": True,
+        "books": [_book_to_dict(book) for book in books],
+        "next_cursor": None if next_cursor is None else list(next_cursor),
+    }
+
+@metrics.instrumented("get_changes_since")
+def get_changes_since_api(seq: int):
+    """
+    Simula a sincronização incremental via API: em vez de recarregar a lista
+    inteira após cada mutação, o cliente envia a versão que já tem ("version" de
+    get_all_books_api ou da sincronização anterior) e recebe só as mudanças:
+    {"op": "add" | "read", "book": {...}} ou {"op": "remove", "isbn": ...}.
+
+    Se essa versão já saiu do journal do gerenciador (ou o gerenciador não mantém
+    um journal), a resposta traz "resync": True e o cliente deve recarregar tudo.
+    Em ambos os casos, "version" é a versão a usar na próxima chamada.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    version = manager.version
+    changes_since = getattr(manager, "changes_since", None)
+    changes = None if changes_since is None else changes_since(seq)
+    metrics.manager_finished()
+    if changes is None:
+        return {"success": True, "resync": True, "version": version}
+    changes_data = [
+        {"op": operation, "isbn": target} if operation == "remove"
+        else {"op": operation, "book": _book_to_dict(target)}
+        for operation, target in changes
+    ]
+    return {"success": True, "changes": changes_data, "version": version}
+
+def stream_books_api(cursor: int | None = None):
+    """
+    Simula uma resposta em streaming da listagem de livros.
+    Gera os dicionários dos livros um a um, a partir do cursor, sem copiar a
+    coleção inteira nem montar a lista completa em memória.
+    """
+    for _, book in get_library_manager().iter_books(cursor):
+        yield _book_to_dict(book)
+
+@metrics.instrumented("search_books")
+def search_books_api(query: str, limit: int | None = None, fuzzy: bool = False):
+    """
+    Simula a lógica de buscar livros via API.
+    Busca por termos do título e do autor (por prefixo, sem diferenciar
+    maiúsculas nem acentos) e por ISBN exato ou prefixo, usando o índice
+    invertido do BookManager em vez de filtrar a coleção inteira.
+    Com `fuzzy`, tolera erros de digitação ("Tolkein") e ordena por relevância.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    books = manager.search_books(query, limit, fuzzy)
+    metrics.manager_finished()
+    books_data = [_book_to_dict(book) for book in books]
     return {"success": True, "books": books_data}
 
+@metrics.instrumented("filter_books")
+def filter_books_api(author: str | None = None, read: bool | None = None, limit: int | None = None):
+    """
+    Simula a lógica de filtrar livros por autor e/ou status de leitura via API
+    (por exemplo, "todos os livros de um autor" ou "livros não lidos").
+    Responde pelos índices secundários do gerenciador, na ordem de inserção.
+    Levanta ValueError se nenhum filtro for informado.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    books = manager.filter_books(author, read, limit)
+    metrics.manager_finished()
+    return {"success": True, "books": [_book_to_dict(book) for book in books]}
+
+@metrics.instrumented("count_books")
+def count_books_api(author: str | None = None, read: bool | None = None):
+    """
+    Simula a lógica de contar livros por autor e/ou status de leitura via API,
+    sem listar nem copiar o catálogo. Levanta ValueError se nenhum filtro for informado.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    count = manager.count_books(author, read)
+    metrics.manager_finished()
+    return {"success": True, "count": count}
+
+@metrics.instrumented("mark_book_as_read")
 def mark_book_as_read_api(isbn: str):
     """
     Simula a lógica de marcar um livro como lido via API.
     """
     try:
-        library_manager.mark_as_read(isbn)
+        manager = get_library_manager()
+        metrics.manager_started()
+        manager.mark_as_read(isbn)
+        metrics.manager_finished()
         return {"success": True, "message": f"Livro com ISBN {isbn} marcado como lido."}
     except ValueError as e:
         raise e
 
+@metrics.instrumented("mark_many_as_read")
+def mark_many_as_read_api(isbns: list[str], partial: bool = False):
+    """
+    Simula a lógica de marcar vários livros como lidos em uma única chamada.
+    Por padrão é tudo ou nada (levanta ValueError se algum ISBN não existir);
+    com `partial`, marca os encontrados. "results" traz o resultado por ISBN.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    results = manager.mark_many_as_read(isbns, partial)
+    metrics.manager_finished()
+    return {"success": True, "results": results}
+
+@metrics.instrumented("remove_many")
+def remove_many_api(isbns: list[str], partial: bool = False):
+    """
+    Simula a lógica de remover vários livros em uma única chamada, com as mesmas
+    regras de mark_many_as_read_api.
+    """
+    manager = get_library_manager()
+    metrics.manager_started()
+    results = manager.remove_many(isbns, partial)
+    metrics.manager_finished()
+    return {"success": True, "results": results}
+
+@metrics.instrumented("remove_book")
 def remove_book_api(isbn: str):
     """
     Simula a lógica de remover um livro via API.
     """
     try:
-        library_manager.remove_book(isbn)
+        manager = get_library_manager()
+        metrics.manager_started()
+        manager.remove_book(isbn)
+        metrics.manager_finished()
         return {"success": True, "message": f"Livro com ISBN {isbn} removido com sucesso."}
     except ValueError as e:
         raise e
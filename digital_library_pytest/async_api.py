@@ -0,0 +1,262 @@
+# digital_library_pytest/async_api.py
+
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+
+from digital_library_pytest import api_logic
+from digital_library_pytest.book import Book, isbn_key
+
+# Thread única por onde passam todas as leituras e escritas deste módulo: o
+# BookManager não é seguro para threads (buscas e filtros constroem índices, escritas
+# alteram dicionários que as listagens percorrem), então leituras e lotes de escrita
+# não podem rodar ao mesmo tempo. Chamadas síncronas feitas em outras threads
+# continuam exigindo um gerenciador seguro para threads (ShardedBookManager).
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="library")
+
+# Estado por event loop: futures não podem ser compartilhadas entre loops diferentes.
+_states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = weakref.WeakKeyDictionary()
+
+
+def _add_run(arguments: list[tuple]) -> list[tuple[bool, object]]:
+    """
+    Aplica uma sequência de inclusões com uma única chamada ao gerenciador. Os
+    livros inválidos são recusados antes, com a mensagem de add_book_api.
+    """
+    results: list[tuple[bool, object] | None] = []
+    books = []
+    for title, author, isbn in arguments:
+        try:
+            books.append(Book(title, author, isbn))
+        except ValueError as e:
+            results.append((False, e))
+            continue
+        results.append(None)
+    outcomes = iter(api_logic._add_books_api(books) if books else ())
+    for position, (title, author, isbn) in enumerate(arguments):
+        if results[position] is not None:
+            continue
+        if next(outcomes) == "added":
+            results[position] = (True, {"success": True,
+                                        "book": {"title": title, "author": author, "isbn": isbn, "read": False}})
+        else:
+            results[position] = (False, ValueError("Livro com este ISBN já existe na biblioteca."))
+    return results
+
+
+def _mark_run(arguments: list[tuple]) -> list[tuple[bool, object]]:
+    """
+    Aplica uma sequência de marcações com uma única chamada a mark_many_as_read_api.
+    """
+    isbns = [isbn for isbn, in arguments]
+    outcomes = api_logic.mark_many_as_read_api(isbns, partial=True)["results"]
+    return [
+        (False, ValueError(f"Livro com ISBN '{isbn}' não encontrado.")) if outcomes[isbn] == "not_found"
+        else (True, {"success": True, "message": f"Livro com ISBN {isbn} marcado como lido."})
+        for isbn in isbns
+    ]
+
+
+def _remove_run(arguments: list[tuple]) -> list[tuple[bool, object]]:
+    """
+    Aplica uma sequência de remoções com uma única chamada a remove_many_api. Se o
+    mesmo livro aparece de novo na sequência, só a primeira remoção tem sucesso,
+    como se as remoções fossem feitas uma a uma.
+    """
+    isbns = [isbn for isbn, in arguments]
+    first_of_key = {}
+    for position, isbn in enumerate(isbns):
+        first_of_key.setdefault(isbn_key(isbn) or isbn, position)
+    unique = [isbns[position] for position in first_of_key.values()]
+    outcomes = api_logic.remove_many_api(unique, partial=True)["results"]
+    results = []
+    for position, isbn in enumerate(isbns):
+        if first_of_key[isbn_key(isbn) or isbn] == position and outcomes[isbn] == "removed":
+            results.append((True, {"success": True, "message": f"Livro com ISBN {isbn} removido com sucesso."}))
+        else:
+            results.append((False, ValueError(f"Livro com ISBN '{isbn}' não encontrado para remoção.")))
+    return results
+
+
+# Funções que aplicam uma sequência de escritas do mesmo tipo em uma única chamada.
+_RUNS = {"add": _add_run, "mark": _mark_run, "remove": _remove_run}
+
+
+def _run_batch(operations: list[tuple[str, tuple]]) -> list[tuple[bool, object]]:
+    """
+    Executa um lote de escritas (tipo, argumentos) em uma única ida à thread da
+    biblioteca. Escritas consecutivas do mesmo tipo viram uma única operação em
+    lote do gerenciador (add_books, mark_many_as_read ou remove_many), com um
+    único incremento de versão e, no SQLite, uma única transação. A ordem de
+    chegada é mantida entre tipos diferentes, e o erro de uma escrita não
+    interrompe as seguintes.
+
+    Returns:
+        list[tuple[bool, object]]: Para cada escrita, (True, resultado) ou (False, exceção).
+    """
+    results = []
+    for kind, run in groupby(operations, key=lambda operation: operation[0]):
+        arguments = [args for _, args in run]
+        try:
+            results.extend(_RUNS[kind](arguments))
+        except Exception as e: # Falha do lote inteiro (por exemplo, do banco)
+            results.extend((False, e) for _ in arguments)
+    return results
+
+
+def _copy_result(result):
+    """
+    Copia o resultado de uma leitura compartilhada, para que um chamador que altere
+    a resposta ou a lista de livros dela não afete os demais. Os dicionários dos
+    livros continuam compartilhados, como no cache de get_all_books_api; respostas
+    já codificadas (bytes) são imutáveis e não são copiadas.
+    """
+    if not isinstance(result, dict):
+        return result
+    return {key: list(value) if isinstance(value, list) else value for key, value in result.items()}
+
+
+class _LoopState:
+    """
+    Leituras em andamento (para coalescência) e escritas pendentes (para
+    micro-lotes) de um event loop.
+    """
+    def __init__(self):
+        """
+        Inicializa o estado vazio.
+        """
+        self.reads: dict[tuple, asyncio.Future] = {}
+        self.pending_writes: list[tuple] = []
+        self.flushing = False
+        self.writes_done = 0 # Lotes de escrita concluídos; faz parte da chave das leituras
+
+    async def read(self, function, *args):
+        """
+        Executa uma leitura na thread da biblioteca, compartilhando o resultado com
+        todas as chamadas idênticas feitas enquanto ela estiver em andamento. A
+        quantidade de lotes de escrita concluídos faz parte da chave, então uma
+        leitura iniciada antes de uma escrita já concluída nunca é reaproveitada
+        depois dela. (A versão do gerenciador não é consultada aqui: no SQLite ela
+        é uma consulta ao banco, que bloquearia o event loop.)
+        """
+        key = (function.__name__, args, self.writes_done)
+        future = self.reads.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(_executor, function, *args)
+            self.reads[key] = future
+            future.add_done_callback(lambda _: self.reads.pop(key, None))
+        # shield: o cancelamento de um chamador não cancela a leitura dos demais.
+        return _copy_result(await asyncio.shield(future))
+
+    def write(self, kind: str, *args) -> asyncio.Future:
+        """
+        Enfileira uma escrita ("add", "mark" ou "remove") no próximo lote e retorna
+        a future do seu resultado.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending_writes.append((kind, args, future))
+        if not self.flushing:
+            self.flushing = True
+            loop.create_task(self._drain())
+        return future
+
+    async def _drain(self):
+        """
+        Aplica as escritas pendentes em lotes, na ordem de chegada, um lote por vez.
+        Se a execução de um lote falhar ou esta tarefa for cancelada, as futures
+        ainda sem resultado (do lote e as pendentes) recebem o erro ou são canceladas,
+        para que nenhum chamador espere para sempre.
+        """
+        batch = []
+        error: BaseException | None = None
+        try:
+            while self.pending_writes:
+                # Cede uma iteração do loop para que a rajada de escritas se acumule no lote.
+                await asyncio.sleep(0)
+                batch, self.pending_writes = self.pending_writes, []
+                loop = asyncio.get_running_loop()
+                try:
+                    results = await loop.run_in_executor(_executor, _run_batch,
+                                                         [(kind, args) for kind, args, _ in batch])
+                finally:
+                    self.writes_done += 1 # Mesmo após uma falha, parte do lote pode ter sido aplicada
+                for (_, _, future), (ok, value) in zip(batch, results):
+                    if future.cancelled():
+                        continue
+                    if ok:
+                        future.set_result(value)
+                    else:
+                        future.set_exception(value)
+                batch = []
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.flushing = False
+            unresolved = batch + self.pending_writes
+            self.pending_writes = []
+            for _, _, future in unresolved:
+                if future.done():
+                    continue
+                if error is None or isinstance(error, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(error)
+
+
+def _state() -> _LoopState:
+    """
+    Retorna o estado do event loop em execução.
+    """
+    loop = asyncio.get_running_loop()
+    state = _states.get(loop)
+    if state is None:
+        state = _states[loop] = _LoopState()
+    return state
+
+
+async def add_book_async(title: str, author: str, isbn: str):
+    """
+    Versão assíncrona de add_book_api. Rajadas de escritas são aplicadas em lote.
+    Levanta ValueError nos mesmos casos da versão síncrona.
+    """
+    return await _state().write("add", title, author, isbn)
+
+
+async def get_all_books_async(if_none_match: int | None = None):
+    """
+    Versão assíncrona de get_all_books_api. Chamadas idênticas simultâneas
+    compartilham uma única execução.
+    """
+    return await _state().read(api_logic.get_all_books_api, if_none_match)
+
+
+async def get_all_books_json_async(if_none_match: int | None = None) -> bytes:
+    """
+    Versão assíncrona de get_all_books_json_api, com a mesma coalescência de
+    get_all_books_async.
+    """
+    return await _state().read(api_logic.get_all_books_json_api, if_none_match)
+
+
+async def search_books_async(query: str, limit: int | None = None, fuzzy: bool = False):
+    """
+    Versão assíncrona de search_books_api, com coalescência de buscas idênticas simultâneas.
+    """
+    return await _state().read(api_logic.search_books_api, query, limit, fuzzy)
+
+
+async def mark_book_as_read_async(isbn: str):
+    """
+    Versão assíncrona de mark_book_as_read_api. Rajadas de escritas são aplicadas em lote.
+    """
+    return await _state().write("mark", isbn)
+
+
+async def remove_book_async(isbn: str):
+    """
+    Versão assíncrona de remove_book_api. Rajadas de escritas são aplicadas em lote.
+    """
+    return await _state().write("remove", isbn)
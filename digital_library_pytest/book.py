@@ -1,9 +1,77 @@
 # digital_library_pytest/book.py
 
+from operator import mul
+
+from digital_library_pytest.serialization import encode_json
+
+# Pesos dos dígitos no cálculo dos dígitos verificadores. Os dígitos são somados
+# como bytes ASCII, então a parcela de ord("0") (48) de cada peso é descontada.
+_ISBN13_OFFSET = 48 * sum((1, 3) * 6 + (1,))
+_ISBN10_WEIGHTS = (10, 9, 8, 7, 6, 5, 4, 3, 2)
+_ISBN10_OFFSET = 48 * sum(_ISBN10_WEIGHTS)
+_ISBN10_CHECKS = {**{str(digit): digit for digit in range(10)}, "X": 10, "x": 10}
+
+
+def isbn_key(isbn: str) -> int | None:
+    """
+    Normaliza um ISBN-10 ou ISBN-13 e retorna a sua chave canônica: o ISBN-13
+    correspondente como inteiro (cabe em 64 bits). Hífens e espaços são ignorados e
+    ISBN-10 são convertidos para o ISBN-13 com prefixo 978, então grafias diferentes
+    do mesmo livro produzem a mesma chave.
+
+    Args:
+        isbn (str): O ISBN, com ou sem hífens.
+
+    Returns:
+        int | None: A chave canônica, ou None se o ISBN for inválido (formato ou
+                    dígito verificador incorretos, ou um valor que não é texto).
+    """
+    # Hífens e espaços são ignorados; str.replace é bem mais rápido que str.translate aqui.
+    try:
+        digits = isbn.replace("-", "").replace(" ", "")
+    except (AttributeError, TypeError): # Não é um str (por exemplo, um número vindo de JSON)
+        return None
+    if len(digits) == 13:
+        if not (digits.isascii() and digits.isdigit()):
+            return None
+        encoded = digits.encode()
+        # Pesos alternados 1 e 3: somar as fatias de bytes evita um laço em Python.
+        if (sum(encoded[0::2]) + 3 * sum(encoded[1::2]) - _ISBN13_OFFSET) % 10:
+            return None
+        return int(digits)
+    if len(digits) == 10:
+        body = digits[:9]
+        check = _ISBN10_CHECKS.get(digits[9])
+        if check is None or not (body.isascii() and body.isdigit()):
+            return None
+        if (sum(map(mul, body.encode(), _ISBN10_WEIGHTS)) - _ISBN10_OFFSET + check) % 11:
+            return None
+        body = "978" + body
+        encoded = body.encode()
+        total = sum(encoded[0::2]) + 3 * sum(encoded[1::2]) - _ISBN13_OFFSET + 48
+        return int(body) * 10 + (10 - total % 10) % 10
+    return None
+
+
+def format_isbn_key(key: int) -> str:
+    """
+    Retorna o ISBN-13 (sem hífens) de uma chave canônica.
+    """
+    return f"{key:013d}"
+
+
 class Book:
     """
     Representa um único livro no sistema de gerenciamento de livros.
+    O ISBN é validado na criação e o livro guarda a sua chave canônica (veja
+    isbn_key), usada por igualdade, hash e pelos índices do BookManager.
+    Usa __slots__ para não criar um __dict__ por instância, o que reduz a
+    memória ocupada por livro em catálogos grandes.
+    O status de leitura deve ser alterado por mark_as_read, que também descarta
+    o JSON guardado do livro (veja to_json).
     """
+    __slots__ = ("title", "author", "isbn", "key", "read", "_json")
+
     def __init__(self, title: str, author: str, isbn: str):
         """
         Inicializa um novo livro.
@@ -12,7 +80,11 @@ class Book:
             title (str): O título do livro. Não pode ser vazio.
             author (str): O autor do livro. Não pode ser vazio.
             isbn (str): O ISBN (International Standard Book Number) do livro.
-                        Deve ser único e não pode ser vazio.
+                        Deve ser um ISBN-10 ou ISBN-13 válido (hífens e espaços
+                        são permitidos) e único.
+
+        Raises:
+            ValueError: Se algum campo for vazio ou se o ISBN for inválido.
         """
         if not title:
             raise ValueError("O título do livro não pode ser vazio.")
@@ -20,17 +92,56 @@ class Book:
             raise ValueError("O autor do livro não pode ser vazio.")
         if not isbn:
             raise ValueError("O ISBN do livro não pode ser vazio.")
+        key = isbn_key(isbn)
+        if key is None:
+            raise ValueError(f"O ISBN '{isbn}' é inválido.")
 
         self.title = title
         self.author = author
         self.isbn = isbn
+        self.key = key
         self.read = False # Por padrão, o livro é criado como não lido
+        self._json = None # Bytes de to_json, codificados no primeiro uso
+
+    @classmethod
+    def _restored(cls, title: str, author: str, isbn: str, key: int) -> "Book":
+        """
+        Recria um livro já validado, com a chave já calculada (por exemplo, lido de
+        um snapshot), sem repetir as validações nem a normalização do ISBN.
+        """
+        book = cls.__new__(cls)
+        book.title = title
+        book.author = author
+        book.isbn = isbn
+        book.key = key
+        book.read = False
+        book._json = None
+        return book
 
     def mark_as_read(self):
         """
         Marca o livro como lido.
         """
         self.read = True
+        self._json = None
+
+    def to_json(self) -> bytes:
+        """
+        Retorna o livro em JSON (UTF-8), com os campos title, author, isbn e read.
+        Os bytes são codificados uma única vez e guardados no livro, para que as
+        listagens da API apenas os juntem (veja serialization.books_json);
+        mark_as_read os descarta.
+        """
+        data = self._json
+        if data is None:
+            data = self._json = self._encode_json()
+        return data
+
+    def _encode_json(self) -> bytes:
+        """
+        Codifica o livro em JSON, sem consultar nem guardar o cache.
+        """
+        return encode_json({"title": self.title, "author": self.author, "isbn": self.isbn, "read": self.read})
 
     def __str__(self):
         """
@@ -48,16 +159,17 @@ class Book:
     def __eq__(self, other):
         """
         Define a comparação de igualdade entre dois objetos Book.
-        Considera dois livros iguais se tiverem o mesmo ISBN.
+        Considera dois livros iguais se tiverem o mesmo ISBN (pela chave canônica,
+        então "85-359-0277-5" e "978-85-359-0277-8" são o mesmo livro).
         """
         if not isinstance(other, Book):
             return NotImplemented
-        return self.isbn == other.isbn
+        return self.key == other.key
 
     def __hash__(self):
         """
         Define a função hash para objetos Book, permitindo que sejam usados em conjuntos ou como chaves de dicionário.
-        Baseado no ISBN, que é único.
+        Baseado na chave canônica do ISBN, que é única.
         """
-        return hash(self.isbn)
+        return hash(self.key)
 
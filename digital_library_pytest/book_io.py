@@ -0,0 +1,246 @@
+# digital_library_pytest/book_io.py
+
+import csv
+import json
+from itertools import islice
+
+from digital_library_pytest.book import Book
+
+# Colunas usadas tanto na importação quanto na exportação.
+FIELDS = ("title", "author", "isbn", "read")
+
+# Tamanho padrão dos lotes processados pela importação em massa.
+DEFAULT_BATCH_SIZE = 10_000
+
+# Quantidade máxima de erros guardados em detalhe em um ImportReport.
+DEFAULT_MAX_ERRORS = 1_000
+
+# Valores aceitos na coluna 'read', já normalizados (minúsculos e sem espaços).
+_READ_FLAGS = {
+    "1": True, "true": True, "t": True, "yes": True, "y": True, "sim": True, "s": True,
+    "": False, "0": False, "false": False, "f": False, "no": False, "n": False,
+    "nao": False, "não": False,
+}
+# Encoder reaproveitado pela exportação; json.dumps com argumentos cria um encoder por chamada.
+_JSONL_ENCODER = json.JSONEncoder(ensure_ascii=False)
+
+
+class ImportReport:
+    """
+    Resultado de uma importação em massa.
+    Guarda quantos livros foram importados e os erros encontrados por linha.
+    """
+    def __init__(self, max_errors: int = DEFAULT_MAX_ERRORS):
+        """
+        Inicializa um relatório vazio.
+
+        Args:
+            max_errors (int): Quantos erros guardar em detalhe. Os demais são
+                              apenas contados, mantendo a memória limitada.
+        """
+        self.imported = 0
+        self.error_count = 0
+        self.errors: list[tuple[int, str]] = []
+        self._max_errors = max_errors
+
+    def add_error(self, line: int, message: str):
+        """
+        Registra um erro para a linha informada.
+        """
+        self.error_count += 1
+        if len(self.errors) < self._max_errors:
+            self.errors.append((line, message))
+
+    @property
+    def ok(self) -> bool:
+        """
+        Indica se a importação terminou sem nenhum erro.
+        """
+        return self.error_count == 0
+
+    def __repr__(self):
+        return f"ImportReport(imported={self.imported}, error_count={self.error_count})"
+
+
+def parse_read_flag(value) -> bool:
+    """
+    Converte o valor da coluna 'read' (bool, número ou texto) em bool.
+
+    Raises:
+        ValueError: Se o valor não puder ser interpretado como verdadeiro/falso.
+    """
+    if value is None or value is True or value is False:
+        return bool(value)
+    if isinstance(value, int):
+        return value != 0
+    flag = _READ_FLAGS.get(value)
+    if flag is None:
+        flag = _READ_FLAGS.get(str(value).strip().lower())
+        if flag is None:
+            raise ValueError(f"Valor inválido para 'read': '{value}'.")
+    return flag
+
+
+def read_csv_rows(path):
+    """
+    Gera as linhas de um arquivo CSV como tuplas (número_da_linha, campos).
+    O arquivo é lido de forma incremental; apenas uma linha fica em memória por vez.
+    A primeira linha deve ser o cabeçalho com as colunas de FIELDS ('read' é opcional).
+    Veja row_to_book para o formato de `campos`.
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = {name.strip(): index for index, name in enumerate(header)}
+        missing = [name for name in FIELDS[:3] if name not in columns]
+        if missing:
+            raise ValueError(f"Cabeçalho do CSV sem as colunas: {', '.join(missing)}.")
+        title_at, author_at, isbn_at = columns["title"], columns["author"], columns["isbn"]
+        read_at = columns.get("read")
+        width = max(columns.values()) + 1
+        for line_number, values in enumerate(reader, start=2):
+            if not values:
+                continue
+            if len(values) < width:
+                values += [""] * (width - len(values))
+            yield line_number, (
+                values[title_at],
+                values[author_at],
+                values[isbn_at],
+                values[read_at] if read_at is not None else "",
+            )
+
+
+def read_jsonl_rows(path):
+    """
+    Gera as linhas de um arquivo JSON Lines como tuplas (número_da_linha, campos).
+    Linhas em branco são ignoradas; linhas com JSON inválido, ou com title, author
+    ou isbn que não sejam textos, geram a mensagem de erro no lugar dos campos.
+    Veja row_to_book para o formato de `campos`.
+    """
+    loads = json.loads
+    with open(path, encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, f"JSON inválido: {e.msg}."
+                continue
+            if not isinstance(row, dict):
+                yield line_number, "Cada linha deve ser um objeto JSON."
+                continue
+            fields = (row.get("title"), row.get("author"), row.get("isbn"))
+            invalid = [name for name, value in zip(FIELDS, fields) if value is not None and not isinstance(value, str)]
+            if invalid:
+                yield line_number, f"O campo '{invalid[0]}' deve ser um texto."
+                continue
+            yield line_number, (*fields, row.get("read"))
+
+
+def batched(iterable, size: int):
+    """
+    Agrupa um iterável em listas de até `size` elementos, sem materializá-lo por inteiro.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def row_to_book(fields) -> Book:
+    """
+    Cria um Book a partir dos campos de uma linha, aplicando as validações de Book.
+
+    Args:
+        fields: Tupla (title, author, isbn, read) ou uma mensagem de erro (str)
+                produzida pelo leitor quando a linha não pôde ser interpretada.
+
+    Raises:
+        ValueError: Se a linha for inválida.
+    """
+    if isinstance(fields, str):
+        raise ValueError(fields)
+    title, author, isbn, read = fields
+    book = Book(title, author, isbn)
+    if read and parse_read_flag(read):
+        book.mark_as_read()
+    return book
+
+def validated_batches(rows, batch_size: int, report: ImportReport, find_existing):
+    """
+    Valida as linhas em lotes e gera, para cada lote, um dict chave do ISBN -> Book apenas
+    com os livros válidos e ainda não cadastrados. Linhas inválidas e ISBNs
+    duplicados (no próprio lote ou na biblioteca) são registrados no relatório.
+
+    Args:
+        rows: Iterável de tuplas (número_da_linha, campos).
+        batch_size (int): Quantidade de linhas por lote.
+        report (ImportReport): Relatório que recebe os erros por linha.
+        find_existing: Função que recebe a lista de chaves de ISBN (Book.key) de um
+                       lote e retorna um contêiner com as que já existem na biblioteca.
+    """
+    for batch in batched(rows, batch_size):
+        books = []
+        for line_number, row in batch:
+            try:
+                books.append((line_number, row_to_book(row)))
+            except ValueError as e:
+                report.add_error(line_number, str(e))
+        existing = find_existing([book.key for _, book in books])
+        accepted: dict[int, Book] = {}
+        for line_number, book in books:
+            if book.key in existing or book.key in accepted:
+                report.add_error(line_number, "Livro com este ISBN já existe na biblioteca.")
+                continue
+            accepted[book.key] = book
+        yield accepted
+
+
+def book_to_row(book: Book) -> dict:
+    """
+    Converte um Book no dict usado pela exportação.
+    """
+    return {"title": book.title, "author": book.author, "isbn": book.isbn, "read": book.read}
+
+
+def write_csv(path, books) -> int:
+    """
+    Escreve os livros em um arquivo CSV, consumindo o iterável de forma incremental.
+
+    Returns:
+        int: Quantidade de livros escritos.
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(FIELDS)
+        for batch in batched(books, DEFAULT_BATCH_SIZE):
+            writer.writerows(
+                (book.title, book.author, book.isbn, "true" if book.read else "false")
+                for book in batch
+            )
+            count += len(batch)
+    return count
+
+
+def write_jsonl(path, books) -> int:
+    """
+    Escreve os livros em um arquivo JSON Lines, consumindo o iterável de forma incremental.
+
+    Returns:
+        int: Quantidade de livros escritos.
+    """
+    count = 0
+    encode = _JSONL_ENCODER.encode
+    with open(path, "w", encoding="utf-8") as handle:
+        for batch in batched(books, DEFAULT_BATCH_SIZE):
+            handle.writelines(encode(book_to_row(book)) + "\n" for book in batch)
+            count += len(batch)
+    return count
+
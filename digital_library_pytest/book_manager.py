@@ -1,18 +1,144 @@
 # digital_library_pytest/book_manager.py
 
-from digital_library_pytest.book import Book
+import heapq
+from collections import deque
+from itertools import islice
+
+from digital_library_pytest.book import Book, isbn_key
+from digital_library_pytest.book_io import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_ERRORS,
+    ImportReport,
+    read_csv_rows,
+    read_jsonl_rows,
+    validated_batches,
+    write_csv,
+    write_jsonl,
+)
+from digital_library_pytest.columnar import ColumnarBookStore
+from digital_library_pytest.filter_index import FilterIndex
+from digital_library_pytest.insertion_order import InsertionOrder
+from digital_library_pytest.search_index import SearchIndex, normalize_text
+from digital_library_pytest.sorted_index import SortedIndex, check_cursor, sort_fields
+
+# Tamanho padrão e máximo de uma página em books_page.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 10_000
+
+# Quantidade padrão de mudanças guardadas no journal de changes_since.
+DEFAULT_JOURNAL_SIZE = 10_000
+
+# Quantidade máxima de ISBNs citados na mensagem de erro das operações em lote.
+_MAX_ISBNS_IN_ERROR = 10
+
+
+def not_found_message(missing: list[str], removal: bool) -> str:
+    """
+    Monta a mensagem de erro das operações em lote (tudo ou nada) quando algum
+    ISBN não existe. Compartilhada pelas variantes do gerenciador.
+    """
+    listed = ", ".join(f"'{isbn}'" for isbn in missing[:_MAX_ISBNS_IN_ERROR])
+    if len(missing) > _MAX_ISBNS_IN_ERROR:
+        listed += f" e mais {len(missing) - _MAX_ISBNS_IN_ERROR}"
+    action = " para remoção" if removal else ""
+    return f"Livros com ISBN {listed} não encontrados{action}; nenhuma alteração foi feita."
+
+def consolidate_changes(entries, find) -> list[tuple[str, Book | str]]:
+    """
+    Consolida entradas de journal (versão, operação, chave, ISBN), em ordem, no
+    formato de changes_since: uma mudança por livro, na ordem da última mudança de
+    cada um, com o estado atual do livro. Compartilhada pelas variantes do gerenciador.
+
+    Args:
+        entries: Entradas do journal posteriores à versão do cliente, em ordem.
+        find: Função chave do ISBN -> Book atual, ou None se o livro não existe mais.
+    """
+    latest: dict[int, tuple[int, str, int, str]] = {}
+    added: set[int] = set()
+    for entry in reversed(entries):
+        latest.setdefault(entry[2], entry)
+        if entry[1] == "add":
+            added.add(entry[2])
+    changes = []
+    for _, _, key, isbn in sorted(latest.values()):
+        book = find(key)
+        if book is None:
+            changes.append(("remove", isbn))
+        else:
+            changes.append(("add" if key in added else "read", book))
+    return changes
 
 class BookManager:
     """
     Gerencia uma coleção de objetos Book.
     Permite adicionar, listar, marcar como lido e remover livros.
     """
-    def __init__(self):
+    def __init__(self, compact: bool = False, journal_size: int = DEFAULT_JOURNAL_SIZE):
+        """
+        Inicializa o gerenciador de livros com um índice vazio de livros.
+        O índice interno é protegido por convenção (prefixo _).
+
+        O índice é um dicionário chave do ISBN -> Book (a chave canônica de
+        isbn_key, um inteiro que compara e calcula hash mais rápido que o texto
+        e não distingue grafias do mesmo ISBN). Como dicionários preservam a
+        ordem de inserção, a listagem mantém a ordem em que os livros foram
+        adicionados, enquanto busca, verificação de duplicidade, marcação e
+        remoção passam a ser O(1) em vez de varrer a coleção inteira.
+
+        Args:
+            compact (bool): Se True, os livros são guardados em um ColumnarBookStore
+                            (colunas, autores internados e bitset de leitura) em vez
+                            de um objeto por livro. Indicado para catálogos grandes;
+                            os Book retornados são visões criadas sob demanda.
+            journal_size (int): Quantidade máxima de mudanças guardadas para changes_since.
+
+        Raises:
+            ValueError: Se journal_size for menor que 1.
+        """
+        if journal_size < 1:
+            raise ValueError("O journal de mudanças precisa guardar ao menos uma mudança.")
+        # Índice chave do ISBN -> Book, em ordem de inserção
+        self._books: dict[int, Book] | ColumnarBookStore = ColumnarBookStore() if compact else {}
+        # Índice invertido de título, autor e ISBN. É construído sob demanda na primeira
+        # busca e, a partir daí, mantido incrementalmente; assim cargas em massa e
+        # restaurações de snapshot não pagam pela indexação se ninguém buscar.
+        self._search_index: SearchIndex | None = None
+        # Índices secundários por autor e status de leitura, também construídos sob
+        # demanda (na primeira filtragem) e mantidos incrementalmente depois disso.
+        self._filter_index: FilterIndex | None = None
+        # Índices ordenados por título e por autor (ordenação -> SortedIndex). Cada um
+        # é construído no primeiro pedido dessa ordenação e mantido incrementalmente.
+        self._sorted_indexes: dict[str, SortedIndex] = {}
+        # Ordem de inserção para paginação por cursor (veja InsertionOrder). No modo
+        # colunar, as linhas do armazenamento já são essa ordem.
+        self._order: InsertionOrder = self._books if compact else InsertionOrder()
+        self._version = 0 # Incrementado a cada mutação; veja a propriedade version
+        # Journal limitado das últimas mudanças, (versão, operação, chave, ISBN), em ordem.
+        # Quando cheio, a mudança mais antiga é descartada e _journal_floor passa a ser a
+        # versão dela: clientes em versões anteriores precisam de uma ressincronização.
+        self._journal: deque[tuple[int, str, int, str]] = deque(maxlen=journal_size)
+        self._journal_floor = 0
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de livros na biblioteca, sem copiar a coleção.
+        """
+        return len(self._books)
+
+    def __contains__(self, isbn: str) -> bool:
+        """
+        Indica se há um livro com o ISBN informado, em O(1).
+        """
+        return isbn_key(isbn) in self._books
+
+    @property
+    def version(self) -> int:
         """
-        Inicializa o gerenciador de livros com uma lista vazia de livros.
-        A lista interna é protegida por convenção (prefixo _).
+        Versão monotônica da biblioteca, incrementada a cada mutação (inclusão,
+        marcação como lido ou remoção). Permite que camadas superiores reaproveitem
+        resultados enquanto a versão não mudar.
         """
-        self._books = [] # Lista para armazenar os objetos Book
+        return self._version
 
     def add_book(self, book: Book):
         """
@@ -25,11 +151,51 @@ class BookManager:
         Raises:
             ValueError: Se um livro com o mesmo ISBN já existir na biblioteca.
         """
-        # Itera sobre os livros existentes para verificar duplicidade de ISBN
-        for existing_book in self._books:
-            if existing_book.isbn == book.isbn:
-                raise ValueError(f"Livro com este ISBN já existe na biblioteca.")
-        self._books.append(book)
+        # Consulta direta ao índice para verificar duplicidade de ISBN
+        if book.key in self._books:
+            raise ValueError(f"Livro com este ISBN já existe na biblioteca.")
+        self._books[book.key] = book
+        if self._search_index is not None:
+            self._search_index.add(book)
+        if self._filter_index is not None:
+            self._filter_index.add(book)
+        for index in self._sorted_indexes.values():
+            index.add(book)
+        self._order.append(book.key)
+        self._version += 1
+        self._record_change("add", book)
+
+    def add_books(self, books, partial: bool = False) -> list[str]:
+        """
+        Adiciona vários livros de uma vez, pelo mesmo caminho da importação em massa
+        (uma única indexação e um único incremento de versão). Usado para carregar
+        catálogos inteiros, como um snapshot, sem o custo de add_book por livro.
+        Por padrão é tudo ou nada: nenhum livro é adicionado se algum ISBN for repetido.
+
+        Args:
+            books: Iterável de objetos Book.
+            partial (bool): Se True, adiciona os demais livros e apenas informa, no
+                            resultado, os que já existem (ou se repetem no lote).
+
+        Returns:
+            list[str]: Resultado por livro, na ordem recebida: "added" ou "already_exists".
+
+        Raises:
+            ValueError: Se algum ISBN se repetir no lote ou já existir na biblioteca
+                        e `partial` for False.
+        """
+        accepted: dict[int, Book] = {}
+        results = []
+        for book in books:
+            if book.key in accepted or book.key in self._books:
+                if not partial:
+                    raise ValueError(f"Livro com este ISBN já existe na biblioteca.")
+                results.append("already_exists")
+            else:
+                accepted[book.key] = book
+                results.append("added")
+        self._bulk_insert(accepted)
+        return results
 
     def list_books(self) -> list[Book]:
         """
@@ -39,7 +205,7 @@ class BookManager:
         Returns:
             list[Book]: Uma nova lista contendo todos os livros.
         """
-        return list(self._books) # Retorna uma cópia para proteger a lista interna
+        return list(self._books.values()) # Retorna uma cópia para proteger o índice interno
 
     def mark_as_read(self, isbn: str):
         """
@@ -51,14 +217,15 @@ class BookManager:
         Raises:
             ValueError: Se o livro com o ISBN fornecido não for encontrado.
         """
-        found = False
-        for book in self._books:
-            if book.isbn == isbn:
-                book.mark_as_read() # Chama o método da classe Book
-                found = True
-                break
-        if not found:
+        book = self._books.get(isbn_key(isbn)) # Um ISBN inválido nunca é encontrado
+        if book is None:
             raise ValueError(f"Livro com ISBN '{isbn}' não encontrado.")
+        if not book.read:
+            book.mark_as_read() # Chama o método da classe Book
+            if self._filter_index is not None:
+                self._filter_index.mark_as_read(book)
+            self._version += 1
+            self._record_change("read", book)
 
     def remove_book(self, isbn: str):
         """
@@ -70,11 +237,474 @@ class BookManager:
         Raises:
             ValueError: Se o livro com o ISBN fornecido não for encontrado.
         """
-        # Cria uma nova lista sem o livro a ser removido
-        initial_len = len(self._books)
-        # Filtra a lista para remover o livro com o ISBN correspondente
-        self._books = [book for book in self._books if book.isbn != isbn]
-        # Se o tamanho da lista não mudou, significa que o livro não foi encontrado
-        if len(self._books) == initial_len:
+        # Remove diretamente do índice; se a chave não existir, o livro não foi encontrado
+        book = self._books.pop(isbn_key(isbn), None)
+        if book is None:
             raise ValueError(f"Livro com ISBN '{isbn}' não encontrado para remoção.")
+        if self._search_index is not None:
+            self._search_index.remove(book)
+        if self._filter_index is not None:
+            self._filter_index.remove(book)
+        for index in self._sorted_indexes.values():
+            index.remove(book)
+        self._order.discard(book.key)
+        self._version += 1
+        self._record_change("remove", book)
+
+    def _resolve_many(self, isbns, partial: bool, removal: bool) -> dict[str, tuple[int | None, Book | None]]:
+        """
+        Localiza os livros de uma operação em lote, uma vez por ISBN informado.
+
+        Returns:
+            dict[str, tuple[int | None, Book | None]]: ISBN -> (chave, livro ou None).
+
+        Raises:
+            ValueError: Se algum ISBN não for encontrado e `partial` for False.
+        """
+        books = self._books
+        resolved = {}
+        missing = []
+        for isbn in isbns:
+            if isbn in resolved:
+                continue
+            key = isbn_key(isbn)
+            book = books.get(key)
+            resolved[isbn] = (key, book)
+            if book is None:
+                missing.append(isbn)
+        if missing and not partial:
+            raise ValueError(not_found_message(missing, removal))
+        return resolved
+
+    def mark_many_as_read(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Marca vários livros como lidos em uma única passada, com um único
+        incremento de versão. Por padrão é tudo ou nada: se algum ISBN não existir,
+        nenhum livro é marcado.
+
+        Args:
+            isbns: Iterável de ISBNs.
+            partial (bool): Se True, marca os livros encontrados e apenas informa
+                            os ISBNs não encontrados no resultado.
+
+        Returns:
+            dict[str, str]: Resultado por ISBN: "marked", "already_read" ou "not_found".
+
+        Raises:
+            ValueError: Se algum ISBN não for encontrado e `partial` for False.
+        """
+        results = {}
+        marked = []
+        for isbn, (_, book) in self._resolve_many(isbns, partial, removal=False).items():
+            if book is None:
+                results[isbn] = "not_found"
+            elif book.read:
+                results[isbn] = "already_read"
+            else:
+                book.mark_as_read()
+                marked.append(book)
+                results[isbn] = "marked"
+        if marked:
+            if self._filter_index is not None:
+                for book in marked:
+                    self._filter_index.mark_as_read(book)
+            self._version += 1
+            for book in marked:
+                self._record_change("read", book)
+        return results
+
+    def remove_many(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Remove vários livros em uma única passada: os índices são atualizados em
+        lote e a versão é incrementada uma única vez, então o custo é linear no
+        tamanho do lote em vez de uma operação completa por livro. Por padrão é
+        tudo ou nada: se algum ISBN não existir, nenhum livro é removido.
+
+        Args:
+            isbns: Iterável de ISBNs.
+            partial (bool): Se True, remove os livros encontrados e apenas informa
+                            os ISBNs não encontrados no resultado.
+
+        Returns:
+            dict[str, str]: Resultado por ISBN: "removed" ou "not_found".
+
+        Raises:
+            ValueError: Se algum ISBN não for encontrado e `partial` for False.
+        """
+        results = {}
+        removed: dict[int, Book] = {}
+        for isbn, (key, book) in self._resolve_many(isbns, partial, removal=True).items():
+            if book is None:
+                results[isbn] = "not_found"
+                continue
+            if key not in removed: # Outra grafia do mesmo ISBN pode aparecer no lote
+                removed[key] = self._books.pop(key) # O livro retirado (não uma visão) segue válido
+                self._order.discard(key)
+            results[isbn] = "removed"
+        if removed:
+            if self._search_index is not None:
+                self._search_index.remove_many(removed.values())
+            if self._filter_index is not None:
+                for book in removed.values():
+                    self._filter_index.remove(book)
+            for index in self._sorted_indexes.values():
+                index.remove_many(removed.values())
+            self._version += 1
+            for book in removed.values():
+                self._record_change("remove", book)
+        return results
+
+    def _get_search_index(self) -> SearchIndex:
+        """
+        Retorna o índice de busca, construindo-o na primeira chamada.
+        """
+        if self._search_index is None:
+            self._search_index = SearchIndex()
+            self._search_index.add_many(self._books.values())
+        return self._search_index
+
+    def search_books(self, query: str, limit: int | None = None, fuzzy: bool = False) -> list[Book]:
+        """
+        Busca livros por termos do título e do autor (casando por prefixo, sem
+        diferenciar maiúsculas nem acentos) e por ISBN exato ou prefixo.
+        Usa o índice invertido, sem percorrer a coleção inteira.
+        Uma consulta vazia retorna todos os livros, como a busca do frontend.
 
+        Args:
+            query (str): Texto da busca.
+            limit (int | None): Quantidade máxima de resultados.
+            fuzzy (bool): Se True, tolera erros de digitação e ordena por
+                          relevância (veja fuzzy_matches).
+
+        Returns:
+            list[Book]: Livros encontrados, ordenados por título (ou por relevância).
+        """
+        if not query.strip():
+            books = self.list_books()
+            return books if limit is None else books[:limit]
+        if fuzzy:
+            return [book for _, book in self.fuzzy_matches(query, limit)]
+        books = [self._books[key] for key in self._get_search_index().search(query)]
+        sort_key = lambda book: (normalize_text(book.title), book.key)
+        if limit is not None and limit < len(books):
+            return heapq.nsmallest(limit, books, key=sort_key)
+        books.sort(key=sort_key)
+        return books
+
+    def fuzzy_matches(self, query: str, limit: int | None = None) -> list[tuple[float, Book]]:
+        """
+        Busca tolerante a erros de digitação no título e no autor ("Tolkein"
+        encontra "Tolkien"), sem diferenciar maiúsculas nem acentos. Os termos são
+        comparados por trigramas com o vocabulário do índice de busca, que é muito
+        menor que o catálogo, e os livros são ordenados por similaridade.
+
+        Args:
+            query (str): Texto da busca.
+            limit (int | None): Quantidade máxima de resultados (os k mais parecidos).
+
+        Returns:
+            list[tuple[float, Book]]: Pares (pontuação de 0 a 1, livro), do mais
+                parecido ao menos.
+        """
+        books = self._books
+        return [(score, books[key]) for score, key in self._get_search_index().fuzzy_search(query, limit)]
+
+    def _get_filter_index(self) -> FilterIndex:
+        """
+        Retorna os índices secundários, construindo-os na primeira chamada.
+        """
+        if self._filter_index is None:
+            self._filter_index = FilterIndex()
+            self._filter_index.add_many(self._books.values())
+        return self._filter_index
+
+    def filter_books(self, author: str | None = None, read: bool | None = None,
+                     limit: int | None = None) -> list[Book]:
+        """
+        Retorna os livros de um autor e/ou com um status de leitura, na ordem de
+        inserção, a partir dos índices secundários (sem percorrer a coleção inteira).
+        O autor é comparado sem diferenciar maiúsculas nem acentos.
+
+        Args:
+            author (str | None): Nome do autor, ou None para não filtrar por autor.
+            read (bool | None): Status de leitura, ou None para não filtrar por status.
+            limit (int | None): Quantidade máxima de livros retornados.
+
+        Returns:
+            list[Book]: Os livros encontrados.
+
+        Raises:
+            ValueError: Se nenhum filtro for informado.
+        """
+        keys = self._get_filter_index().keys(author, read)
+        seq_of = self._order.seq_of
+        if limit is not None and limit < len(keys):
+            ordered = heapq.nsmallest(limit, keys, key=seq_of)
+        else:
+            ordered = sorted(keys, key=seq_of)
+        return [self._books[key] for key in ordered]
+
+    def count_books(self, author: str | None = None, read: bool | None = None) -> int:
+        """
+        Retorna a quantidade de livros de um autor e/ou com um status de leitura.
+        Com um único filtro a contagem é O(1) (veja filter_books).
+
+        Raises:
+            ValueError: Se nenhum filtro for informado.
+        """
+        return self._get_filter_index().count(author, read)
+
+    def _get_sorted_index(self, by: str) -> SortedIndex:
+        """
+        Retorna o índice ordenado de uma ordenação, construindo-o no primeiro pedido.
+        """
+        index = self._sorted_indexes.get(by)
+        if index is None:
+            index = self._sorted_indexes[by] = SortedIndex(by)
+            index.add_many(self._books.values())
+        return index
+
+    def indexes_ready(self, query: str) -> bool:
+        """
+        Indica se os índices de um tipo de consulta existem e não têm trabalho
+        adiado, ou seja, se essas consultas apenas leem o estado do gerenciador
+        (veja prepare_indexes).
+
+        Args:
+            query (str): "search", "fuzzy", "filter" (também para count_books)
+                         ou "sorted:<ordenação>", por exemplo "sorted:title".
+        """
+        if query in ("search", "fuzzy"):
+            return self._search_index is not None and self._search_index.ready(fuzzy=query == "fuzzy")
+        if query == "filter":
+            return self._filter_index is not None
+        index = self._sorted_indexes.get(query.removeprefix("sorted:"))
+        return index is not None and index.ready
+
+    def prepare_indexes(self, query: str):
+        """
+        Constrói os índices de um tipo de consulta (veja indexes_ready), se ainda
+        não existirem, e conclui o trabalho adiado por inclusões em lote. Os demais
+        índices continuam sob demanda. Até a próxima escrita, essas consultas não
+        alteram o gerenciador e podem rodar em paralelo sob um lock de leitura
+        (veja ShardedBookManager).
+
+        Raises:
+            ValueError: Se a ordenação de "sorted:<ordenação>" não existir.
+        """
+        if query in ("search", "fuzzy"):
+            self._get_search_index().prepare(fuzzy=query == "fuzzy")
+        elif query == "filter":
+            self._get_filter_index()
+        else:
+            self._get_sorted_index(query.removeprefix("sorted:")).prepare()
+
+    def sorted_page(self, by: str = "title", cursor: tuple | None = None,
+                    limit: int = DEFAULT_PAGE_SIZE, start: str | None = None,
+                    stop: str | None = None) -> tuple[list[Book], tuple | None]:
+        """
+        Retorna uma página de livros ordenados por título ou por autor (e título),
+        sem diferenciar maiúsculas nem acentos, a partir do índice ordenado da
+        ordenação, em O(log n + limit): nenhum pedido reordena a coleção. A primeira
+        página é o "top k" da ordenação; as seguintes partem do cursor, que continua
+        válido mesmo se o livro dele for removido entre as páginas.
+
+        Args:
+            by (str): "title" ou "author".
+            cursor (tuple | None): Cursor retornado pela página anterior (None para a primeira).
+            limit (int): Quantidade máxima de livros na página.
+            start (str | None): Início da faixa no campo principal (inclusivo), por exemplo "M".
+            stop (str | None): Fim da faixa no campo principal (exclusivo), por exemplo "N".
+
+        Returns:
+            tuple[list[Book], tuple | None]: Os livros da página e o cursor da próxima
+                                             página (None quando não há mais livros).
+
+        Raises:
+            ValueError: Se a ordenação, o cursor ou o limite forem inválidos.
+        """
+        fields = sort_fields(by)
+        if cursor is not None:
+            cursor = check_cursor(cursor, fields)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"O limite da página deve estar entre 1 e {MAX_PAGE_SIZE}.")
+        entries = self._get_sorted_index(by).page(cursor, limit + 1, start, stop)
+        next_cursor = entries[limit - 1] if len(entries) > limit else None
+        return [self._books[entry[-1]] for entry in entries[:limit]], next_cursor
+
+    def import_books(self, rows, batch_size: int = DEFAULT_BATCH_SIZE,
+                     max_errors: int = DEFAULT_MAX_ERRORS) -> ImportReport:
+        """
+        Importa livros em massa a partir de um iterável de tuplas (número_da_linha, campos).
+        As linhas são consumidas em lotes: cada lote é validado, tem os ISBNs duplicados
+        (no próprio lote ou na biblioteca) descartados e é inserido de uma só vez.
+        Linhas inválidas são registradas no relatório sem interromper a importação.
+
+        Args:
+            rows: Iterável de tuplas (número_da_linha, campos), em que campos é a tupla
+                  (title, author, isbn, read), como geram read_csv_rows e read_jsonl_rows.
+            batch_size (int): Quantidade de linhas processadas por lote.
+            max_errors (int): Quantidade máxima de erros guardados em detalhe no relatório.
+
+        Returns:
+            ImportReport: Quantidade de livros importados e erros por linha.
+        """
+        report = ImportReport(max_errors)
+        for accepted in validated_batches(rows, batch_size, report, lambda keys: self._books):
+            self._bulk_insert(accepted)
+            report.imported += len(accepted)
+        return report
+
+    def _bulk_insert(self, books: dict[int, Book] | ColumnarBookStore):
+        """
+        Insere um lote de livros já validados e sem ISBNs duplicados.
+        Ponto único de inserção em massa, usado pela importação e pela restauração.
+
+        Args:
+            books (dict[int, Book] | ColumnarBookStore): Livros a inserir, indexados
+                pela chave do ISBN. Um ColumnarBookStore inserido em um gerenciador
+                vazio é adotado como está (restauração de snapshot), sem copiar livro
+                a livro.
+        """
+        if isinstance(books, ColumnarBookStore) and not self._books:
+            self._books = self._order = books
+        else:
+            self._books.update(books)
+            self._order.extend(books)
+        if self._search_index is not None:
+            self._search_index.add_many(books.values())
+        if self._filter_index is not None:
+            self._filter_index.add_many(books.values())
+        for index in self._sorted_indexes.values():
+            index.add_many(books.values())
+        if books:
+            self._version += 1
+            if len(books) > self._journal.maxlen:
+                # O lote não cabe no journal: nenhuma versão anterior pode ser sincronizada.
+                self._journal.clear()
+                self._journal_floor = self._version
+            else:
+                for book in books.values():
+                    self._record_change("add", book)
+
+    def _record_change(self, operation: str, book: Book):
+        """
+        Registra uma mudança no journal, com a versão atual da biblioteca.
+        """
+        journal = self._journal
+        if len(journal) == journal.maxlen:
+            self._journal_floor = journal[0][0] # A mais antiga será descartada pelo append
+        journal.append((self._version, operation, book.key, book.isbn))
+
+    def changes_since(self, version: int) -> list[tuple[str, Book | str]] | None:
+        """
+        Retorna as mudanças feitas depois da versão informada, em O(mudanças), para
+        que um cliente atualize a sua cópia sem recarregar a biblioteca inteira.
+        As mudanças são consolidadas por livro, na ordem da última mudança de cada um:
+        ("add", Book) para um livro incluído (que substitui o que o cliente tiver com
+        o mesmo ISBN), ("read", Book) para um livro já conhecido marcado como lido e
+        ("remove", isbn) para um livro removido.
+
+        Args:
+            version (int): A versão da biblioteca que o cliente já tem.
+
+        Returns:
+            list[tuple[str, Book | str]] | None: As mudanças, ou None se o journal não
+                cobre mais essa versão (ou ela é desconhecida) e o cliente precisa
+                recarregar tudo.
+        """
+        entries = self.journal_since(version)
+        return None if entries is None else consolidate_changes(entries, self._books.get)
+
+    def journal_since(self, version: int) -> list[tuple[int, str, int, str]] | None:
+        """
+        Retorna as entradas do journal, (versão, operação, chave, ISBN), feitas depois
+        da versão informada, em ordem; ou None se o journal não cobre mais essa versão
+        (ou ela é desconhecida). Usado por quem junta os journals de vários
+        gerenciadores (veja ShardedBookManager).
+        """
+        if version < self._journal_floor or version > self._version:
+            return None
+        entries = []
+        for entry in reversed(self._journal):
+            if entry[0] <= version:
+                break
+            entries.append(entry)
+        entries.reverse()
+        return entries
+
+    def book_for_key(self, key: int) -> Book | None:
+        """
+        Retorna o livro com a chave canônica de ISBN informada (veja isbn_key), ou None.
+        """
+        return self._books.get(key)
+
+    def iter_books(self, after: int | None = None):
+        """
+        Gera tuplas (seq, Book) na ordem de inserção, sem copiar a coleção.
+        O seq de cada livro é estável e pode ser usado como cursor para retomar
+        a iteração com `after`. Livros incluídos durante a iteração também são
+        entregues; livros removidos antes de serem alcançados são pulados.
+
+        Args:
+            after (int | None): Retoma a partir do primeiro livro com seq maior que este.
+        """
+        books = self._books
+        for seq, key in self._order.entries(after):
+            yield seq, books[key]
+
+    def books_page(self, cursor: int | None = None,
+                   limit: int = DEFAULT_PAGE_SIZE) -> tuple[list[Book], int | None]:
+        """
+        Retorna uma página de livros na ordem de inserção, em O(log n + limit).
+
+        Args:
+            cursor (int | None): Cursor retornado pela página anterior (None para a primeira).
+            limit (int): Quantidade máxima de livros na página.
+
+        Returns:
+            tuple[list[Book], int | None]: Os livros da página e o cursor da próxima
+                                           página (None quando não há mais livros).
+
+        Raises:
+            ValueError: Se o limite estiver fora do intervalo permitido.
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"O limite da página deve estar entre 1 e {MAX_PAGE_SIZE}.")
+        entries = list(islice(self.iter_books(cursor), limit + 1))
+        next_cursor = entries[limit - 1][0] if len(entries) > limit else None
+        return [book for _, book in entries[:limit]], next_cursor
+
+    def import_csv(self, path, batch_size: int = DEFAULT_BATCH_SIZE,
+                   max_errors: int = DEFAULT_MAX_ERRORS) -> ImportReport:
+        """
+        Importa livros de um arquivo CSV com cabeçalho (title, author, isbn, read).
+        Veja import_books para o tratamento de erros.
+        """
+        return self.import_books(read_csv_rows(path), batch_size, max_errors)
+
+    def import_jsonl(self, path, batch_size: int = DEFAULT_BATCH_SIZE,
+                     max_errors: int = DEFAULT_MAX_ERRORS) -> ImportReport:
+        """
+        Importa livros de um arquivo JSON Lines (um objeto por linha).
+        Veja import_books para o tratamento de erros.
+        """
+        return self.import_books(read_jsonl_rows(path), batch_size, max_errors)
+
+    def export_csv(self, path) -> int:
+        """
+        Exporta todos os livros para um arquivo CSV, na ordem de inserção.
+
+        Returns:
+            int: Quantidade de livros exportados.
+        """
+        return write_csv(path, self._books.values())
+
+    def export_jsonl(self, path) -> int:
+        """
+        Exporta todos os livros para um arquivo JSON Lines, na ordem de inserção.
+
+        Returns:
+            int: Quantidade de livros exportados.
+        """
+        return write_jsonl(path, self._books.values())
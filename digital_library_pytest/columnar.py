@@ -0,0 +1,410 @@
+# digital_library_pytest/columnar.py
+
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from itertools import compress
+
+from digital_library_pytest.book import Book
+from digital_library_pytest.insertion_order import MIN_TOMBSTONES_TO_COMPACT, TOMBSTONE, InsertionOrder
+
+# Inclusões guardadas no dicionário de recentes antes de reconstruir o índice
+# ordenado de chaves (no mínimo; depois, um oitavo do tamanho do índice).
+_MIN_RECENT_KEYS = 1_024
+
+
+class BookView(Book):
+    """
+    Visão de um livro guardado em um ColumnarBookStore.
+    É criada sob demanda e lê (e grava) os campos diretamente nas colunas do
+    armazenamento, então marcar uma visão como lida altera a biblioteca.
+    O ISBN e a sua chave ficam na própria visão, mantendo igualdade e hash por ISBN.
+    """
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ColumnarBookStore", row: int, isbn: str, key: int):
+        """
+        Cria a visão da linha `row` do armazenamento (sem validações: os dados
+        foram validados quando o livro foi incluído).
+        """
+        self._store = store
+        self._row = row
+        self.isbn = isbn
+        self.key = key
+
+    def _current_row(self) -> int:
+        """
+        Retorna a linha atual do livro, relocalizando-a se as linhas foram
+        compactadas ou se o livro foi removido e incluído de novo.
+
+        Raises:
+            LookupError: Se o livro não estiver mais no armazenamento.
+        """
+        store = self._store
+        keys = store._keys
+        if self._row >= len(keys) or keys[self._row] != self.key:
+            row = store._row(self.key)
+            if row is None:
+                raise LookupError(f"Livro com ISBN '{self.isbn}' não está mais na biblioteca.")
+            self._row = row
+        return self._row
+
+    @property
+    def title(self) -> str:
+        """
+        Título do livro, lido da coluna de títulos.
+        """
+        return self._store._titles[self._current_row()]
+
+    @property
+    def author(self) -> str:
+        """
+        Autor do livro, resolvido pelo id internado.
+        """
+        store = self._store
+        return store._author_names[store._author_ids[self._current_row()]]
+
+    @property
+    def read(self) -> bool:
+        """
+        Status de leitura, lido do bitset.
+        """
+        return self._store._get_read(self._current_row())
+
+    @read.setter
+    def read(self, value: bool):
+        """
+        Grava o status de leitura no bitset (usado por Book.mark_as_read).
+        """
+        self._store._set_read(self._current_row(), value)
+
+    def to_json(self) -> bytes:
+        """
+        Retorna o livro em JSON, sempre codificado na hora: visões são criadas a
+        cada acesso e outra visão do mesmo livro pode marcá-lo como lido, então
+        um JSON guardado nesta ficaria desatualizado.
+        """
+        return self._encode_json()
+
+
+def _pack_bits(flags) -> bytearray:
+    """
+    Junta flags de um byte (0 ou 1) em um bitset: a flag 8j+b vai para o bit b do
+    byte j. Usa aritmética de inteiros grandes, feita em C, em vez de um laço.
+    """
+    packed = 0
+    for bit in range(8):
+        packed |= int.from_bytes(flags[bit::8], "little") << bit
+    return bytearray(packed.to_bytes((len(flags) + 7) // 8, "little"))
+
+
+class ColumnarBookStore(InsertionOrder, MutableMapping):
+    """
+    Armazenamento colunar de livros para catálogos grandes, com a interface de um
+    dicionário chave do ISBN -> Book em ordem de inserção (é o que o BookManager usa).
+
+    Em vez de um objeto por livro, guarda uma lista de títulos, uma lista de
+    ISBNs, um array de ids de autor (os nomes são internados: cada autor é
+    guardado uma única vez) e um bitset com o status de leitura. Objetos Book
+    (BookView) só são criados quando alguém os pede.
+
+    As linhas só são acrescentadas, na ordem de inserção, então elas são também
+    a ordem de inserção do BookManager (veja InsertionOrder): a chave e o seq de
+    cada linha ficam em arrays, e uma remoção deixa uma lápide, compactada como
+    na InsertionOrder. A chave do ISBN -> linha é resolvida por busca binária em
+    um índice ordenado de arrays (reconstruído sob demanda) mais um dicionário
+    com as inclusões recentes, sem um objeto int nem uma entrada de dicionário
+    por livro.
+    """
+    def __init__(self):
+        """
+        Inicializa o armazenamento vazio.
+        """
+        super().__init__()
+        self._titles: list[str | None] = []
+        self._isbns: list[str | None] = []
+        self._author_ids = array("I")
+        self._author_names: list[str] = []
+        self._author_index: dict[str, int] = {} # Nome -> id, para internar autores
+        self._read_bits = bytearray()
+        # Índice chave do ISBN -> linha: chaves ordenadas e as linhas correspondentes
+        # (None até a primeira consulta), mais as inclusões feitas desde então.
+        self._sorted_keys: array | None = None
+        self._sorted_rows = array("I")
+        self._recent: dict[int, int] = {}
+
+    @classmethod
+    def from_columns(cls, titles: list[str], authors: list[str], isbns: list[str], keys, flags: bytes):
+        """
+        Monta um armazenamento a partir de colunas já validadas (por exemplo, lidas
+        de um snapshot), sem criar nenhum Book: só listas e arrays montados por
+        operações em C. O índice de chaves é construído na primeira consulta.
+
+        Args:
+            titles (list[str]): Títulos, na ordem de inserção.
+            authors (list[str]): Autores, na mesma ordem.
+            isbns (list[str]): ISBNs, na mesma ordem.
+            keys: Chaves dos ISBNs (veja isbn_key), na mesma ordem.
+            flags (bytes): Status de leitura, um byte 0 ou 1 por livro.
+        """
+        store = cls()
+        store._titles = titles
+        store._isbns = isbns
+        store._author_names = list(dict.fromkeys(authors))
+        store._author_index = dict(zip(store._author_names, range(len(store._author_names))))
+        store._author_ids = array("I", map(store._author_index.__getitem__, authors))
+        store._read_bits = _pack_bits(flags)
+        store._keys = array("Q", keys)
+        store._seqs = array("Q", range(1, len(isbns) + 1))
+        store._next_seq = len(isbns) + 1
+        return store
+
+    def copy(self) -> "ColumnarBookStore":
+        """
+        Retorna uma cópia rasa das colunas (os textos são compartilhados), que não
+        muda com as alterações seguintes deste armazenamento.
+        """
+        store = ColumnarBookStore()
+        store._titles = self._titles.copy()
+        store._isbns = self._isbns.copy()
+        store._author_ids = array("I", self._author_ids)
+        store._author_names = self._author_names.copy()
+        store._author_index = self._author_index.copy()
+        store._read_bits = self._read_bits.copy()
+        store._keys = array("Q", self._keys)
+        store._seqs = array("Q", self._seqs)
+        store._next_seq = self._next_seq
+        store._tombstones = self._tombstones
+        return store
+
+    def _row(self, key: int) -> int | None:
+        """
+        Retorna a linha do livro com a chave de ISBN informada, ou None.
+        """
+        row = self._recent.get(key)
+        if row is not None:
+            return row
+        sorted_keys = self._sorted_keys
+        if sorted_keys is None:
+            self._rebuild_index()
+            sorted_keys = self._sorted_keys
+        position = bisect_left(sorted_keys, key)
+        if position < len(sorted_keys) and sorted_keys[position] == key:
+            row = self._sorted_rows[position]
+            # Uma entrada antiga aponta para uma lápide (livro removido depois do índice).
+            if self._keys[row] == key:
+                return row
+        return None
+
+    def _rebuild_index(self):
+        """
+        Reconstrói o índice ordenado com as linhas vivas e esvazia as recentes.
+        """
+        keys = self._keys
+        rows = sorted(compress(range(len(keys)), keys), key=keys.__getitem__)
+        self._sorted_rows = array("I", rows)
+        self._sorted_keys = array("Q", map(keys.__getitem__, rows))
+        self._recent = {}
+
+    def _index_row(self, key: int, row: int):
+        """
+        Registra a linha de um livro recém-incluído no índice de chaves.
+        """
+        if self._sorted_keys is None:
+            return # O índice ainda não existe; será montado com esta linha
+        self._recent[key] = row
+        if len(self._recent) > max(_MIN_RECENT_KEYS, len(self._sorted_keys) >> 3):
+            self._sorted_keys = None # Reconstruído na próxima consulta
+
+    def _get_read(self, row: int) -> bool:
+        """
+        Lê o bit de leitura de uma linha.
+        """
+        return bool(self._read_bits[row >> 3] & (1 << (row & 7)))
+
+    def _set_read(self, row: int, value: bool):
+        """
+        Grava o bit de leitura de uma linha.
+        """
+        if value:
+            self._read_bits[row >> 3] |= 1 << (row & 7)
+        else:
+            self._read_bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+    def _author_id(self, author: str) -> int:
+        """
+        Retorna o id do autor, registrando-o na primeira ocorrência.
+        """
+        author_id = self._author_index.get(author)
+        if author_id is None:
+            author_id = self._author_index[author] = len(self._author_names)
+            self._author_names.append(author)
+        return author_id
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de livros.
+        """
+        return len(self._keys) - self._tombstones
+
+    def __contains__(self, key) -> bool:
+        """
+        Indica se há um livro com a chave de ISBN informada.
+        """
+        return self._row(key) is not None
+
+    def __iter__(self):
+        """
+        Itera sobre as chaves dos ISBNs, em ordem de inserção.
+        """
+        return filter(None, self._keys) # Pula as lápides (TOMBSTONE é 0)
+
+    def __getitem__(self, key: int) -> Book:
+        """
+        Retorna uma visão do livro com a chave de ISBN informada.
+        """
+        row = self._row(key)
+        if row is None:
+            raise KeyError(key)
+        return BookView(self, row, self._isbns[row], key)
+
+    def get(self, key: int, default=None):
+        """
+        Retorna uma visão do livro, ou `default` se a chave não existir.
+        """
+        row = self._row(key)
+        return default if row is None else BookView(self, row, self._isbns[row], key)
+
+    def _append_row(self, key: int) -> int:
+        """
+        Acrescenta uma linha vazia para a chave, com o próximo seq, e a retorna.
+        """
+        row = len(self._keys)
+        self._titles.append(None)
+        self._isbns.append(None)
+        self._author_ids.append(0)
+        if row >> 3 >= len(self._read_bits):
+            self._read_bits.append(0)
+        self._keys.append(key)
+        self._seqs.append(self._take_seq())
+        return row
+
+    def _write_row(self, row: int, book: Book):
+        """
+        Grava os campos do livro em uma linha.
+        """
+        self._titles[row] = book.title
+        self._isbns[row] = book.isbn
+        self._author_ids[row] = self._author_id(book.author)
+        self._set_read(row, book.read)
+
+    def __setitem__(self, key: int, book: Book):
+        """
+        Grava os campos do livro nas colunas: na linha dele, se já existir, ou em
+        uma nova linha no fim.
+        """
+        row = self._row(key)
+        if row is None:
+            row = self._append_row(key)
+            self._index_row(key, row)
+        self._write_row(row, book)
+
+    def update(self, books):
+        """
+        Grava um lote de livros (um dict chave do ISBN -> Book). As linhas novas
+        são acrescentadas sem passar pelo índice de chaves, reconstruído uma única
+        vez na próxima consulta.
+        """
+        appended = False
+        for key, book in books.items():
+            row = self._row(key)
+            if row is None:
+                row = self._append_row(key)
+                appended = True
+            self._write_row(row, book)
+        if appended:
+            self._sorted_keys = None
+
+    def __delitem__(self, key: int):
+        """
+        Remove o livro, deixando uma lápide na linha dele.
+        """
+        row = self._row(key)
+        if row is None:
+            raise KeyError(key)
+        self._titles[row] = None
+        self._isbns[row] = None
+        self._set_read(row, False)
+        self._keys[row] = TOMBSTONE
+        self._recent.pop(key, None)
+        self._tombstones += 1
+        if self._tombstones >= MIN_TOMBSTONES_TO_COMPACT and self._tombstones * 2 > len(self._keys):
+            self._compact(list(compress(range(len(self._keys)), self._keys)))
+
+    def _compact(self, live: list[int]):
+        """
+        Mantém só as linhas vivas, em ordem, em todas as colunas (veja
+        InsertionOrder._compact). As visões existentes se relocalizam pela chave.
+        """
+        self._titles = list(map(self._titles.__getitem__, live))
+        self._isbns = list(map(self._isbns.__getitem__, live))
+        self._author_ids = array("I", map(self._author_ids.__getitem__, live))
+        self._read_bits = _pack_bits(bytes(map(self._get_read, live)))
+        super()._compact(live)
+        self._sorted_keys = None
+
+    def pop(self, key: int, *default):
+        """
+        Remove o livro e o retorna como um Book independente do armazenamento
+        (uma visão deixaria de funcionar assim que a linha fosse liberada).
+        """
+        row = self._row(key)
+        if row is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        book = Book(self._titles[row], self._author_names[self._author_ids[row]], self._isbns[row])
+        book.read = self._get_read(row)
+        del self[key]
+        return book
+
+    def values(self):
+        """
+        Gera visões de todos os livros, em ordem de inserção.
+        """
+        isbns, keys = self._isbns, self._keys
+        for row in compress(range(len(keys)), keys):
+            yield BookView(self, row, isbns[row], keys[row])
+
+    # Ordem de inserção (veja InsertionOrder): a posição de um livro é a sua linha,
+    # registrada por __setitem__ e marcada com uma lápide por __delitem__.
+
+    def seq_of(self, key: int) -> int:
+        """
+        Retorna o seq de um livro do armazenamento.
+        """
+        return self._seqs[self._position(key)]
+
+    def _position(self, key: int) -> int:
+        """
+        Retorna a linha de um livro do armazenamento.
+        """
+        row = self._row(key)
+        if row is None:
+            raise KeyError(key)
+        return row
+
+    def append(self, key: int):
+        """
+        Nada a fazer: a linha do livro já foi acrescentada por __setitem__.
+        """
+
+    def extend(self, keys):
+        """
+        Nada a fazer: as linhas do lote já foram acrescentadas por update.
+        """
+
+    def discard(self, key: int):
+        """
+        Nada a fazer: a linha do livro já recebeu a lápide em __delitem__.
+        """
@@ -0,0 +1,540 @@
+# digital_library_pytest/concurrent_manager.py
+
+import threading
+from bisect import bisect_right
+from collections import deque
+from contextlib import contextmanager
+from itertools import chain, islice
+from operator import itemgetter
+
+from digital_library_pytest.book import Book, isbn_key
+from digital_library_pytest.book_manager import (
+    DEFAULT_JOURNAL_SIZE,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    BookManager,
+    consolidate_changes,
+    not_found_message,
+)
+from digital_library_pytest.search_index import normalize_text
+from digital_library_pytest.sorted_index import sort_entry, sort_fields
+
+# Quantidade padrão de shards do ShardedBookManager.
+DEFAULT_SHARDS = 16
+
+_seq_of_entry = itemgetter(0)
+
+
+class ReadWriteLock:
+    """
+    Lock de leitores e escritor: vários leitores simultâneos ou um único escritor.
+    Escritores têm preferência: novos leitores esperam enquanto houver escritor
+    aguardando, evitando que leituras contínuas impeçam as escritas.
+    Não é reentrante.
+    """
+    def __init__(self):
+        """
+        Inicializa o lock livre.
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self):
+        """
+        Adquire o lock para leitura.
+        """
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self):
+        """
+        Libera o lock de leitura.
+        """
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self):
+        """
+        Adquire o lock para escrita, esperando os leitores atuais terminarem.
+        """
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self):
+        """
+        Libera o lock de escrita.
+        """
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """
+        Mantém o lock de leitura durante o bloco `with`.
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """
+        Mantém o lock de escrita durante o bloco `with`.
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class _Shard:
+    """
+    Uma partição da biblioteca: um BookManager protegido por um ReadWriteLock,
+    o seq global de cada livro e um snapshot imutável para leituras sem lock.
+    """
+    def __init__(self):
+        """
+        Inicializa um shard vazio.
+        """
+        self.manager = BookManager()
+        self.lock = ReadWriteLock()
+        self.seqs: dict[int, int] = {} # Chave do ISBN -> seq global de inserção
+        self.snapshot: tuple[tuple[int, Book], ...] | None = None # (seq, Book) em ordem; None se desatualizado
+
+    def read_snapshot(self) -> tuple[tuple[int, Book], ...]:
+        """
+        Retorna o snapshot atual, reconstruindo-o sob o lock de leitura se uma
+        escrita o invalidou. Na ausência de escritas, a leitura não usa lock.
+        """
+        snapshot = self.snapshot
+        if snapshot is None:
+            with self.lock.read_locked():
+                snapshot = self.snapshot
+                if snapshot is None:
+                    seqs = self.seqs
+                    snapshot = tuple((seqs[book.key], book) for book in self.manager.list_books())
+                    # Atribuído ainda sob o lock: um escritor só invalida depois que saímos.
+                    self.snapshot = snapshot
+        return snapshot
+
+    @contextmanager
+    def query_locked(self, query: str):
+        """
+        Mantém o lock de leitura durante o bloco `with`, com os índices do tipo de
+        consulta prontos (veja BookManager.indexes_ready): as consultas apenas os
+        leem e rodam em paralelo. Se faltarem índices, ou uma escrita deixou algum
+        por reordenar, eles são preparados sob o lock de escrita e a verificação é
+        refeita sob o de leitura (outro escritor pode ter passado entre os dois).
+        """
+        while True:
+            with self.lock.read_locked():
+                if self.manager.indexes_ready(query):
+                    yield
+                    return
+            with self.lock.write_locked():
+                self.manager.prepare_indexes(query)
+
+
+class ShardedBookManager:
+    """
+    BookManager seguro para uso concorrente por várias threads.
+    Os livros são particionados pela chave canônica do ISBN entre shards independentes,
+    cada um com seu próprio lock de leitores e escritor, de modo que escritas em
+    shards diferentes não disputam o mesmo lock. A listagem usa snapshots
+    imutáveis por shard e não bloqueia enquanto não houver escritas.
+
+    Mantém os métodos públicos e as mensagens de ValueError do BookManager.
+    """
+    def __init__(self, shards: int = DEFAULT_SHARDS, journal_size: int = DEFAULT_JOURNAL_SIZE):
+        """
+        Cria o gerenciador com a quantidade de shards informada.
+
+        Args:
+            shards (int): Quantidade de partições.
+            journal_size (int): Quantidade máxima de mudanças guardadas para changes_since.
+
+        Raises:
+            ValueError: Se shards ou journal_size forem menores que 1.
+        """
+        if shards < 1:
+            raise ValueError("É preciso pelo menos um shard.")
+        if journal_size < 1:
+            raise ValueError("O journal de mudanças precisa guardar ao menos uma mudança.")
+        self._shards = [_Shard() for _ in range(shards)]
+        self._seq_lock = threading.Lock() # Protege o seq, a versão e o journal globais
+        self._next_seq = 1
+        self._version = 0
+        # Journal global (versão, operação, chave, ISBN), com as entradas dos journals
+        # dos shards sob a versão global (veja BookManager.changes_since).
+        self._journal: deque[tuple[int, str, int, str]] = deque(maxlen=journal_size)
+        self._journal_floor = 0
+        self._merged: tuple[tuple, list[tuple[int, Book]]] = ((), []) # (snapshots usados, livros ordenados)
+
+    def _shard_for(self, key: int | None) -> _Shard:
+        """
+        Retorna o shard responsável pela chave de ISBN. Um ISBN inválido (None)
+        vai para o primeiro shard, que simplesmente não o encontrará.
+        """
+        return self._shards[(key or 0) % len(self._shards)]
+
+    def _take_seq(self) -> int:
+        """
+        Reserva o próximo número de sequência global.
+        """
+        with self._seq_lock:
+            seq = self._next_seq
+            self._next_seq = seq + 1
+        return seq
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de livros na biblioteca.
+        """
+        return sum(len(shard.manager) for shard in self._shards)
+
+    def __contains__(self, isbn: str) -> bool:
+        """
+        Indica se há um livro com o ISBN informado.
+        """
+        shard = self._shard_for(isbn_key(isbn))
+        with shard.lock.read_locked():
+            return isbn in shard.manager
+
+    @property
+    def version(self) -> int:
+        """
+        Versão monotônica da biblioteca, incrementada a cada operação que muda
+        algum shard (veja BookManager.version).
+        """
+        return self._version
+
+    def _record_changes(self, shards: list[tuple[_Shard, int]]):
+        """
+        Copia para o journal global, sob uma nova versão, as mudanças que uma
+        operação fez nos shards. Chamado com os shards ainda travados para escrita,
+        de modo que as mudanças de um livro entram no journal na ordem em que foram
+        feitas.
+
+        Args:
+            shards (list[tuple[_Shard, int]]): Os shards envolvidos e a versão de cada
+                um antes da operação.
+        """
+        entries = []
+        for shard, before in shards:
+            shard_entries = shard.manager.journal_since(before)
+            if shard_entries is None:
+                entries = None # O journal do shard não cobre a operação inteira
+                break
+            entries.extend(shard_entries)
+        if entries == []:
+            return
+        with self._seq_lock:
+            self._version += 1
+            journal = self._journal
+            if entries is None or len(entries) > journal.maxlen:
+                # Nenhuma versão anterior pode mais ser sincronizada.
+                journal.clear()
+                self._journal_floor = self._version
+                return
+            for _, operation, key, isbn in entries:
+                if len(journal) == journal.maxlen:
+                    self._journal_floor = journal[0][0] # A mais antiga será descartada pelo append
+                journal.append((self._version, operation, key, isbn))
+
+    def changes_since(self, version: int) -> list[tuple[str, Book | str]] | None:
+        """
+        Retorna as mudanças feitas depois da versão informada, consolidadas por livro
+        (veja BookManager.changes_since). O estado de cada livro é lido do seu shard,
+        sob o lock de leitura, e pode incluir mudanças posteriores ao journal lido;
+        reaplicá-las na próxima sincronização não altera a cópia do cliente.
+        """
+        with self._seq_lock:
+            if version < self._journal_floor or version > self._version:
+                return None
+            entries = []
+            for entry in reversed(self._journal):
+                if entry[0] <= version:
+                    break
+                entries.append(entry)
+        entries.reverse()
+        return consolidate_changes(entries, self._book_for_key)
+
+    def _book_for_key(self, key: int) -> Book | None:
+        """
+        Retorna o livro com a chave de ISBN informada, lido sob o lock do seu shard.
+        """
+        shard = self._shard_for(key)
+        with shard.lock.read_locked():
+            return shard.manager.book_for_key(key)
+
+    def add_book(self, book: Book):
+        """
+        Adiciona um livro à biblioteca.
+
+        Raises:
+            ValueError: Se um livro com o mesmo ISBN já existir na biblioteca.
+        """
+        shard = self._shard_for(book.key)
+        with shard.lock.write_locked():
+            before = shard.manager.version
+            shard.manager.add_book(book)
+            # O seq é reservado sob o lock do shard, então cresce na ordem de inserção do shard.
+            shard.seqs[book.key] = self._take_seq()
+            shard.snapshot = None
+            self._record_changes([(shard, before)])
+
+    def add_books(self, books, partial: bool = False) -> list[str]:
+        """
+        Adiciona vários livros de uma vez (veja BookManager.add_books): agrupa-os
+        por shard e trava, em ordem de índice, apenas os shards envolvidos, com uma
+        única chamada add_books por shard. Por padrão, nenhum livro é adicionado se
+        algum ISBN for repetido.
+
+        Raises:
+            ValueError: Se algum ISBN se repetir no lote ou já existir na biblioteca
+                        e `partial` for False.
+        """
+        books = list(books)
+        results = ["added"] * len(books)
+        first_of_key: dict[int, int] = {}
+        for position, book in enumerate(books):
+            if first_of_key.setdefault(book.key, position) != position:
+                if not partial:
+                    raise ValueError(f"Livro com este ISBN já existe na biblioteca.")
+                results[position] = "already_exists"
+        groups: dict[int, list[int]] = {}
+        for position in first_of_key.values():
+            groups.setdefault(books[position].key % len(self._shards), []).append(position)
+        shards = [(self._shards[index], groups[index]) for index in sorted(groups)]
+        for shard, _ in shards:
+            shard.lock.acquire_write()
+        try:
+            if not partial and any(shard.manager.book_for_key(books[position].key) is not None
+                                   for shard, group in shards for position in group):
+                raise ValueError(f"Livro com este ISBN já existe na biblioteca.")
+            versions = [(shard, shard.manager.version) for shard, _ in shards]
+            for shard, group in shards:
+                shard_results = shard.manager.add_books([books[position] for position in group], partial=True)
+                for position, result in zip(group, shard_results):
+                    results[position] = result
+            # Os seqs seguem a ordem do lote, reservados com todos os shards travados.
+            for book, result in zip(books, results):
+                if result == "added":
+                    shard = self._shard_for(book.key)
+                    shard.seqs[book.key] = self._take_seq()
+                    shard.snapshot = None
+            self._record_changes(versions)
+        finally:
+            for shard, _ in reversed(shards):
+                shard.lock.release_write()
+        return results
+
+    def mark_as_read(self, isbn: str):
+        """
+        Marca um livro como lido, dado o seu ISBN.
+
+        Raises:
+            ValueError: Se o livro com o ISBN fornecido não for encontrado.
+        """
+        shard = self._shard_for(isbn_key(isbn))
+        with shard.lock.write_locked():
+            before = shard.manager.version
+            shard.manager.mark_as_read(isbn)
+            self._record_changes([(shard, before)])
+
+    def remove_book(self, isbn: str):
+        """
+        Remove um livro da biblioteca, dado o seu ISBN.
+
+        Raises:
+            ValueError: Se o livro com o ISBN fornecido não for encontrado.
+        """
+        key = isbn_key(isbn)
+        shard = self._shard_for(key)
+        with shard.lock.write_locked():
+            before = shard.manager.version
+            shard.manager.remove_book(isbn)
+            del shard.seqs[key]
+            shard.snapshot = None
+            self._record_changes([(shard, before)])
+
+    def _apply_many(self, isbns, partial: bool, removal: bool) -> dict[str, str]:
+        """
+        Aplica uma operação em lote: agrupa os ISBNs por shard e trava, em ordem de
+        índice (evitando impasses), apenas os shards envolvidos. Com todos eles
+        travados, a verificação de tudo ou nada vale para o lote inteiro.
+        """
+        unique = list(dict.fromkeys(isbns))
+        groups: dict[int, list[str]] = {}
+        for isbn in unique:
+            groups.setdefault((isbn_key(isbn) or 0) % len(self._shards), []).append(isbn)
+        shards = [(self._shards[index], groups[index]) for index in sorted(groups)]
+        for shard, _ in shards:
+            shard.lock.acquire_write()
+        try:
+            if not partial:
+                missing = [isbn for shard, group in shards for isbn in group if isbn not in shard.manager]
+                if missing:
+                    raise ValueError(not_found_message(missing, removal))
+            results = {}
+            versions = [(shard, shard.manager.version) for shard, _ in shards]
+            for shard, group in shards:
+                if removal:
+                    shard_results = shard.manager.remove_many(group, partial=True)
+                    for isbn, result in shard_results.items():
+                        if result == "removed":
+                            shard.seqs.pop(isbn_key(isbn), None)
+                    shard.snapshot = None
+                else:
+                    shard_results = shard.manager.mark_many_as_read(group, partial=True)
+                results.update(shard_results)
+            self._record_changes(versions)
+        finally:
+            for shard, _ in reversed(shards):
+                shard.lock.release_write()
+        return {isbn: results[isbn] for isbn in unique}
+
+    def mark_many_as_read(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Marca vários livros como lidos (veja BookManager.mark_many_as_read).
+        """
+        return self._apply_many(isbns, partial, removal=False)
+
+    def remove_many(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Remove vários livros (veja BookManager.remove_many).
+        """
+        return self._apply_many(isbns, partial, removal=True)
+
+    def _ordered_entries(self) -> list[tuple[int, Book]]:
+        """
+        Retorna todos os (seq, Book) em ordem global de inserção.
+        A junção dos snapshots é reaproveitada enquanto nenhum shard mudar.
+        """
+        snapshots = tuple(shard.read_snapshot() for shard in self._shards)
+        used, merged = self._merged
+        if len(used) == len(snapshots) and all(old is new for old, new in zip(used, snapshots)):
+            return merged
+        # Cada snapshot já está ordenado por seq; o Timsort aproveita essas sequências.
+        merged = sorted(chain.from_iterable(snapshots), key=_seq_of_entry)
+        self._merged = (snapshots, merged)
+        return merged
+
+    def list_books(self) -> list[Book]:
+        """
+        Retorna uma nova lista com todos os livros, na ordem de inserção.
+        Lê apenas snapshots imutáveis: nunca observa um shard no meio de uma escrita.
+        """
+        return [book for _, book in self._ordered_entries()]
+
+    def iter_books(self, after: int | None = None):
+        """
+        Gera tuplas (seq, Book) na ordem de inserção a partir de um snapshot
+        consistente (veja BookManager.iter_books).
+        """
+        entries = self._ordered_entries()
+        position = 0 if after is None else bisect_right(entries, after, key=_seq_of_entry)
+        yield from islice(entries, position, None)
+
+    def books_page(self, cursor: int | None = None,
+                   limit: int = DEFAULT_PAGE_SIZE) -> tuple[list[Book], int | None]:
+        """
+        Retorna uma página de livros na ordem de inserção (veja BookManager.books_page).
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"O limite da página deve estar entre 1 e {MAX_PAGE_SIZE}.")
+        entries = list(islice(self.iter_books(cursor), limit + 1))
+        next_cursor = entries[limit - 1][0] if len(entries) > limit else None
+        return [book for _, book in entries[:limit]], next_cursor
+
+    def search_books(self, query: str, limit: int | None = None, fuzzy: bool = False) -> list[Book]:
+        """
+        Busca em todos os shards e junta os resultados (veja BookManager.search_books).
+        Cada shard é consultado sob o lock de leitura (veja _Shard.query_locked).
+        """
+        if not query.strip():
+            books = self.list_books()
+            return books if limit is None else books[:limit]
+        if fuzzy:
+            return [book for _, book in self.fuzzy_matches(query, limit)]
+        results = []
+        for shard in self._shards:
+            with shard.query_locked("search"):
+                results.extend(shard.manager.search_books(query, limit))
+        results.sort(key=lambda book: (normalize_text(book.title), book.key))
+        return results if limit is None else results[:limit]
+
+    def fuzzy_matches(self, query: str, limit: int | None = None) -> list[tuple[float, Book]]:
+        """
+        Busca tolerante a erros em todos os shards (veja BookManager.fuzzy_matches):
+        cada shard entrega os seus `limit` mais parecidos, sob o lock de leitura, e
+        os resultados são reordenados pela pontuação.
+        """
+        matches = []
+        for shard in self._shards:
+            with shard.query_locked("fuzzy"):
+                matches.extend(shard.manager.fuzzy_matches(query, limit))
+        matches.sort(key=lambda match: (-match[0], match[1].key))
+        return matches if limit is None else matches[:limit]
+
+    def sorted_page(self, by: str = "title", cursor: tuple | None = None,
+                    limit: int = DEFAULT_PAGE_SIZE, start: str | None = None,
+                    stop: str | None = None) -> tuple[list[Book], tuple | None]:
+        """
+        Retorna uma página de livros ordenados por título ou por autor (veja
+        BookManager.sorted_page). Cada shard entrega a sua própria página a partir
+        do cursor, sob o lock de leitura, e as páginas são intercaladas pela
+        entrada de ordenação de cada livro.
+        """
+        fields = sort_fields(by)
+        entries = []
+        more = False
+        for shard in self._shards:
+            with shard.query_locked(f"sorted:{by}"):
+                books, next_cursor = shard.manager.sorted_page(by, cursor, limit, start, stop)
+            entries.extend((sort_entry(book, fields), book) for book in books)
+            more = more or next_cursor is not None
+        entries.sort(key=itemgetter(0))
+        # Um shard com mais livros já entregou `limit` deles, então há uma página seguinte.
+        next_cursor = entries[limit - 1][0] if more or len(entries) > limit else None
+        return [book for _, book in entries[:limit]], next_cursor
+
+    def filter_books(self, author: str | None = None, read: bool | None = None,
+                     limit: int | None = None) -> list[Book]:
+        """
+        Filtra em todos os shards e junta os resultados na ordem global de inserção
+        (veja BookManager.filter_books). Como na busca, cada shard é consultado sob o
+        lock de leitura.
+        """
+        entries = []
+        for shard in self._shards:
+            with shard.query_locked("filter"):
+                seqs = shard.seqs
+                entries.extend((seqs[book.key], book) for book in shard.manager.filter_books(author, read, limit))
+        entries.sort(key=_seq_of_entry)
+        books = [book for _, book in entries]
+        return books if limit is None else books[:limit]
+
+    def count_books(self, author: str | None = None, read: bool | None = None) -> int:
+        """
+        Soma as contagens dos shards (veja BookManager.count_books).
+        """
+        total = 0
+        for shard in self._shards:
+            with shard.query_locked("filter"):
+                total += shard.manager.count_books(author, read)
+        return total
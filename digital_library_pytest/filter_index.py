@@ -0,0 +1,111 @@
+# digital_library_pytest/filter_index.py
+
+from digital_library_pytest.book import Book
+from digital_library_pytest.search_index import normalize_text
+
+
+def normalize_author(author: str) -> str:
+    """
+    Normaliza o nome de um autor para filtragem: sem acentos, sem diferenciar
+    maiúsculas e com espaços repetidos reduzidos ("JRR  Tolkien" == "jrr tolkien").
+    """
+    return " ".join(normalize_text(author).split())
+
+
+def require_criteria(author: str | None, read: bool | None):
+    """
+    Garante que ao menos um critério de filtro foi informado.
+
+    Raises:
+        ValueError: Se autor e status de leitura forem ambos None.
+    """
+    if author is None and read is None:
+        raise ValueError("Informe ao menos um critério de filtro (autor ou status de leitura).")
+
+
+class FilterIndex:
+    """
+    Índices secundários por autor e por status de leitura, mantidos
+    incrementalmente pelo BookManager a cada inclusão, marcação e remoção.
+    Guardam as chaves dos livros (Book.key); contagens por um único critério
+    são O(1), pois são apenas o tamanho de um conjunto.
+    """
+    def __init__(self):
+        """
+        Inicializa os índices vazios.
+        """
+        self._by_author: dict[str, set[int]] = {} # Autor normalizado -> chaves dos livros
+        self._by_read: tuple[set[int], set[int]] = (set(), set()) # (não lidos, lidos)
+
+    def add(self, book: Book):
+        """
+        Indexa um livro recém-adicionado.
+        """
+        author = normalize_author(book.author)
+        keys = self._by_author.get(author)
+        if keys is None:
+            self._by_author[author] = {book.key}
+        else:
+            keys.add(book.key)
+        self._by_read[book.read].add(book.key)
+
+    def add_many(self, books):
+        """
+        Indexa um lote de livros. Autores repetidos no lote (o caso comum em
+        catálogos) são normalizados uma única vez.
+        """
+        by_author = self._by_author
+        unread, read = self._by_read
+        normalized: dict[str, str] = {}
+        for book in books:
+            author = normalized.get(book.author)
+            if author is None:
+                author = normalized[book.author] = normalize_author(book.author)
+            keys = by_author.get(author)
+            if keys is None:
+                by_author[author] = {book.key}
+            else:
+                keys.add(book.key)
+            (read if book.read else unread).add(book.key)
+
+    def mark_as_read(self, book: Book):
+        """
+        Move um livro para o conjunto dos lidos.
+        """
+        self._by_read[False].discard(book.key)
+        self._by_read[True].add(book.key)
+
+    def remove(self, book: Book):
+        """
+        Remove um livro dos índices.
+        """
+        author = normalize_author(book.author)
+        keys = self._by_author.get(author)
+        if keys is not None:
+            keys.discard(book.key)
+            if not keys:
+                del self._by_author[author]
+        self._by_read[book.read].discard(book.key)
+
+    def keys(self, author: str | None = None, read: bool | None = None) -> set[int]:
+        """
+        Retorna as chaves dos livros que atendem aos critérios informados.
+        Com um único critério, retorna o conjunto do próprio índice, que não deve
+        ser modificado; com os dois, a interseção percorre o menor conjunto.
+
+        Raises:
+            ValueError: Se nenhum critério for informado.
+        """
+        require_criteria(author, read)
+        by_read = None if read is None else self._by_read[bool(read)]
+        if author is None:
+            return by_read
+        by_author = self._by_author.get(normalize_author(author), set())
+        return by_author if by_read is None else by_author & by_read
+
+    def count(self, author: str | None = None, read: bool | None = None) -> int:
+        """
+        Retorna a quantidade de livros que atendem aos critérios, em O(1) para
+        um único critério.
+        """
+        return len(self.keys(author, read))
@@ -0,0 +1,169 @@
+# digital_library_pytest/fuzzy_index.py
+
+from collections import Counter
+from difflib import SequenceMatcher
+from itertools import chain
+
+# Similaridade mínima (coeficiente de Jaccard entre trigramas) para um token ser
+# considerado parecido com um termo da busca. Um pouco abaixo do padrão do pg_trgm
+# (0.3) para aceitar letras trocadas de lugar ("sehnor" x "senhor" dá 0.27); a
+# ordenação fina de similar() descarta os candidatos ruins que isso admite.
+DEFAULT_THRESHOLD = 0.25
+
+# Quantidade máxima de tokens parecidos considerados por termo da busca: os mais
+# parecidos bastam, e o limite impede que termos curtos ou comuns varram o catálogo.
+MAX_SIMILAR_TOKENS = 32
+
+# Candidatos (os de mais trigramas em comum) reordenados pela similaridade fina
+# em cada termo; a comparação caractere a caractere é mais cara que a contagem.
+_MAX_CANDIDATES = 2 * MAX_SIMILAR_TOKENS
+
+# Tamanho de lote a partir do qual remove_tokens filtra as listas de uma vez.
+_MIN_BATCH_TO_FILTER = 64
+
+
+def trigrams(token: str) -> set[str]:
+    """
+    Retorna os trigramas de caracteres de um token já normalizado, com dois espaços
+    antes e um depois (como o pg_trgm), para que o início da palavra pese mais e
+    tokens curtos também tenham trigramas: "orwel" -> {"  o", " or", "orw", ...}.
+    """
+    padded = f"  {token} "
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+def _indexed_trigrams(token: str) -> set[str]:
+    """
+    Retorna os trigramas de um token guardados no índice: todos menos o inicial
+    ("  o"), que só indica a primeira letra e teria as maiores listas do índice
+    (todos os tokens com a mesma inicial). Ele é contado à parte em similar().
+    """
+    padded = f" {token} "
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+
+def similarity(first: set[str], second: set[str]) -> float:
+    """
+    Similaridade entre dois conjuntos de trigramas (Jaccard), de 0 a 1.
+    """
+    shared = len(first & second)
+    return shared / (len(first) + len(second) - shared)
+
+
+def token_similarity(term: str, token: str, threshold: float = DEFAULT_THRESHOLD) -> float:
+    """
+    Semelhança entre um termo e um token normalizados, como em TrigramIndex.similar:
+    a razão do difflib, ou 0 se a similaridade de trigramas ficar abaixo de threshold.
+    Usada por quem compara tokens sem manter um TrigramIndex.
+    """
+    if similarity(trigrams(term), trigrams(token)) < threshold:
+        return 0.0
+    return SequenceMatcher(None, token, term, autojunk=False).ratio()
+
+
+class TrigramIndex:
+    """
+    Índice trigrama -> tokens do vocabulário da busca. Guarda tokens, não livros:
+    o vocabulário é muito menor que o catálogo, então a busca por tokens parecidos
+    não depende da quantidade de livros. Os livros de cada token vêm depois do
+    índice invertido (veja SearchIndex.fuzzy_search).
+    """
+    def __init__(self):
+        """
+        Inicializa o índice vazio.
+        """
+        # Trigrama -> tokens que o contêm. Listas ocupam bem menos memória que
+        # conjuntos, e tokens só saem quando o último livro com eles é removido.
+        self._tokens: dict[str, list[str]] = {}
+        self._sizes: dict[str, int] = {} # Token -> quantidade de trigramas distintos (veja trigrams)
+
+    def add_tokens(self, tokens):
+        """
+        Indexa tokens que acabaram de entrar no vocabulário.
+        """
+        index = self._tokens
+        sizes = self._sizes
+        for token in tokens:
+            token_trigrams = _indexed_trigrams(token)
+            sizes[token] = len(token_trigrams) + 1 # Mais o trigrama inicial
+            for trigram in token_trigrams:
+                tokens_with = index.get(trigram)
+                if tokens_with is None:
+                    index[trigram] = [token]
+                else:
+                    tokens_with.append(token)
+
+    def remove_tokens(self, tokens):
+        """
+        Remove tokens que saíram do vocabulário. Lotes grandes filtram cada lista
+        afetada uma única vez.
+        """
+        tokens = list(tokens)
+        index = self._tokens
+        for token in tokens:
+            del self._sizes[token]
+        if len(tokens) < _MIN_BATCH_TO_FILTER:
+            for token in tokens:
+                for trigram in _indexed_trigrams(token):
+                    tokens_with = index[trigram]
+                    tokens_with.remove(token)
+                    if not tokens_with:
+                        del index[trigram]
+            return
+        removed = set(tokens)
+        for trigram in set().union(*(_indexed_trigrams(token) for token in removed)):
+            kept = [token for token in index[trigram] if token not in removed]
+            if kept:
+                index[trigram] = kept
+            else:
+                del index[trigram]
+
+    def similar(self, term: str, threshold: float = DEFAULT_THRESHOLD,
+                limit: int = MAX_SIMILAR_TOKENS) -> list[tuple[float, str]]:
+        """
+        Retorna os tokens parecidos com um termo normalizado, do mais parecido ao menos.
+
+        Os trigramas restringem os candidatos: os trigramas em comum são contados de
+        uma vez (Counter sobre as listas dos trigramas do termo, mais o inicial quando
+        a primeira letra coincide) e só passam os tokens com similaridade de
+        trigramas >= threshold. Como ela nunca passa de comuns /
+        trigramas do termo, os demais nem têm a similaridade calculada. Os candidatos
+        são então ordenados pela razão de semelhança do difflib, que distingue uma
+        troca de letras ("tolkein" x "tolkien") de tokens que só têm o início igual.
+
+        Returns:
+            list[tuple[float, str]]: Pares (semelhança de 0 a 1, token).
+        """
+        term_trigrams = _indexed_trigrams(term)
+        size = len(term_trigrams) + 1 # Mais o trigrama inicial
+        index = self._tokens
+        sizes = self._sizes
+        initial = term[0]
+        shared = Counter(chain.from_iterable(index.get(trigram, ()) for trigram in term_trigrams))
+        # Com c trigramas em comum (mais o inicial), a similaridade é no máximo
+        # (c + 1) / size. Para termos curtos, um único trigrama em comum ainda pode
+        # bastar, mas só para tokens curtos, com até (2 / threshold - size + 2)
+        # trigramas; len(token) + 1 os limita sem consultar _sizes para cada contado.
+        minimum = threshold * size - 1
+        if minimum > 1:
+            candidates = [(token, count) for token, count in shared.items() if count >= minimum]
+        else:
+            short = 2 / threshold - size + 1
+            candidates = [(token, count) for token, count in shared.items()
+                          if count >= 2 or len(token) <= short]
+        scored = []
+        for token, count in candidates:
+            if token[0] == initial:
+                count += 1
+            score = count / (size + sizes[token] - count)
+            if score >= threshold:
+                scored.append((score, token))
+        scored.sort(key=lambda pair: (-pair[0], pair[1]))
+        matcher = SequenceMatcher(autojunk=False)
+        matcher.set_seq2(term) # O difflib guarda a análise da segunda sequência
+        ranked = []
+        for _, token in scored[:_MAX_CANDIDATES]:
+            matcher.set_seq1(token)
+            ranked.append((matcher.ratio(), token))
+        ranked.sort(key=lambda pair: (-pair[0], pair[1]))
+        return ranked[:limit]
@@ -0,0 +1,129 @@
+# digital_library_pytest/insertion_order.py
+
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+
+# Remoções acumuladas a partir das quais a ordem de inserção é compactada
+# (desde que também representem mais da metade das posições).
+MIN_TOMBSTONES_TO_COMPACT = 1_024
+
+# Chave que marca uma posição removida (nenhum ISBN tem chave 0; veja isbn_key).
+TOMBSTONE = 0
+
+
+class InsertionOrder:
+    """
+    Ordem de inserção dos livros para paginação por cursor. Cada livro recebe um
+    número de sequência crescente que nunca é reutilizado; o cursor de uma página
+    é o último seq entregue, localizado por busca binária em `_seqs`. Remoções
+    apenas deixam uma lápide (TOMBSTONE) em `_keys`, compactada de tempos em
+    tempos, o que mantém os cursores válidos mesmo com a coleção mudando entre
+    páginas.
+
+    As posições ficam em dois arrays paralelos (seq e chave do ISBN), sem um
+    objeto int por livro. O ColumnarBookStore usa a mesma estrutura com as
+    linhas do armazenamento como posições (veja _position).
+    """
+    def __init__(self):
+        """
+        Inicializa a ordem vazia.
+        """
+        self._seqs = array("Q") # Seq de cada posição, em ordem crescente
+        self._keys = array("Q") # Chave do ISBN de cada posição, ou TOMBSTONE
+        self._seq_of: dict[int, int] = {} # Chave do ISBN -> seq
+        self._next_seq = 1
+        self._tombstones = 0
+        self.generation = 0 # Incrementado a cada compactação (as posições mudam)
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de livros na ordem.
+        """
+        return len(self._keys) - self._tombstones
+
+    def _take_seq(self) -> int:
+        """
+        Reserva o próximo número de sequência.
+        """
+        seq = self._next_seq
+        self._next_seq = seq + 1
+        return seq
+
+    def append(self, key: int):
+        """
+        Registra um livro recém-inserido no fim da ordem.
+        """
+        seq = self._take_seq()
+        self._seqs.append(seq)
+        self._keys.append(key)
+        self._seq_of[key] = seq
+
+    def extend(self, keys):
+        """
+        Registra um lote de livros recém-inseridos, com seqs atribuídos em bloco.
+        """
+        keys = list(keys) # Os próprios objetos das chaves, compartilhados com o dicionário
+        seqs = range(self._next_seq, self._next_seq + len(keys))
+        self._next_seq = seqs.stop
+        self._seqs.extend(seqs)
+        self._keys.fromlist(keys)
+        self._seq_of.update(zip(keys, seqs))
+
+    def seq_of(self, key: int) -> int:
+        """
+        Retorna o seq de um livro da ordem.
+        """
+        return self._seq_of[key]
+
+    def _position(self, key: int) -> int:
+        """
+        Retorna a posição atual de um livro da ordem.
+        """
+        return bisect_left(self._seqs, self._seq_of[key])
+
+    def discard(self, key: int):
+        """
+        Marca a posição de um livro removido com uma lápide e compacta a ordem
+        quando as lápides passam a ocupar mais da metade das posições.
+        """
+        self._keys[self._position(key)] = TOMBSTONE
+        del self._seq_of[key]
+        self._tombstones += 1
+        if self._tombstones >= MIN_TOMBSTONES_TO_COMPACT and self._tombstones * 2 > len(self._keys):
+            self._compact(list(compress(range(len(self._keys)), self._keys)))
+
+    def _compact(self, live: list[int]):
+        """
+        Mantém só as posições informadas (as que não são lápides), em ordem.
+        """
+        self._seqs = array("Q", map(self._seqs.__getitem__, live))
+        self._keys = array("Q", map(self._keys.__getitem__, live))
+        self._tombstones = 0
+        self.generation += 1
+
+    def entries(self, after: int | None = None):
+        """
+        Gera tuplas (seq, chave do ISBN) na ordem de inserção, sem copiar a ordem.
+        Livros incluídos durante a iteração também são entregues; livros removidos
+        antes de serem alcançados são pulados.
+
+        Args:
+            after (int | None): Retoma a partir do primeiro livro com seq maior que este.
+        """
+        generation = self.generation
+        position = 0 if after is None else bisect_right(self._seqs, after)
+        last_seq = after
+        while True:
+            if generation != self.generation:
+                # A ordem foi compactada durante a iteração; reposiciona pelo último seq.
+                generation = self.generation
+                position = 0 if last_seq is None else bisect_right(self._seqs, last_seq)
+            if position >= len(self._keys):
+                return
+            key = self._keys[position]
+            seq = self._seqs[position]
+            position += 1
+            if key != TOMBSTONE:
+                last_seq = seq
+                yield seq, key
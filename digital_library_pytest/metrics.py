@@ -0,0 +1,264 @@
+# digital_library_pytest/metrics.py
+
+import functools
+import os
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+# Quando "1", a instrumentação já começa ligada ao importar o módulo.
+METRICS_ENV = "DIGITAL_LIBRARY_METRICS"
+
+# Limites superiores (em segundos) dos baldes dos histogramas de latência: de 1 µs a
+# cerca de 100 s, crescendo por um fator de raiz de 2. Com baldes tão próximos, o p50
+# e o p99 estimados ficam a menos de ~41% do valor real, sem guardar cada amostra.
+BUCKETS: tuple[float, ...] = tuple(1e-6 * 2 ** (i / 2) for i in range(54))
+
+# Etapas medidas em cada chamada: o total, o tempo dentro do gerenciador e o resto
+# (validação, montagem e conversão dos dados da resposta).
+STAGES = ("total", "manager", "serialization")
+
+_enabled = os.environ.get(METRICS_ENV) == "1"
+_lock = threading.Lock()
+_local = threading.local() # Chamada instrumentada em andamento na thread (atributo "request")
+
+
+class _Histogram:
+    """
+    Histograma de latências com baldes fixos (veja BUCKETS).
+    """
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        """
+        Inicializa o histograma vazio; o último balde conta o que passar de BUCKETS[-1].
+        """
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float):
+        """
+        Registra uma amostra.
+        """
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estima o quantil `q` (entre 0 e 1) por interpolação linear dentro do
+        balde que o contém, como o histogram_quantile do Prometheus.
+        Retorna 0.0 se não houver amostras.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index == len(BUCKETS):
+                    return BUCKETS[-1]
+                lower = BUCKETS[index - 1] if index else 0.0
+                return lower + (BUCKETS[index] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return BUCKETS[-1]
+
+    def summary(self) -> dict:
+        """
+        Retorna contagem, soma, p50 e p99 em um dicionário.
+        """
+        return {"count": self.count, "sum": self.sum,
+                "p50": self.quantile(0.50), "p99": self.quantile(0.99)}
+
+
+class _EndpointMetrics:
+    """
+    Contadores e histogramas de uma função da API.
+    """
+    __slots__ = ("requests", "errors", "histograms")
+
+    def __init__(self):
+        """
+        Inicializa as métricas zeradas.
+        """
+        self.requests = 0
+        self.errors = 0
+        self.histograms = {stage: _Histogram() for stage in STAGES}
+
+
+class _Request:
+    """
+    Estado de uma chamada instrumentada: o tempo acumulado dentro do gerenciador
+    e o início do trecho de gerenciador em andamento, se houver.
+    """
+    __slots__ = ("manager_time", "manager_started")
+
+    def __init__(self):
+        """
+        Inicializa a chamada sem tempo de gerenciador.
+        """
+        self.manager_time = 0.0
+        self.manager_started: float | None = None
+
+
+_endpoints: dict[str, _EndpointMetrics] = {}
+
+
+def enable():
+    """
+    Liga a instrumentação das funções da API.
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """
+    Desliga a instrumentação; as métricas já coletadas são mantidas.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """
+    Indica se a instrumentação está ligada.
+    """
+    return _enabled
+
+
+def reset():
+    """
+    Descarta todas as métricas coletadas.
+    """
+    with _lock:
+        _endpoints.clear()
+
+
+def manager_started():
+    """
+    Marca o início de um trecho executado dentro do gerenciador de livros.
+    Com a instrumentação desligada (ou fora de uma função instrumentada), não faz nada.
+    """
+    if _enabled:
+        request = getattr(_local, "request", None)
+        if request is not None:
+            request.manager_started = perf_counter()
+
+
+def manager_finished():
+    """
+    Marca o fim do trecho iniciado por manager_started.
+    """
+    if _enabled:
+        request = getattr(_local, "request", None)
+        if request is not None and request.manager_started is not None:
+            request.manager_time += perf_counter() - request.manager_started
+            request.manager_started = None
+
+
+def _record(endpoint: str, total: float, manager: float, failed: bool):
+    """
+    Acumula o resultado de uma chamada nas métricas da função.
+    """
+    with _lock:
+        metrics = _endpoints.get(endpoint)
+        if metrics is None:
+            metrics = _endpoints[endpoint] = _EndpointMetrics()
+        metrics.requests += 1
+        if failed:
+            metrics.errors += 1
+        metrics.histograms["total"].observe(total)
+        metrics.histograms["manager"].observe(manager)
+        metrics.histograms["serialization"].observe(max(total - manager, 0.0))
+
+
+def instrumented(endpoint: str):
+    """
+    Decorador que mede as chamadas de uma função da API sob o nome `endpoint`:
+    quantidade, erros (ValueError) e latências total, dentro do gerenciador
+    (trechos entre manager_started e manager_finished) e de serialização (o resto).
+    Desligada, a instrumentação custa apenas a verificação de uma variável global.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            previous = getattr(_local, "request", None) # Chamada externa, se esta for aninhada
+            request = _local.request = _Request()
+            failed = False
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except ValueError:
+                failed = True
+                raise
+            finally:
+                end = perf_counter()
+                _local.request = previous
+                if request.manager_started is not None:
+                    # O gerenciador levantou uma exceção antes de manager_finished.
+                    request.manager_time += end - request.manager_started
+                if previous is not None and previous.manager_started is None:
+                    # O tempo no gerenciador da chamada aninhada também é da externa
+                    # (se ela já não estiver medindo um trecho no gerenciador).
+                    previous.manager_time += request.manager_time
+                _record(endpoint, end - start, request.manager_time, failed)
+        return wrapper
+    return decorator
+
+
+def snapshot() -> dict:
+    """
+    Retorna uma cópia das métricas coletadas, por função da API.
+
+    Returns:
+        dict: {endpoint: {"requests", "errors", "total", "manager", "serialization"}},
+              em que cada etapa traz "count", "sum", "p50" e "p99" (em segundos).
+    """
+    with _lock:
+        return {
+            endpoint: {
+                "requests": metrics.requests,
+                "errors": metrics.errors,
+                **{stage: histogram.summary() for stage, histogram in metrics.histograms.items()},
+            }
+            for endpoint, metrics in _endpoints.items()
+        }
+
+
+def prometheus_text() -> str:
+    """
+    Retorna as métricas coletadas no formato de texto de exposição do Prometheus.
+    """
+    lines = [
+        "# HELP digital_library_requests_total Chamadas às funções da API.",
+        "# TYPE digital_library_requests_total counter",
+    ]
+    with _lock:
+        endpoints = sorted(_endpoints.items())
+        for endpoint, metrics in endpoints:
+            lines.append(f'digital_library_requests_total{{endpoint="{endpoint}"}} {metrics.requests}')
+        lines += [
+            "# HELP digital_library_errors_total Chamadas que terminaram em ValueError.",
+            "# TYPE digital_library_errors_total counter",
+        ]
+        for endpoint, metrics in endpoints:
+            lines.append(f'digital_library_errors_total{{endpoint="{endpoint}"}} {metrics.errors}')
+        lines += [
+            "# HELP digital_library_request_duration_seconds Latência das funções da API, por etapa.",
+            "# TYPE digital_library_request_duration_seconds histogram",
+        ]
+        for endpoint, metrics in endpoints:
+            for stage, histogram in metrics.histograms.items():
+                labels = f'endpoint="{endpoint}",stage="{stage}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    cumulative += count
+                    lines.append(f'digital_library_request_duration_seconds_bucket{{{labels},le="{bound:.6g}"}} {cumulative}')
+                lines.append(f'digital_library_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"digital_library_request_duration_seconds_sum{{{labels}}} {histogram.sum:.9g}")
+                lines.append(f"digital_library_request_duration_seconds_count{{{labels}}} {histogram.count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,569 @@
+# digital_library_pytest/persistence.py
+
+import gc
+import json
+import mmap
+import os
+import re
+import shutil
+import struct
+import sys
+import threading
+from array import array
+from itertools import compress
+from operator import attrgetter
+
+from digital_library_pytest.book import Book, isbn_key
+from digital_library_pytest.book_manager import BookManager
+from digital_library_pytest.columnar import ColumnarBookStore
+
+# Formato do snapshot (todos os inteiros em little-endian):
+#   MAGIC (8 bytes) | quantidade de livros (u64) | último seq do log incluído (u64)
+#   | versão da biblioteca (u64) | tamanho do payload (u64)
+#   | flags de leitura (1 byte por livro) | chaves dos ISBNs (u64 por livro)
+#   | payload UTF-8
+# O payload contém title, author e isbn de cada livro, em ordem, separados por
+# _SEPARATOR. Como o arquivo é mapeado em memória, a carga é uma única decodificação
+# e um único split feitos em C, sem parsing linha a linha; as chaves já calculadas
+# dispensam a normalização e a validação de cada ISBN (veja Book._restored).
+SNAPSHOT_MAGIC = b"DLSNAP03"
+_HEADER = struct.Struct("<8sQQQQ")
+# Formatos anteriores: sem a versão da biblioteca (lida como 0) e/ou sem as chaves.
+# Magic -> (cabeçalho, tem versão, tem chaves)
+_FORMATS = {
+    b"DLSNAP01": (struct.Struct("<8sQQQ"), False, False),
+    b"DLSNAP02": (_HEADER, True, False),
+    SNAPSHOT_MAGIC: (_HEADER, True, True),
+}
+
+_SEPARATOR = "\x1f"
+_ESCAPE = "\x1b"
+_UNESCAPE_RE = re.compile("\x1b(.)", re.DOTALL)
+_UNESCAPES = {_ESCAPE: _ESCAPE, "s": _SEPARATOR}
+
+SNAPSHOT_FILE = "books.snapshot"
+LOG_FILE = "books.log"
+# Log em compactação: as operações anteriores ao snapshot que está sendo gravado.
+COMPACTING_LOG_FILE = "books.log.compacting"
+
+# Quantidade padrão de operações no log antes de compactá-lo em um snapshot.
+DEFAULT_COMPACT_EVERY = 10_000
+
+
+def _escape(field: str) -> str:
+    """
+    Escapa o separador dentro de um campo (caso raro; o caminho comum não copia nada).
+    """
+    if _SEPARATOR in field or _ESCAPE in field:
+        return field.replace(_ESCAPE, _ESCAPE + _ESCAPE).replace(_SEPARATOR, _ESCAPE + "s")
+    return field
+
+
+def _unescape(field: str) -> str:
+    """
+    Desfaz o escape aplicado por _escape.
+    """
+    return _UNESCAPE_RE.sub(lambda match: _UNESCAPES[match[1]], field)
+
+
+def write_snapshot(path, books, last_seq: int = 0, version: int = 0):
+    """
+    Grava um snapshot de forma atômica: escreve em um arquivo temporário,
+    sincroniza com o disco e só então substitui o snapshot anterior.
+
+    Args:
+        path: Caminho do arquivo de snapshot.
+        books: Iterável de Book, na ordem em que devem ser restaurados.
+        last_seq (int): Número de sequência da última operação do log já incluída.
+        version (int): Versão da biblioteca no momento do snapshot (veja BookManager.version).
+    """
+    books = list(books)
+    fields = []
+    for book in books:
+        fields.append(_escape(book.title))
+        fields.append(_escape(book.author))
+        fields.append(_escape(book.isbn))
+    payload = _SEPARATOR.join(fields).encode("utf-8")
+    flags = bytes(book.read for book in books)
+    keys = array("Q", [book.key for book in books])
+    if sys.byteorder != "little":
+        keys.byteswap()
+
+    temporary = f"{os.fspath(path)}.tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(_HEADER.pack(SNAPSHOT_MAGIC, len(books), last_seq, version, len(payload)))
+        handle.write(flags)
+        handle.write(keys)
+        handle.write(payload)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def _read_header(mapped) -> tuple[int, int, int, bool, int, int]:
+    """
+    Lê o cabeçalho de um snapshot (no formato atual ou em um anterior).
+
+    Returns:
+        tuple[int, int, int, bool, int, int]: Quantidade de livros, último seq do
+            log incluído, versão da biblioteca, se as chaves estão gravadas, início
+            das flags e tamanho do payload.
+
+    Raises:
+        ValueError: Se o arquivo não for um snapshot válido.
+    """
+    snapshot_format = _FORMATS.get(bytes(mapped[:8]))
+    if snapshot_format is None:
+        if len(mapped) < 8:
+            raise ValueError("Snapshot corrompido: cabeçalho incompleto.")
+        raise ValueError("Arquivo não é um snapshot da biblioteca.")
+    header, has_version, has_keys = snapshot_format
+    if len(mapped) < header.size:
+        raise ValueError("Snapshot corrompido: cabeçalho incompleto.")
+    if has_version:
+        _, count, last_seq, version, payload_size = header.unpack_from(mapped, 0)
+    else:
+        (_, count, last_seq, payload_size), version = header.unpack_from(mapped, 0), 0
+    return count, last_seq, version, has_keys, header.size, payload_size
+
+
+def snapshot_version(path) -> int:
+    """
+    Retorna a versão da biblioteca gravada no snapshot (0 para snapshots do
+    formato anterior), lendo apenas o cabeçalho.
+
+    Raises:
+        ValueError: Se o arquivo não for um snapshot válido.
+    """
+    with open(path, "rb") as handle:
+        return _read_header(handle.read(_HEADER.size))[2]
+
+
+def _read_columns(path) -> tuple[list[str], list[str], list[str], array | None, bytes, int]:
+    """
+    Lê as colunas de um snapshot mapeando o arquivo em memória. O payload é
+    decodificado direto do mapeamento (sem uma cópia intermediária em bytes).
+
+    Returns:
+        tuple: Títulos, autores, ISBNs, chaves dos ISBNs (None em formatos que não
+            as gravam), flags de leitura e o último seq do log incluído.
+
+    Raises:
+        ValueError: Se o arquivo não for um snapshot válido.
+    """
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        count, last_seq, _, has_keys, flags_start, payload_size = _read_header(mapped)
+        keys_start = flags_start + count
+        payload_start = keys_start + 8 * count if has_keys else keys_start
+        if len(mapped) < payload_start + payload_size:
+            raise ValueError("Snapshot corrompido: dados incompletos.")
+        flags = mapped[flags_start:keys_start]
+        keys = None
+        if has_keys:
+            keys = array("Q")
+            keys.frombytes(mapped[keys_start:payload_start])
+            if sys.byteorder != "little":
+                keys.byteswap()
+        with memoryview(mapped) as view:
+            payload = str(view[payload_start:payload_start + payload_size], "utf-8")
+
+    if count == 0:
+        return [], [], [], keys, flags, last_seq
+    fields = payload.split(_SEPARATOR)
+    if len(fields) != 3 * count:
+        raise ValueError("Snapshot corrompido: quantidade de campos inválida.")
+    if _ESCAPE in payload:
+        fields = [_unescape(field) for field in fields]
+    return fields[0::3], fields[1::3], fields[2::3], keys, flags, last_seq
+
+
+def load_snapshot(path) -> tuple[list[Book], int]:
+    """
+    Carrega um snapshot como objetos Book. Os livros são recriados com as chaves
+    gravadas, sem validar cada ISBN de novo (veja Book._restored); ainda assim,
+    criar um objeto por livro domina o tempo de carga de catálogos grandes, e
+    load_snapshot_store evita esse custo.
+
+    Returns:
+        tuple[list[Book], int]: Livros restaurados e o último seq do log incluído.
+
+    Raises:
+        ValueError: Se o arquivo não for um snapshot válido.
+    """
+    titles, authors, isbns, keys, flags, last_seq = _read_columns(path)
+    # Criar milhões de objetos dispara o coletor cíclico repetidamente sem que haja
+    # ciclos a coletar; desligá-lo durante a carga reduz o tempo de inicialização.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        if keys is None:
+            books = list(map(Book, titles, authors, isbns))
+        else:
+            books = list(map(Book._restored, titles, authors, isbns, keys))
+        for index in compress(range(len(books)), flags):
+            books[index].mark_as_read()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return books, last_seq
+
+
+def load_snapshot_store(path) -> tuple[ColumnarBookStore, int]:
+    """
+    Carrega um snapshot direto em um ColumnarBookStore, sem criar nenhum Book: as
+    colunas do arquivo viram as colunas do armazenamento (veja
+    ColumnarBookStore.from_columns) e os livros só são materializados quando pedidos.
+
+    Returns:
+        tuple[ColumnarBookStore, int]: O armazenamento e o último seq do log incluído.
+
+    Raises:
+        ValueError: Se o arquivo não for um snapshot válido.
+    """
+    titles, authors, isbns, keys, flags, last_seq = _read_columns(path)
+    if keys is None: # Formato antigo, sem as chaves gravadas
+        keys = list(map(isbn_key, isbns))
+        if None in keys:
+            raise ValueError("Snapshot corrompido: ISBN inválido.")
+    return ColumnarBookStore.from_columns(titles, authors, isbns, keys, flags), last_seq
+
+
+class OperationLog:
+    """
+    Log de operações somente-acréscimo (JSON Lines), um registro por mutação.
+    Cada registro carrega um número de sequência crescente, usado para ignorar
+    operações já incluídas no snapshot durante a recuperação.
+
+    Para compactar sem parar as escritas, o log é girado (veja rotate): os
+    registros anteriores ao snapshot ficam em um segundo arquivo, descartado
+    quando o snapshot termina de ser gravado, e os novos vão para um arquivo vazio.
+    """
+    def __init__(self, path, fsync: bool = False, rotated_path=None):
+        """
+        Prepara o log no caminho informado; o arquivo é aberto no primeiro acréscimo.
+
+        Args:
+            path: Caminho do arquivo de log.
+            fsync (bool): Se True, cada registro é sincronizado com o disco antes de retornar.
+            rotated_path: Caminho do log girado (padrão: `path` + ".compacting").
+        """
+        self._path = path
+        self._rotated_path = rotated_path or f"{os.fspath(path)}.compacting"
+        self._fsync = fsync
+        self._handle = None
+        self._encode = json.JSONEncoder(ensure_ascii=False).encode
+        self.last_seq = 0
+        self.pending = 0 # Operações gravadas desde a última compactação
+
+    @property
+    def has_rotated(self) -> bool:
+        """
+        Indica se há um log girado (uma compactação que não terminou).
+        """
+        return os.path.exists(self._rotated_path)
+
+    def replay(self, after_seq: int = 0):
+        """
+        Gera os registros do log com seq maior que `after_seq`: primeiro os do log
+        girado, se houver, e depois os do log atual.
+        """
+        for path in (self._rotated_path, self._path):
+            if os.path.exists(path):
+                yield from self._replay_file(path, after_seq)
+
+    def _replay_file(self, path, after_seq: int):
+        """
+        Gera os registros de um arquivo do log com seq maior que `after_seq`.
+        Uma última linha truncada (queda durante a escrita) é descartada do arquivo,
+        para que os próximos acréscimos comecem em uma linha nova.
+        """
+        valid_size = 0
+        with open(path, "rb") as handle:
+            for line in handle:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("Linha incompleta.")
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                valid_size += len(line)
+                self.last_seq = max(self.last_seq, record["seq"])
+                if record["seq"] > after_seq:
+                    self.pending += 1
+                    yield record
+        if valid_size < os.path.getsize(path):
+            os.truncate(path, valid_size)
+
+    def append(self, records: list[dict]):
+        """
+        Acrescenta registros ao log, atribuindo-lhes números de sequência.
+        """
+        lines = []
+        for record in records:
+            self.last_seq += 1
+            record["seq"] = self.last_seq
+            lines.append(self._encode(record) + "\n")
+        if self._handle is None:
+            self._handle = open(self._path, "a", encoding="utf-8")
+        self._handle.writelines(lines)
+        self._handle.flush()
+        if self._fsync:
+            os.fsync(self._handle.fileno())
+        self.pending += len(records)
+
+    def truncate(self):
+        """
+        Esvazia o log (e descarta o log girado) após uma compactação bem-sucedida.
+        """
+        if self._handle is not None:
+            self._handle.close()
+        self._handle = open(self._path, "w", encoding="utf-8")
+        self.pending = 0
+        self.discard_rotated()
+
+    def rotate(self):
+        """
+        Move os registros atuais para o log girado e recomeça com um log vazio.
+        Se ainda houver um log girado (uma compactação anterior que falhou), os
+        registros são acrescentados a ele, para que nenhum se perca.
+        """
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if os.path.exists(self._path):
+            if os.path.exists(self._rotated_path):
+                with open(self._path, "rb") as source, open(self._rotated_path, "ab") as target:
+                    shutil.copyfileobj(source, target)
+                os.remove(self._path)
+            else:
+                os.replace(self._path, self._rotated_path)
+        self.pending = 0
+
+    def discard_rotated(self):
+        """
+        Apaga o log girado, depois que o snapshot que o inclui foi gravado.
+        """
+        if os.path.exists(self._rotated_path):
+            os.remove(self._rotated_path)
+
+    def close(self):
+        """
+        Fecha o arquivo de log.
+        """
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+class PersistentBookManager(BookManager):
+    """
+    BookManager durável: cada inclusão, marcação e remoção é registrada em um log
+    somente-acréscimo, e o log é compactado periodicamente em um snapshot.
+    Na inicialização, o snapshot é carregado via mmap e apenas as operações
+    posteriores a ele são reaplicadas.
+
+    A compactação disparada por compact_every roda em uma thread: a escrita que
+    a dispara só copia a coleção (uma cópia rasa) e gira o log; o snapshot é
+    gravado em segundo plano enquanto novas operações vão para o log novo.
+    Marcações feitas durante a gravação podem entrar no snapshot, o que é seguro:
+    reaplicar uma marcação em um livro já lido não muda nada.
+
+    A versão da biblioteca (veja BookManager.version) também é persistida, no
+    snapshot e em cada registro do log, e restaurada na inicialização: um cliente
+    com uma versão anterior à reinicialização nunca recebe "not_modified" por
+    engano. O journal de mudanças não é persistido, então changes_since pede uma
+    ressincronização para qualquer versão anterior à reinicialização.
+    """
+    def __init__(self, directory, compact_every: int = DEFAULT_COMPACT_EVERY, fsync: bool = False,
+                 compact: bool = False):
+        """
+        Abre (ou cria) a biblioteca persistida no diretório informado.
+
+        Args:
+            directory: Diretório onde ficam o snapshot e o log.
+            compact_every (int): Quantidade de operações no log que dispara uma compactação.
+            fsync (bool): Se True, cada operação é sincronizada com o disco antes de retornar.
+            compact (bool): Usa o armazenamento colunar em memória (veja BookManager).
+        """
+        super().__init__(compact)
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._compact_every = compact_every
+        self._log = None # Sem log durante a recuperação, para não regravar o que é reaplicado
+        self._compaction: threading.Thread | None = None
+        self._compaction_error: Exception | None = None
+
+        snapshot_seq = 0
+        if os.path.exists(self._snapshot_path):
+            if compact: # As colunas do snapshot viram as do armazenamento, sem criar livros
+                store, snapshot_seq = load_snapshot_store(self._snapshot_path)
+                self._bulk_insert(store)
+            else:
+                books, snapshot_seq = load_snapshot(self._snapshot_path)
+                self._bulk_insert(dict(zip(map(attrgetter("key"), books), books)))
+            self._version = snapshot_version(self._snapshot_path)
+
+        log = OperationLog(os.path.join(directory, LOG_FILE), fsync=fsync,
+                           rotated_path=os.path.join(directory, COMPACTING_LOG_FILE))
+        for record in log.replay(after_seq=snapshot_seq):
+            self._apply(record)
+            # Registros antigos não têm a versão; nesse caso vale a contagem da reaplicação.
+            self._version = record.get("version", self._version)
+        log.last_seq = max(log.last_seq, snapshot_seq)
+        self._log = log
+        # O journal reaplicado teria versões que os clientes nunca viram com esses livros.
+        self._journal.clear()
+        self._journal_floor = self._version
+        if log.has_rotated:
+            self.compact() # Uma compactação foi interrompida: conclui agora, com tudo já reaplicado
+
+    def _apply(self, record: dict):
+        """
+        Reaplica um registro do log durante a recuperação.
+        """
+        operation = record["op"]
+        if operation == "add":
+            book = Book(record["title"], record["author"], record["isbn"])
+            if record.get("read"):
+                book.mark_as_read()
+            super().add_book(book)
+        elif operation == "read":
+            super().mark_as_read(record["isbn"])
+        elif operation == "remove":
+            super().remove_book(record["isbn"])
+        else:
+            raise ValueError(f"Operação desconhecida no log: '{operation}'.")
+
+    def _record(self, records: list[dict]):
+        """
+        Registra operações no log e compacta quando o limite é atingido.
+        """
+        if self._log is None or not records:
+            return
+        for record in records:
+            record["version"] = self._version
+        self._log.append(records)
+        if self._log.pending >= self._compact_every and not self._compacting:
+            self._start_compaction()
+
+    @property
+    def _compacting(self) -> bool:
+        """
+        Indica se há uma compactação em segundo plano em andamento.
+        """
+        return self._compaction is not None and self._compaction.is_alive()
+
+    def _start_compaction(self):
+        """
+        Copia a coleção, gira o log e grava o snapshot em uma thread. Se a
+        gravação falhar, o log girado continua no disco (e é reaplicado na
+        recuperação); o erro é levantado pelo próximo compact ou close. Enquanto
+        ele não for levantado, as compactações seguintes não o substituem.
+        """
+        books = self._books.copy()
+        last_seq, version = self._log.last_seq, self._version
+        self._log.rotate()
+        self._compaction = threading.Thread(target=self._write_snapshot, args=(books, last_seq, version),
+                                            name="library-compaction")
+        self._compaction.start()
+
+    def _write_snapshot(self, books, last_seq: int, version: int):
+        """
+        Grava o snapshot de uma cópia da coleção e descarta o log girado.
+        """
+        try:
+            write_snapshot(self._snapshot_path, books.values(), last_seq, version)
+            self._log.discard_rotated()
+        except Exception as e:
+            if self._compaction_error is None: # Mantém o primeiro erro ainda não levantado
+                self._compaction_error = e
+
+    def _finish_compaction(self):
+        """
+        Espera a compactação em segundo plano, levantando o erro dela se houver.
+        """
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+        error, self._compaction_error = self._compaction_error, None
+        if error is not None:
+            raise error
+
+    def add_book(self, book: Book):
+        """
+        Adiciona um livro (veja BookManager.add_book) e registra a operação no log.
+        """
+        super().add_book(book)
+        self._record([{"op": "add", "title": book.title, "author": book.author,
+                       "isbn": book.isbn, "read": book.read}])
+
+    def mark_as_read(self, isbn: str):
+        """
+        Marca um livro como lido (veja BookManager.mark_as_read) e registra a operação
+        no log, se ela mudou a biblioteca (um livro já lido não gera registro).
+        """
+        version = self._version
+        super().mark_as_read(isbn)
+        if self._version != version:
+            self._record([{"op": "read", "isbn": isbn}])
+
+    def remove_book(self, isbn: str):
+        """
+        Remove um livro (veja BookManager.remove_book) e registra a operação no log.
+        """
+        super().remove_book(isbn)
+        self._record([{"op": "remove", "isbn": isbn}])
+
+    def mark_many_as_read(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Marca vários livros como lidos (veja BookManager.mark_many_as_read) e registra
+        as marcações efetivas com uma única escrita no log.
+        """
+        results = super().mark_many_as_read(isbns, partial)
+        self._record([{"op": "read", "isbn": isbn} for isbn, result in results.items() if result == "marked"])
+        return results
+
+    def remove_many(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Remove vários livros (veja BookManager.remove_many) e registra as remoções
+        com uma única escrita no log.
+        """
+        results = super().remove_many(isbns, partial)
+        # Uma remoção por livro: grafias diferentes do mesmo ISBN não podem ser reaplicadas duas vezes.
+        removed = {isbn_key(isbn): isbn for isbn, result in results.items() if result == "removed"}
+        self._record([{"op": "remove", "isbn": isbn} for isbn in removed.values()])
+        return results
+
+    def _bulk_insert(self, books: dict[int, Book]):
+        """
+        Insere um lote de livros e registra todas as inclusões com uma única escrita no log.
+        """
+        super()._bulk_insert(books)
+        if self._log is not None: # Na restauração do snapshot, nem monta os registros
+            self._record([{"op": "add", "title": book.title, "author": book.author,
+                           "isbn": book.isbn, "read": book.read} for book in books.values()])
+
+    def compact(self):
+        """
+        Grava o estado atual em um novo snapshot e esvazia o log, esperando antes
+        a compactação em segundo plano, se houver.
+        Se o processo cair entre as duas etapas, a recuperação ignora as operações
+        do log já incluídas no snapshot graças aos números de sequência.
+        """
+        self._finish_compaction()
+        write_snapshot(self._snapshot_path, self._books.values(), self._log.last_seq, self._version)
+        self._log.truncate()
+
+    def close(self):
+        """
+        Espera a compactação em segundo plano e fecha o log de operações.
+
+        Raises:
+            OSError: Se a última compactação em segundo plano falhou (o log girado
+                     continua no disco e é reaplicado na próxima inicialização).
+        """
+        try:
+            self._finish_compaction()
+        finally:
+            if self._log is not None:
+                self._log.close()
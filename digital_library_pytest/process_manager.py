@@ -0,0 +1,759 @@
+# digital_library_pytest/process_manager.py
+
+import multiprocessing
+import os
+import threading
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from itertools import chain, islice
+from operator import itemgetter
+
+from digital_library_pytest.book import Book, isbn_key
+from digital_library_pytest.book_manager import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, BookManager, not_found_message
+from digital_library_pytest.search_index import normalize_text
+from digital_library_pytest.sorted_index import sort_entry, sort_fields
+
+# Quantidade padrão de processos do ProcessShardedBookManager: um por núcleo.
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+# Os processos são criados por um servidor de fork dedicado, e não com fork direto do
+# processo da API: ele pode ter várias threads, e um fork no meio de uma operação de
+# outra thread deixaria locks travados no filho.
+_START_METHOD = "forkserver"
+
+_seq_of_entry = itemgetter(0)
+
+
+class WorkerDiedError(RuntimeError):
+    """
+    O processo de um shard terminou (por exemplo, morto pelo sistema). Os livros
+    dele estavam apenas na memória do processo, então o shard não é recriado
+    vazio: as operações que dependem dele levantam este erro até que a biblioteca
+    seja reiniciada (e recarregada, por exemplo, de um snapshot).
+    """
+
+
+def _encoded(books):
+    """
+    Codifica o JSON de cada livro (veja Book.to_json) ainda no processo do shard,
+    para que os bytes viajem com o livro e a serialização das respostas também
+    seja dividida entre os processos.
+    """
+    for book in books:
+        book.to_json()
+    return books
+
+
+class _ShardWorker:
+    """
+    Estado de um processo de shard: um BookManager com os livros do shard e o seq
+    global de inserção de cada um. Os seqs de um shard crescem na ordem de
+    inserção do shard (o processo principal os reserva na ordem dos envios),
+    então `order` fica ordenado sem reordenações.
+    """
+    def __init__(self):
+        """
+        Inicializa um shard vazio.
+        """
+        self.manager = BookManager()
+        self.seqs: dict[int, int] = {} # Chave do ISBN -> seq global
+        self.order: list[int] = [] # Seqs globais dos livros, em ordem crescente
+        self.books: dict[int, Book] = {} # Seq global -> livro (o mesmo objeto guardado no manager)
+
+    def size(self) -> int:
+        """
+        Retorna a quantidade de livros do shard.
+        """
+        return len(self.manager)
+
+    def contains(self, isbn: str) -> bool:
+        """
+        Indica se o shard tem um livro com o ISBN informado.
+        """
+        return isbn in self.manager
+
+    def _remember(self, seq: int, book: Book):
+        """
+        Registra o seq global de um livro recém-incluído.
+        """
+        self.seqs[book.key] = seq
+        self.order.append(seq)
+        self.books[seq] = book
+
+    def _forget(self, keys):
+        """
+        Descarta os seqs de livros removidos, filtrando `order` uma única vez em lotes.
+        """
+        seqs = [self.seqs.pop(key) for key in keys]
+        for seq in seqs:
+            del self.books[seq]
+        if len(seqs) == 1:
+            del self.order[bisect_left(self.order, seqs[0])]
+        elif seqs:
+            removed = set(seqs)
+            self.order = [seq for seq in self.order if seq not in removed]
+
+    def add_book(self, book: Book, seq: int) -> int:
+        """
+        Adiciona um livro e retorna a nova versão do shard.
+        """
+        self.manager.add_book(book)
+        self._remember(seq, book)
+        return self.manager.version
+
+    def has_any(self, isbns: list[str]) -> bool:
+        """
+        Indica se algum dos ISBNs já está no shard.
+        """
+        return any(isbn in self.manager for isbn in isbns)
+
+    def add_books(self, entries: list[tuple[int, Book]], partial: bool = False) -> tuple[int, list[str]]:
+        """
+        Adiciona um lote de (seq, Book) de uma vez (veja BookManager.add_books) e
+        retorna a nova versão do shard e o resultado de cada livro. Os seqs dos
+        livros recusados ficam sem uso.
+        """
+        results = self.manager.add_books((book for _, book in entries), partial)
+        for (seq, book), result in zip(entries, results):
+            if result == "added":
+                self._remember(seq, book)
+        return self.manager.version, results
+
+    def mark_as_read(self, isbn: str) -> int:
+        """
+        Marca um livro como lido e retorna a nova versão do shard.
+        """
+        self.manager.mark_as_read(isbn)
+        return self.manager.version
+
+    def remove_book(self, isbn: str) -> int:
+        """
+        Remove um livro e retorna a nova versão do shard.
+        """
+        self.manager.remove_book(isbn)
+        self._forget([isbn_key(isbn)])
+        return self.manager.version
+
+    def missing(self, isbns: list[str]) -> list[str]:
+        """
+        Retorna os ISBNs que não estão no shard.
+        """
+        return [isbn for isbn in isbns if isbn not in self.manager]
+
+    def apply_many(self, isbns: list[str], removal: bool) -> tuple[dict[str, str], int]:
+        """
+        Marca ou remove um lote parcialmente (veja BookManager.mark_many_as_read e
+        remove_many) e retorna os resultados e a nova versão do shard.
+        """
+        if not removal:
+            return self.manager.mark_many_as_read(isbns, partial=True), self.manager.version
+        results = self.manager.remove_many(isbns, partial=True)
+        self._forget(dict.fromkeys(isbn_key(isbn) for isbn, result in results.items() if result == "removed"))
+        return results, self.manager.version
+
+    def entries(self) -> list[tuple[int, Book]]:
+        """
+        Retorna todos os (seq, Book) do shard, em ordem de inserção.
+        """
+        seqs = self.seqs
+        return [(seqs[book.key], book) for book in _encoded(self.manager.list_books())]
+
+    def entries_since(self, version: int | None) -> tuple[int, bool, list]:
+        """
+        Retorna o que mudou no shard desde a versão informada, a partir do journal
+        do manager (veja BookManager.changes_since), para que o processo principal
+        atualize a sua listagem sem receber o shard inteiro a cada mutação.
+
+        Args:
+            version (int | None): A versão do shard refletida na listagem, ou None.
+
+        Returns:
+            tuple[int, bool, list]: A versão atual do shard, se a resposta é
+                incremental e, nesse caso, as mudanças (operação, seq, livro), com a
+                chave do ISBN no lugar do livro para remoções; senão, todas as
+                entradas (seq, Book) do shard.
+        """
+        changes = None if version is None else self.manager.changes_since(version)
+        if changes is None:
+            return self.manager.version, False, self.entries()
+        seqs = self.seqs
+        delta = []
+        for operation, value in changes:
+            if operation == "remove":
+                delta.append((operation, None, isbn_key(value)))
+            else:
+                value.to_json()
+                delta.append((operation, seqs[value.key], value))
+        return self.manager.version, True, delta
+
+    def page_entries(self, after: int | None, count: int) -> list[tuple[int, Book]]:
+        """
+        Retorna até `count` entradas (seq, Book) com seq maior que `after`.
+        """
+        position = 0 if after is None else bisect_right(self.order, after)
+        books = self.books
+        entries = [(seq, books[seq]) for seq in self.order[position:position + count]]
+        _encoded(book for _, book in entries)
+        return entries
+
+    def filter_entries(self, author: str | None, read: bool | None, limit: int | None) -> list[tuple[int, Book]]:
+        """
+        Filtra o shard (veja BookManager.filter_books) e retorna (seq, Book).
+        """
+        seqs = self.seqs
+        return [(seqs[book.key], book) for book in _encoded(self.manager.filter_books(author, read, limit))]
+
+    def search_books(self, query: str, limit: int | None) -> list[Book]:
+        """
+        Busca no shard (veja BookManager.search_books).
+        """
+        return _encoded(self.manager.search_books(query, limit))
+
+    def fuzzy_matches(self, query: str, limit: int | None) -> list[tuple[float, Book]]:
+        """
+        Busca tolerante a erros no shard (veja BookManager.fuzzy_matches).
+        """
+        matches = self.manager.fuzzy_matches(query, limit)
+        _encoded(book for _, book in matches)
+        return matches
+
+    def sorted_page(self, by: str, cursor, limit: int, start: str | None,
+                    stop: str | None) -> tuple[list[Book], tuple | None]:
+        """
+        Retorna a página ordenada do shard (veja BookManager.sorted_page).
+        """
+        books, next_cursor = self.manager.sorted_page(by, cursor, limit, start, stop)
+        return _encoded(books), next_cursor
+
+    def count_books(self, author: str | None, read: bool | None) -> int:
+        """
+        Conta os livros do shard (veja BookManager.count_books).
+        """
+        return self.manager.count_books(author, read)
+
+
+def _serve(connection):
+    """
+    Laço de um processo de shard: recebe (método, argumentos), executa no
+    _ShardWorker e devolve (True, resultado) ou (False, exceção). Termina ao
+    receber None ou quando o processo principal fecha a conexão.
+    """
+    worker = _ShardWorker()
+    while True:
+        try:
+            message = connection.recv()
+        except (EOFError, OSError): # O processo principal terminou
+            break
+        if message is None:
+            break
+        method, args = message
+        try:
+            reply = (True, getattr(worker, method)(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            connection.send(reply)
+        except (EOFError, OSError):
+            break
+        except Exception as e: # Resposta que não pôde ser serializada
+            connection.send((False, RuntimeError(f"Resposta inválida do shard: {e!r}")))
+    connection.close()
+
+
+class _WorkerHandle:
+    """
+    Lado do processo principal de um shard: a conexão com o processo, o lock que
+    serializa as trocas de mensagens nela, a última versão conhecida do shard e
+    a versão dele refletida na listagem do processo principal.
+
+    Cada pedido enviado tem exatamente uma resposta. `outstanding` conta as
+    respostas ainda não lidas (um pedido cuja resposta não chegou a ser lida, por
+    um erro entre o envio e a leitura): elas são descartadas antes do próximo
+    envio, então uma chamada nunca recebe a resposta de um pedido anterior.
+    """
+    def __init__(self, index: int, context):
+        """
+        Inicia o processo do shard.
+        """
+        self.index = index
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        self.lock = threading.Lock()
+        self.version = 0
+        self.listed: int | None = None # Versão do shard refletida na listagem
+        self.outstanding = 0
+        self.dead = False
+
+    def _died(self, error: BaseException) -> WorkerDiedError:
+        """
+        Marca o processo como terminado e retorna o erro a levantar.
+        """
+        self.dead = True
+        self.connection.close()
+        return WorkerDiedError(f"O processo do shard {self.index} terminou; os livros dele não estão disponíveis.")
+
+    def send(self, method: str, *args):
+        """
+        Envia um pedido ao processo (com o lock já adquirido), descartando antes
+        as respostas de pedidos anteriores que não foram lidas.
+
+        Raises:
+            WorkerDiedError: Se o processo do shard tiver terminado.
+        """
+        if self.dead:
+            raise self._died(None) from None
+        try:
+            while self.outstanding:
+                self.connection.recv()
+                self.outstanding -= 1
+            self.connection.send((method, args))
+        except (EOFError, OSError) as e:
+            raise self._died(e) from e
+        self.outstanding += 1
+
+    def receive(self):
+        """
+        Recebe a resposta do último pedido, levantando a exceção do processo se houver.
+
+        Raises:
+            WorkerDiedError: Se o processo do shard tiver terminado.
+        """
+        try:
+            ok, value = self.connection.recv()
+        except (EOFError, OSError) as e:
+            raise self._died(e) from e
+        self.outstanding -= 1
+        if not ok:
+            raise value
+        return value
+
+
+class ProcessShardedBookManager:
+    """
+    Variante do BookManager que particiona os livros pela chave canônica do ISBN
+    entre processos, cada um com o BookManager do seu shard. Buscas, ordenações e
+    a serialização dos livros rodam nos processos dos shards, em paralelo e fora do
+    GIL do processo da API. Operações sobre um ISBN vão apenas ao processo dono
+    dele; listagens, buscas e contagens são enviadas a todos (scatter-gather) e os
+    resultados são juntados como no ShardedBookManager. A comunicação é local, por
+    pipes, então tudo roda em uma única máquina.
+
+    Mantém os métodos públicos e as mensagens de ValueError do BookManager.
+    Diferente do BookManager em memória, os livros retornados são cópias: alterá-los
+    não altera a biblioteca (use mark_as_read do gerenciador). Várias threads podem
+    usar o gerenciador; cada pipe atende um pedido por vez, e consultas a todos os
+    shards os travam em ordem de índice.
+    """
+    def __init__(self, workers: int = DEFAULT_WORKERS):
+        """
+        Cria o gerenciador e inicia os processos dos shards.
+
+        Args:
+            workers (int): Quantidade de processos (shards).
+
+        Raises:
+            ValueError: Se a quantidade de processos for menor que um.
+        """
+        if workers < 1:
+            raise ValueError("É preciso pelo menos um processo.")
+        context = multiprocessing.get_context(_START_METHOD)
+        self._workers = [_WorkerHandle(index, context) for index in range(workers)]
+        self._seq_lock = threading.Lock()
+        self._next_seq = 1
+        # Listagem em ordem global de inserção, atualizada com as mudanças de cada shard.
+        # Uma lista já entregue não é mais alterada: a próxima mudança trabalha numa cópia.
+        self._listing: list[tuple[int, Book]] = []
+        self._listing_shared = False
+        self._listed_seqs: dict[int, int] = {} # Chave do ISBN -> seq, dos livros na listagem
+
+    def close(self):
+        """
+        Encerra os processos dos shards.
+        """
+        for worker in self._workers:
+            with worker.lock:
+                if not worker.dead:
+                    try:
+                        worker.connection.send(None)
+                    except OSError:
+                        pass # O processo já terminou
+                    worker.dead = True
+                    worker.connection.close()
+            worker.process.join()
+
+    def _worker_for(self, key: int | None) -> _WorkerHandle:
+        """
+        Retorna o processo responsável pela chave de ISBN. Um ISBN inválido (None)
+        vai para o primeiro processo, que simplesmente não o encontrará.
+        """
+        return self._workers[(key or 0) % len(self._workers)]
+
+    def _take_seqs(self, count: int) -> int:
+        """
+        Reserva `count` números de sequência globais e retorna o primeiro.
+        """
+        with self._seq_lock:
+            seq = self._next_seq
+            self._next_seq = seq + count
+        return seq
+
+    @contextmanager
+    def _locked(self, workers):
+        """
+        Mantém os locks dos processos informados durante o bloco `with`,
+        adquiridos em ordem de índice para evitar impasses.
+        """
+        workers = sorted(workers, key=self._workers.index)
+        for worker in workers:
+            worker.lock.acquire()
+        try:
+            yield
+        finally:
+            for worker in reversed(workers):
+                worker.lock.release()
+
+    @staticmethod
+    def _exchange(requests) -> list:
+        """
+        Envia todos os pedidos (processo, método, argumentos) antes de receber as
+        respostas, para que os processos trabalhem em paralelo. Se um envio falhar
+        (processo terminado), as respostas dos pedidos já enviados ainda são lidas:
+        todas as respostas são lidas antes de levantar o primeiro erro, mantendo os
+        pipes em ordem. Os locks dos processos já devem estar adquiridos.
+        """
+        sent, error = [], None
+        for worker, method, args in requests:
+            try:
+                worker.send(method, *args)
+            except WorkerDiedError as e:
+                error = error or e
+            else:
+                sent.append(worker)
+        if error is not None:
+            for worker in sent:
+                try:
+                    worker.receive()
+                except Exception:
+                    pass
+            raise error
+        results = []
+        for worker in sent:
+            try:
+                results.append(worker.receive())
+            except Exception as e:
+                results.append(None)
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    def _call(self, worker: _WorkerHandle, method: str, *args):
+        """
+        Executa um pedido em um único processo.
+        """
+        with worker.lock:
+            worker.send(method, *args)
+            return worker.receive()
+
+    def _scatter(self, method: str, *args) -> list:
+        """
+        Executa o mesmo pedido em todos os processos e retorna as respostas.
+        """
+        with self._locked(self._workers):
+            return self._exchange([(worker, method, args) for worker in self._workers])
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de livros na biblioteca.
+        """
+        return sum(self._scatter("size"))
+
+    def __contains__(self, isbn: str) -> bool:
+        """
+        Indica se há um livro com o ISBN informado.
+        """
+        return self._call(self._worker_for(isbn_key(isbn)), "contains", isbn)
+
+    @property
+    def version(self) -> int:
+        """
+        Versão monotônica da biblioteca: a soma das versões dos shards, que cada
+        mutação devolve ao processo principal. Lê-la não consulta os processos.
+        """
+        return sum(worker.version for worker in self._workers)
+
+    def add_book(self, book: Book):
+        """
+        Adiciona um livro à biblioteca.
+
+        Raises:
+            ValueError: Se um livro com o mesmo ISBN já existir na biblioteca.
+        """
+        worker = self._worker_for(book.key)
+        with worker.lock:
+            # O seq é reservado sob o lock do shard, então cresce na ordem de inserção do shard.
+            worker.send("add_book", book, self._take_seqs(1))
+            worker.version = worker.receive()
+
+    def add_books(self, books, partial: bool = False) -> list[str]:
+        """
+        Adiciona vários livros de uma vez, com um único pedido por shard (veja
+        BookManager.add_books). Por padrão, nenhum livro é adicionado se algum ISBN
+        for repetido; com `partial`, cada processo recusa os que já tem.
+
+        Raises:
+            ValueError: Se algum ISBN se repetir no lote ou já existir na biblioteca
+                        e `partial` for False.
+        """
+        books = list(books)
+        results = ["added"] * len(books)
+        first_of_key: dict[int, int] = {}
+        for position, book in enumerate(books):
+            if first_of_key.setdefault(book.key, position) != position:
+                if not partial:
+                    raise ValueError(f"Livro com este ISBN já existe na biblioteca.")
+                results[position] = "already_exists"
+        groups: dict[int, list[int]] = {}
+        for position in first_of_key.values():
+            groups.setdefault(books[position].key % len(self._workers), []).append(position)
+        workers = [(self._workers[index], groups[index]) for index in sorted(groups)]
+        with self._locked(worker for worker, _ in workers):
+            if not partial:
+                present = self._exchange([(worker, "has_any", ([books[position].isbn for position in group],))
+                                          for worker, group in workers])
+                if any(present):
+                    raise ValueError(f"Livro com este ISBN já existe na biblioteca.")
+            # Os seqs seguem a ordem do lote, não a dos shards.
+            first = self._take_seqs(len(books))
+            requests = [(worker, "add_books", ([(first + position, books[position]) for position in group], partial))
+                        for worker, group in workers]
+            for (worker, group), (version, shard_results) in zip(workers, self._exchange(requests)):
+                worker.version = version
+                for position, result in zip(group, shard_results):
+                    results[position] = result
+        return results
+
+    def mark_as_read(self, isbn: str):
+        """
+        Marca um livro como lido, dado o seu ISBN.
+
+        Raises:
+            ValueError: Se o livro com o ISBN fornecido não for encontrado.
+        """
+        worker = self._worker_for(isbn_key(isbn))
+        with worker.lock:
+            worker.send("mark_as_read", isbn)
+            worker.version = worker.receive()
+
+    def remove_book(self, isbn: str):
+        """
+        Remove um livro da biblioteca, dado o seu ISBN.
+
+        Raises:
+            ValueError: Se o livro com o ISBN fornecido não for encontrado.
+        """
+        worker = self._worker_for(isbn_key(isbn))
+        with worker.lock:
+            worker.send("remove_book", isbn)
+            worker.version = worker.receive()
+
+    def _apply_many(self, isbns, partial: bool, removal: bool) -> dict[str, str]:
+        """
+        Aplica uma operação em lote: agrupa os ISBNs por shard e trava apenas os
+        processos envolvidos. Com todos eles travados, a verificação de tudo ou
+        nada vale para o lote inteiro (como no ShardedBookManager).
+        """
+        unique = list(dict.fromkeys(isbns))
+        groups: dict[int, list[str]] = {}
+        for isbn in unique:
+            groups.setdefault((isbn_key(isbn) or 0) % len(self._workers), []).append(isbn)
+        workers = [(self._workers[index], groups[index]) for index in sorted(groups)]
+        with self._locked(worker for worker, _ in workers):
+            if not partial:
+                missing = self._exchange([(worker, "missing", (group,)) for worker, group in workers])
+                missing = list(chain.from_iterable(missing))
+                if missing:
+                    raise ValueError(not_found_message(missing, removal))
+            results = {}
+            replies = self._exchange([(worker, "apply_many", (group, removal)) for worker, group in workers])
+            for (worker, _), (shard_results, version) in zip(workers, replies):
+                worker.version = version
+                results.update(shard_results)
+        return {isbn: results[isbn] for isbn in unique}
+
+    def mark_many_as_read(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Marca vários livros como lidos (veja BookManager.mark_many_as_read).
+        """
+        return self._apply_many(isbns, partial, removal=False)
+
+    def remove_many(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Remove vários livros (veja BookManager.remove_many).
+        """
+        return self._apply_many(isbns, partial, removal=True)
+
+    def _ordered_entries(self) -> list[tuple[int, Book]]:
+        """
+        Retorna todos os (seq, Book) em ordem global de inserção. A listagem fica
+        no processo principal e cada shard alterado envia só as mudanças desde a
+        última consulta (veja _ShardWorker.entries_since); o shard inteiro só é
+        enviado na primeira consulta ou quando o journal dele não cobre mais a
+        versão listada. A lista retornada não deve ser alterada.
+        """
+        workers = self._workers
+        with self._locked(workers):
+            stale = [worker for worker in workers if worker.listed != worker.version]
+            fetched = self._exchange([(worker, "entries_since", (worker.listed,)) for worker in stale])
+            replaced = {}
+            for worker, (version, incremental, items) in zip(stale, fetched):
+                if incremental:
+                    self._apply_changes(items)
+                else:
+                    replaced[worker.index] = items
+                worker.listed = version
+            if replaced:
+                self._replace_shards(replaced)
+            self._listing_shared = True
+            return self._listing
+
+    def _writable_listing(self) -> list[tuple[int, Book]]:
+        """
+        Retorna a listagem para alteração, copiando-a se já foi entregue.
+        """
+        if self._listing_shared:
+            self._listing = list(self._listing)
+            self._listing_shared = False
+        return self._listing
+
+    def _apply_changes(self, changes: list):
+        """
+        Aplica na listagem as mudanças de um shard, em O(log n) por mudança mais o
+        deslocamento da lista nas inclusões e remoções fora do fim.
+        """
+        listing = self._writable_listing()
+        listed = self._listed_seqs
+        for operation, seq, value in changes:
+            key = value if operation == "remove" else value.key
+            if operation == "read":
+                listing[bisect_left(listing, seq, key=_seq_of_entry)] = (seq, value)
+                continue
+            # Uma inclusão substitui o livro removido com o mesmo ISBN, se ainda listado.
+            old = listed.pop(key, None)
+            if old is not None:
+                del listing[bisect_left(listing, old, key=_seq_of_entry)]
+            if operation == "add":
+                insort(listing, (seq, value), key=_seq_of_entry)
+                listed[key] = seq
+
+    def _replace_shards(self, replaced: dict[int, list[tuple[int, Book]]]):
+        """
+        Substitui na listagem todas as entradas dos shards informados (índice do
+        processo -> entradas), numa única passada.
+        """
+        listed = self._listed_seqs
+        workers = len(self._workers)
+        listing = []
+        for entry in self._listing:
+            key = entry[1].key
+            if key % workers in replaced:
+                del listed[key]
+            else:
+                listing.append(entry)
+        for entries in replaced.values():
+            listing.extend(entries)
+            listed.update((book.key, seq) for seq, book in entries)
+        # Cada parte já está ordenada por seq; o Timsort aproveita essas sequências.
+        listing.sort(key=_seq_of_entry)
+        self._listing = listing
+        self._listing_shared = False
+
+    def list_books(self) -> list[Book]:
+        """
+        Retorna uma nova lista com todos os livros, na ordem de inserção.
+        """
+        return [book for _, book in self._ordered_entries()]
+
+    def iter_books(self, after: int | None = None):
+        """
+        Gera tuplas (seq, Book) na ordem de inserção a partir de um snapshot
+        consistente (veja BookManager.iter_books).
+        """
+        entries = self._ordered_entries()
+        position = 0 if after is None else bisect_right(entries, after, key=_seq_of_entry)
+        yield from islice(entries, position, None)
+
+    def books_page(self, cursor: int | None = None,
+                   limit: int = DEFAULT_PAGE_SIZE) -> tuple[list[Book], int | None]:
+        """
+        Retorna uma página de livros na ordem de inserção (veja BookManager.books_page).
+        Cada shard entrega os seus `limit` + 1 primeiros após o cursor, e as
+        entradas são intercaladas pelo seq, sem trazer a coleção inteira.
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"O limite da página deve estar entre 1 e {MAX_PAGE_SIZE}.")
+        entries = sorted(chain.from_iterable(self._scatter("page_entries", cursor, limit + 1)), key=_seq_of_entry)
+        next_cursor = entries[limit - 1][0] if len(entries) > limit else None
+        return [book for _, book in entries[:limit]], next_cursor
+
+    def search_books(self, query: str, limit: int | None = None, fuzzy: bool = False) -> list[Book]:
+        """
+        Busca em todos os shards, em paralelo, e junta os resultados (veja
+        BookManager.search_books).
+        """
+        if not query.strip():
+            books = self.list_books()
+            return books if limit is None else books[:limit]
+        if fuzzy:
+            return [book for _, book in self.fuzzy_matches(query, limit)]
+        results = list(chain.from_iterable(self._scatter("search_books", query, limit)))
+        results.sort(key=lambda book: (normalize_text(book.title), book.key))
+        return results if limit is None else results[:limit]
+
+    def fuzzy_matches(self, query: str, limit: int | None = None) -> list[tuple[float, Book]]:
+        """
+        Busca tolerante a erros em todos os shards (veja BookManager.fuzzy_matches):
+        cada shard entrega os seus `limit` mais parecidos e os resultados são
+        reordenados pela pontuação.
+        """
+        matches = list(chain.from_iterable(self._scatter("fuzzy_matches", query, limit)))
+        matches.sort(key=lambda match: (-match[0], match[1].key))
+        return matches if limit is None else matches[:limit]
+
+    def sorted_page(self, by: str = "title", cursor: tuple | None = None,
+                    limit: int = DEFAULT_PAGE_SIZE, start: str | None = None,
+                    stop: str | None = None) -> tuple[list[Book], tuple | None]:
+        """
+        Retorna uma página de livros ordenados por título ou por autor (veja
+        BookManager.sorted_page), intercalando as páginas dos shards como o
+        ShardedBookManager.
+        """
+        fields = sort_fields(by)
+        entries = []
+        more = False
+        for books, next_cursor in self._scatter("sorted_page", by, cursor, limit, start, stop):
+            entries.extend((sort_entry(book, fields), book) for book in books)
+            more = more or next_cursor is not None
+        entries.sort(key=itemgetter(0))
+        # Um shard com mais livros já entregou `limit` deles, então há uma página seguinte.
+        next_cursor = entries[limit - 1][0] if more or len(entries) > limit else None
+        return [book for _, book in entries[:limit]], next_cursor
+
+    def filter_books(self, author: str | None = None, read: bool | None = None,
+                     limit: int | None = None) -> list[Book]:
+        """
+        Filtra em todos os shards e junta os resultados na ordem global de inserção
+        (veja BookManager.filter_books).
+        """
+        entries = sorted(chain.from_iterable(self._scatter("filter_entries", author, read, limit)),
+                         key=_seq_of_entry)
+        books = [book for _, book in entries]
+        return books if limit is None else books[:limit]
+
+    def count_books(self, author: str | None = None, read: bool | None = None) -> int:
+        """
+        Soma as contagens dos shards (veja BookManager.count_books).
+        """
+        return sum(self._scatter("count_books", author, read))
@@ -0,0 +1,401 @@
+# digital_library_pytest/search_index.py
+
+import heapq
+import re
+import unicodedata
+from itertools import chain, groupby
+
+from digital_library_pytest.book import Book, format_isbn_key, isbn_key
+from digital_library_pytest.fuzzy_index import TrigramIndex
+from digital_library_pytest.sorted_list import SortedList
+
+# Sequências de letras/dígitos; pontuação e espaços separam os tokens.
+_TOKEN_RE = re.compile(r"\w+")
+
+# Tamanho de lote a partir do qual remove_many filtra as listas ordenadas de uma vez.
+_MIN_BATCH_TO_FILTER = 64
+
+# Combinações de níveis de similaridade examinadas pela busca aproximada antes de
+# recorrer à partição completa dos candidatos (veja SearchIndex._best_first).
+_MAX_COMBINATIONS = 256
+
+# Consultas com formato de ISBN (dígitos, hífens, espaços e X), buscadas também por ISBN.
+_ISBN_QUERY_RE = re.compile(r"[0-9][0-9Xx\- ]*")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza um texto para busca: remove acentos e aplica casefold.
+    Assim "Anéis" e "aneis" produzem o mesmo token.
+    """
+    if text.isascii():
+        return text.lower() # Caminho rápido: sem acentos, casefold equivale a lower
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Divide um texto normalizado em tokens de busca.
+    """
+    return _TOKEN_RE.findall(normalize_text(text))
+
+
+def compact_isbn(isbn: str) -> str:
+    """
+    Remove hífens e espaços de um ISBN para comparação por prefixo
+    ("978-85 359" equivale a "97885359").
+    """
+    return isbn.replace("-", "").replace(" ", "").upper()
+
+
+class SearchIndex:
+    """
+    Índice invertido de tokens de título e autor, com suporte a prefixo,
+    e índice ordenado de ISBNs para busca exata e por prefixo.
+    Os livros são identificados pela chave canônica do ISBN (Book.key).
+    É mantido incrementalmente pelo BookManager a cada inclusão e remoção.
+    """
+    def __init__(self):
+        """
+        Inicializa o índice vazio.
+        """
+        self._postings: dict[str, set[int]] = {} # token -> chaves dos livros que o contêm
+        self._vocabulary = SortedList() # Tokens ordenados, para expandir prefixos
+        self._isbns = SortedList() # (ISBN compacto, chave) ordenados
+        # Trigramas do vocabulário para a busca tolerante a erros, construídos na
+        # primeira busca aproximada e mantidos quando tokens entram ou saem do vocabulário.
+        self._trigram_index: TrigramIndex | None = None
+
+    @staticmethod
+    def _book_tokens(book: Book) -> set[str]:
+        """
+        Retorna os tokens distintos do título e do autor de um livro.
+        """
+        return set(tokenize(f"{book.title} {book.author}"))
+
+    @staticmethod
+    def _isbn_entries(book: Book) -> tuple[tuple[str, int], ...]:
+        """
+        Retorna as entradas do índice de ISBNs de um livro: o ISBN-13 canônico e,
+        se for diferente (um ISBN-10), também o ISBN como foi informado, sem hífens.
+        """
+        canonical = format_isbn_key(book.key)
+        compact = compact_isbn(book.isbn)
+        if compact == canonical:
+            return ((canonical, book.key),)
+        return ((canonical, book.key), (compact, book.key))
+
+    def add(self, book: Book):
+        """
+        Indexa um livro recém-adicionado. As listas ordenadas recebem o token e o
+        ISBN no buffer de inclusões recentes (veja SortedList), sem deslocar a
+        lista inteira.
+        """
+        postings = self._postings
+        for token in self._book_tokens(book):
+            keys = postings.get(token)
+            if keys is None:
+                postings[token] = {book.key}
+                self._vocabulary.add(token)
+                if self._trigram_index is not None:
+                    self._trigram_index.add_tokens((token,))
+            else:
+                keys.add(book.key)
+        for entry in self._isbn_entries(book):
+            self._isbns.add(entry)
+
+    def add_many(self, books):
+        """
+        Indexa um lote de livros de uma vez.
+        Os novos tokens e ISBNs são apenas acrescentados e as listas ordenadas são
+        reordenadas uma única vez no próximo uso, evitando uma inserção ordenada
+        (O(n)) por livro em importações em massa.
+        """
+        postings = self._postings
+        new_tokens = []
+        new_isbns = []
+        for book in books:
+            for token in self._book_tokens(book):
+                keys = postings.get(token)
+                if keys is None:
+                    postings[token] = {book.key}
+                    new_tokens.append(token)
+                else:
+                    keys.add(book.key)
+            new_isbns.extend(self._isbn_entries(book))
+        self._vocabulary.extend(new_tokens)
+        self._isbns.extend(new_isbns)
+        if self._trigram_index is not None:
+            self._trigram_index.add_tokens(new_tokens)
+
+    def ready(self, fuzzy: bool = False) -> bool:
+        """
+        Indica se as consultas apenas leem o índice (veja prepare).
+
+        Args:
+            fuzzy (bool): Se True, considera também a busca aproximada.
+        """
+        return (self._vocabulary.ready and self._isbns.ready
+                and (not fuzzy or self._trigram_index is not None))
+
+    def prepare(self, fuzzy: bool = False):
+        """
+        Conclui o trabalho adiado para as consultas: a reordenação após inclusões
+        em lote e, para a busca aproximada, o índice de trigramas. Depois disso, e
+        até a próxima inclusão em lote, as consultas não alteram o índice.
+
+        Args:
+            fuzzy (bool): Se True, constrói também o índice de trigramas.
+        """
+        self._vocabulary.prepare()
+        self._isbns.prepare()
+        if fuzzy and self._trigram_index is None:
+            self._trigram_index = TrigramIndex()
+            self._trigram_index.add_tokens(self._vocabulary)
+
+    def remove(self, book: Book):
+        """
+        Remove um livro do índice.
+        """
+        postings = self._postings
+        for token in self._book_tokens(book):
+            keys = postings.get(token)
+            if keys is None:
+                continue
+            keys.discard(book.key)
+            if not keys:
+                del postings[token]
+                self._vocabulary.remove(token)
+                if self._trigram_index is not None:
+                    self._trigram_index.remove_tokens((token,))
+        for entry in self._isbn_entries(book):
+            self._isbns.remove(entry)
+
+    def remove_many(self, books):
+        """
+        Remove um lote de livros do índice. Em vez de apagar cada entrada das
+        listas ordenadas (um deslocamento O(n) por livro), as listas são filtradas
+        uma única vez; lotes pequenos usam a remoção individual, que é mais barata.
+        """
+        books = list(books)
+        if len(books) < _MIN_BATCH_TO_FILTER:
+            for book in books:
+                self.remove(book)
+            return
+        postings = self._postings
+        emptied = set()
+        removed_entries = set()
+        for book in books:
+            for token in self._book_tokens(book):
+                keys = postings.get(token)
+                if keys is None:
+                    continue
+                keys.discard(book.key)
+                if not keys:
+                    del postings[token]
+                    emptied.add(token)
+            removed_entries.update(self._isbn_entries(book))
+        if emptied:
+            self._vocabulary.keep(lambda token: token not in emptied)
+            if self._trigram_index is not None:
+                self._trigram_index.remove_tokens(emptied)
+        self._isbns.keep(lambda entry: entry not in removed_entries)
+
+    def _prefix_postings(self, prefix: str) -> list[set[int]]:
+        """
+        Retorna os conjuntos de chaves de todos os tokens que começam com `prefix`.
+        Os conjuntos são os do próprio índice e não devem ser modificados.
+        """
+        postings = self._postings
+        found = []
+        for token in self._vocabulary.iter_from(prefix):
+            if not token.startswith(prefix):
+                break
+            found.append(postings[token])
+        return found
+
+    def _isbn_matches(self, prefix: str) -> set[int]:
+        """
+        Retorna as chaves dos livros cujo ISBN começa com `prefix` (comparação sem hífens).
+        """
+        matches = set()
+        for isbn, key in self._isbns.iter_from((prefix,)):
+            if not isbn.startswith(prefix):
+                break
+            matches.add(key)
+        return matches
+
+    def search(self, query: str) -> set[int]:
+        """
+        Retorna as chaves dos livros que correspondem à consulta.
+        Todos os termos da consulta precisam casar (como prefixo) com algum token
+        do título ou do autor. Consultas com formato de ISBN também casam com
+        ISBNs exatos (em qualquer grafia, inclusive ISBN-10) ou por prefixo.
+        """
+        self.prepare()
+        matches: set[int] = set()
+        stripped = query.strip()
+        if _ISBN_QUERY_RE.fullmatch(stripped):
+            matches |= self._isbn_matches(compact_isbn(stripped))
+            key = isbn_key(stripped)
+            if key is not None:
+                # Um ISBN completo também encontra o livro cadastrado na outra grafia.
+                matches |= self._isbn_matches(format_isbn_key(key))
+
+        terms = set(tokenize(query))
+        if terms:
+            # Cada termo vira a união dos conjuntos dos tokens que ele prefixa. Termos
+            # que casam com um único token usam o conjunto do índice sem copiá-lo, e a
+            # interseção começa pelo termo mais seletivo (set & set percorre o menor).
+            candidates = []
+            for term in terms:
+                found = self._prefix_postings(term)
+                if not found:
+                    return matches
+                candidates.append(found[0] if len(found) == 1 else set().union(*found))
+            candidates.sort(key=len)
+            text_matches = candidates[0]
+            for other in candidates[1:]:
+                text_matches = text_matches & other
+                if not text_matches:
+                    break
+            matches |= text_matches
+        return matches
+
+    @staticmethod
+    def _partition(parts: list[tuple[float, set[int]]], term_levels) -> list[tuple[float, set[int]]]:
+        """
+        Refina partes (soma de similaridades, chaves), termo a termo, pelo nível do
+        token mais parecido de cada livro (0 se ele não tem token parecido com o
+        termo). Cada parte resultante tem uma única soma; o trabalho é feito por
+        operações de conjuntos, e não livro a livro.
+        """
+        for levels in term_levels:
+            refined = []
+            for total, keys in parts:
+                rest = keys
+                for similarity, level_keys in levels:
+                    found = rest & level_keys
+                    if found:
+                        refined.append((total + similarity, found))
+                        rest = rest - found
+                        if not rest:
+                            break
+                if rest:
+                    refined.append((total, rest))
+            parts = refined
+        return parts
+
+    def fuzzy_search(self, query: str, limit: int | None = None) -> list[tuple[float, int]]:
+        """
+        Busca tolerante a erros de digitação ("Tolkein", "Orwel") no título e no autor.
+        Cada termo da consulta é comparado, por trigramas, com os tokens do
+        vocabulário (não com os livros); os livros vêm dos tokens mais parecidos.
+        A pontuação de um livro é a média, entre os termos, da similaridade do
+        token mais parecido que ele contém (0 para um termo sem token parecido),
+        então uma grafia exata (similaridade 1) sempre vence uma aproximada.
+
+        Termos comuns ("dos") trazem dezenas de milhares de livros, então nada é
+        feito livro a livro: os níveis de cada termo são os próprios conjuntos do
+        índice, e os `limit` primeiros saem das primeiras combinações de níveis
+        (veja _best_first). Sem limite, todos os candidatos são particionados.
+
+        Args:
+            query (str): Texto da busca.
+            limit (int | None): Quantidade máxima de resultados.
+
+        Returns:
+            list[tuple[float, int]]: Pares (pontuação, chave), da maior pontuação para
+                a menor; empates ficam na ordem das chaves.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        self.prepare(fuzzy=True)
+        postings = self._postings
+        # Níveis (similaridade, chaves) de cada termo, do token mais parecido ao menos.
+        # Um livro pode estar em vários níveis de um termo; vale o primeiro.
+        term_levels = []
+        for term in terms:
+            levels = [(similarity, postings[token]) for similarity, token in self._trigram_index.similar(term)]
+            if levels:
+                term_levels.append(levels)
+        if not term_levels:
+            return []
+        if limit is not None:
+            ranked = self._best_first(term_levels, len(terms), limit)
+            if ranked is not None:
+                return ranked
+        candidates = set().union(*(keys for levels in term_levels for _, keys in levels))
+        return self._top_ranked(self._partition([(0.0, candidates)], term_levels), len(terms), limit)
+
+    def _best_first(self, term_levels, term_count: int, limit: int) -> list[tuple[float, int]] | None:
+        """
+        Percorre as combinações de níveis (um por termo, ou nenhum) da maior soma de
+        similaridades para a menor. Os livros de uma combinação são a interseção
+        dos seus níveis, menos os que estão num nível anterior de algum termo (onde
+        pontuam mais); as diferenças partem da interseção, em geral pequena, e os
+        conjuntos grandes de termos comuns não são copiados. Para assim que os
+        `limit` primeiros estão garantidos, o que costuma levar poucas combinações.
+
+        Returns:
+            list[tuple[float, int]] | None: O resultado, ou None se forem necessárias
+                mais de _MAX_COMBINATIONS combinações (use _partition).
+        """
+        start = (0,) * len(term_levels)
+        pending = [(-sum(levels[0][0] for levels in term_levels), start)]
+        visited = {start}
+        parts = []
+        found = 0
+        for _ in range(_MAX_COMBINATIONS):
+            if not pending or (found >= limit and round(-pending[0][0], 9) < round(parts[-1][0], 9)):
+                return self._top_ranked(parts, term_count, limit)
+            total, combination = heapq.heappop(pending)
+            present = sorted((term_levels[term][level][1] for term, level in enumerate(combination)
+                              if level < len(term_levels[term])), key=len)
+            if present:
+                keys = present[0]
+                for other in present[1:]:
+                    if not keys:
+                        break
+                    keys = keys & other
+                for term, level in enumerate(combination):
+                    for _, better in term_levels[term][:level]: # Níveis anteriores, ou todos se nenhum
+                        if not keys:
+                            break
+                        keys = keys - better
+                if keys:
+                    # A soma é refeita na ordem dos termos, como em _partition.
+                    score = sum(term_levels[term][level][0] for term, level in enumerate(combination)
+                                if level < len(term_levels[term]))
+                    parts.append((score, keys))
+                    found += len(keys)
+            for term, level in enumerate(combination):
+                if level < len(term_levels[term]):
+                    following = combination[:term] + (level + 1,) + combination[term + 1:]
+                    if following not in visited:
+                        visited.add(following)
+                        levels = term_levels[term]
+                        lost = levels[level][0] - (levels[level + 1][0] if level + 1 < len(levels) else 0.0)
+                        heapq.heappush(pending, (total + lost, following))
+        return None
+
+    @staticmethod
+    def _top_ranked(parts, term_count: int, limit: int | None) -> list[tuple[float, int]]:
+        """
+        Ordena as partes por pontuação e retorna os pares (pontuação, chave) dos
+        `limit` primeiros livros, com empates na ordem das chaves. As somas são
+        arredondadas para que a ordem das parcelas não desfaça um empate.
+        """
+        rounded = lambda part: round(part[0], 9)
+        parts.sort(key=rounded, reverse=True)
+        ranked = []
+        for total, group in groupby(parts, key=rounded):
+            keys = list(chain.from_iterable(keys for _, keys in group))
+            wanted = len(keys) if limit is None else limit - len(ranked)
+            best = sorted(keys) if wanted >= len(keys) else heapq.nsmallest(wanted, keys)
+            ranked.extend((total / term_count, key) for key in best)
+            if limit is not None and len(ranked) >= limit:
+                break
+        return ranked
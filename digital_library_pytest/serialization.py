@@ -0,0 +1,39 @@
+# digital_library_pytest/serialization.py
+
+import json
+
+# Codificador das respostas em JSON: compacto e sem escapar acentos (os bytes são UTF-8).
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def encode_json(value) -> bytes:
+    """
+    Codifica um valor em JSON (UTF-8), no formato usado por todas as respostas.
+    """
+    return _encoder.encode(value).encode()
+
+
+def books_json(books) -> bytes:
+    """
+    Retorna o array JSON dos livros, juntando os bytes já codificados de cada um
+    (veja Book.to_json): nenhum dicionário é criado e, para livros já
+    serializados, montar a lista custa pouco mais que copiar a memória.
+    """
+    return b"[" + b",".join([book.to_json() for book in books]) + b"]"
+
+
+def response_json(field: str, encoded: bytes, **fields) -> bytes:
+    """
+    Monta a resposta {"success": true, field: ..., **fields} com um valor já
+    codificado em JSON (um livro ou um array de livros), sem decodificá-lo.
+
+    Args:
+        field (str): Nome do campo com o valor codificado ("book" ou "books").
+        encoded (bytes): O valor, já em JSON.
+        **fields: Demais campos da resposta, codificados com encode_json.
+
+    Returns:
+        bytes: A resposta em JSON.
+    """
+    extra = b"".join(b',"%s":%s' % (name.encode(), encode_json(value)) for name, value in fields.items())
+    return b"".join((b'{"success":true,"', field.encode(), b'":', encoded, extra, b"}"))
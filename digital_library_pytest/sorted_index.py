@@ -0,0 +1,150 @@
+# digital_library_pytest/sorted_index.py
+
+from itertools import islice, takewhile
+
+from digital_library_pytest.book import Book
+from digital_library_pytest.search_index import normalize_text
+from digital_library_pytest.sorted_list import SortedList
+
+# Campos de cada ordenação disponível, do critério principal ao desempate.
+# Livros do mesmo autor aparecem em ordem de título; o ISBN desempata o resto.
+SORT_FIELDS: dict[str, tuple[str, ...]] = {
+    "title": ("title",),
+    "author": ("author", "title"),
+}
+
+# Tamanho de lote a partir do qual remove_many filtra a lista ordenada de uma vez.
+_MIN_BATCH_TO_FILTER = 64
+
+
+def collation_key(text: str) -> str:
+    """
+    Chave de ordenação de um texto: sem acentos, sem diferenciar maiúsculas e
+    com espaços repetidos reduzidos, de modo que "Érico" fica junto de "erico"
+    (entre "Eric" e "Ernesto") em vez de depois de "Zélia", como na ordem Unicode.
+    """
+    return " ".join(normalize_text(text).split())
+
+
+def sort_fields(by: str) -> tuple[str, ...]:
+    """
+    Retorna os campos da ordenação informada.
+
+    Raises:
+        ValueError: Se a ordenação não existir.
+    """
+    fields = SORT_FIELDS.get(by)
+    if fields is None:
+        options = " ou ".join(f"'{name}'" for name in SORT_FIELDS)
+        raise ValueError(f"Ordenação '{by}' inválida; use {options}.")
+    return fields
+
+
+def sort_entry(book: Book, fields: tuple[str, ...]) -> tuple:
+    """
+    Retorna a entrada de um livro em uma ordenação: as chaves de ordenação dos
+    campos seguidas da chave do ISBN. As entradas também servem de cursor.
+    """
+    return (*(collation_key(getattr(book, field)) for field in fields), book.key)
+
+
+def check_cursor(cursor, fields: tuple[str, ...]) -> tuple:
+    """
+    Valida um cursor de ordenação (uma entrada, possivelmente vinda de JSON como lista).
+
+    Raises:
+        ValueError: Se o cursor não tiver o formato de uma entrada da ordenação.
+    """
+    if (isinstance(cursor, (tuple, list)) and len(cursor) == len(fields) + 1
+            and all(isinstance(part, str) for part in cursor[:-1])
+            and isinstance(cursor[-1], int) and not isinstance(cursor[-1], bool)):
+        return tuple(cursor)
+    raise ValueError("Cursor de ordenação inválido.")
+
+
+class SortedIndex:
+    """
+    Lista ordenada das entradas (veja sort_entry) de todos os livros em uma
+    ordenação, mantida incrementalmente pelo BookManager. Título e autor não mudam
+    depois da inclusão, então só inclusões e remoções a alteram. Páginas, faixas
+    e os k primeiros saem por busca binária, sem reordenar a coleção a cada pedido.
+    """
+    def __init__(self, by: str):
+        """
+        Inicializa o índice vazio da ordenação informada.
+
+        Raises:
+            ValueError: Se a ordenação não existir.
+        """
+        self.fields = sort_fields(by)
+        self._entries = SortedList()
+
+    def add(self, book: Book):
+        """
+        Indexa um livro recém-adicionado (no buffer de inclusões recentes; veja SortedList).
+        """
+        self._entries.add(sort_entry(book, self.fields))
+
+    def add_many(self, books):
+        """
+        Indexa um lote de livros de uma vez. As entradas são apenas acrescentadas
+        e a lista é reordenada uma única vez no próximo uso.
+        """
+        fields = self.fields
+        self._entries.extend(sort_entry(book, fields) for book in books)
+
+    @property
+    def ready(self) -> bool:
+        """
+        Indica se page apenas lê o índice (sem reordenação pendente).
+        """
+        return self._entries.ready
+
+    def prepare(self):
+        """
+        Conclui a reordenação pendente, para que page não altere o índice.
+        """
+        self._entries.prepare()
+
+    def remove(self, book: Book):
+        """
+        Remove um livro do índice.
+        """
+        self._entries.remove(sort_entry(book, self.fields))
+
+    def remove_many(self, books):
+        """
+        Remove um lote de livros, filtrando a lista uma única vez em lotes grandes
+        (como SearchIndex.remove_many).
+        """
+        books = list(books)
+        if len(books) < _MIN_BATCH_TO_FILTER:
+            for book in books:
+                self.remove(book)
+            return
+        removed = {book.key for book in books}
+        self._entries.keep(lambda entry: entry[-1] not in removed)
+
+    def page(self, after: tuple | None = None, limit: int | None = None,
+             start: str | None = None, stop: str | None = None) -> list[tuple]:
+        """
+        Retorna as entradas em ordem, em O(log n + limit).
+
+        Args:
+            after (tuple | None): Cursor; retorna apenas entradas posteriores a ele.
+            limit (int | None): Quantidade máxima de entradas.
+            start (str | None): Início da faixa (inclusivo) no campo principal,
+                                comparado pela chave de ordenação ("b" inclui "Bíblia").
+            stop (str | None): Fim da faixa (exclusivo) no campo principal.
+
+        Returns:
+            list[tuple]: As entradas encontradas.
+        """
+        self.prepare()
+        low = None if start is None else (collation_key(start),)
+        strict = after is not None and (low is None or after >= low)
+        entries = self._entries.iter_from(after if strict else low, strict)
+        if stop is not None:
+            end = (collation_key(stop),)
+            entries = takewhile(lambda entry: entry < end, entries)
+        return list(islice(entries, limit))
@@ -0,0 +1,143 @@
+# digital_library_pytest/sorted_list.py
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from math import isqrt
+
+# Tamanho mínimo do buffer de inclusões recentes antes de juntá-lo à lista principal.
+_MIN_RECENT = 1_024
+# O buffer é juntado ao passar de _RECENT_FACTOR * raiz de n itens: inserir no buffer
+# só move referências (memmove), enquanto juntá-lo copia a lista principal inteira.
+_RECENT_FACTOR = 32
+
+
+class SortedList:
+    """
+    Lista ordenada para os índices (vocabulário e ISBNs da busca, entradas das
+    ordenações), em duas partes: a lista principal e um buffer ordenado com as
+    inclusões recentes. Uma inclusão é uma inserção ordenada no buffer, pequeno, e
+    não na lista principal, que pode ter o tamanho do catálogo; o buffer é juntado
+    à lista principal quando passa de algumas vezes raiz de n itens, então o custo de cada
+    inclusão fica em O(raiz de n) em vez de O(n). As consultas percorrem as duas
+    partes intercaladas, sem alterá-las.
+
+    Lotes (extend) são apenas acrescentados e ordenados uma única vez no próximo
+    uso (veja prepare).
+    """
+    def __init__(self):
+        """
+        Inicializa a lista vazia.
+        """
+        self._items: list = [] # Lista principal, ordenada (exceto com _unsorted)
+        self._recent: list = [] # Inclusões recentes, ordenadas
+        self._unsorted = False # extend acrescenta sem ordenar; a ordenação ocorre no próximo uso
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de itens.
+        """
+        return len(self._items) + len(self._recent)
+
+    def __iter__(self):
+        """
+        Percorre os itens em ordem.
+        """
+        return self.iter_from()
+
+    @property
+    def ready(self) -> bool:
+        """
+        Indica se as consultas apenas leem a lista (sem ordenação pendente).
+        """
+        return not self._unsorted
+
+    def prepare(self):
+        """
+        Ordena a lista após inclusões em lote.
+        """
+        if self._unsorted:
+            self._merge()
+
+    def _merge(self):
+        """
+        Junta o buffer à lista principal. Com a lista principal ordenada, cada item
+        do buffer é posicionado por busca binária e a lista é remontada por fatias,
+        copiando referências sem comparar os itens; após um lote, ela é reordenada.
+        """
+        items, recent = self._items, self._recent
+        if self._unsorted:
+            items.extend(recent)
+            items.sort()
+        elif recent:
+            merged = []
+            start = 0
+            for item in recent:
+                position = bisect_right(items, item, start)
+                merged += items[start:position]
+                merged.append(item)
+                start = position
+            merged += items[start:]
+            self._items = merged
+        self._recent = []
+        self._unsorted = False
+
+    def add(self, item):
+        """
+        Inclui um item, em O(raiz de n).
+        """
+        if self._unsorted:
+            self._items.append(item) # Será ordenado com o lote pendente
+            return
+        insort(self._recent, item)
+        if len(self._recent) > max(_MIN_RECENT, _RECENT_FACTOR * isqrt(len(self._items))):
+            self._merge()
+
+    def extend(self, items):
+        """
+        Inclui um lote de itens, ordenados uma única vez no próximo uso.
+        """
+        self._items.extend(items)
+        self._unsorted = True
+
+    def remove(self, item) -> bool:
+        """
+        Remove um item, se presente.
+
+        Returns:
+            bool: True se o item foi encontrado.
+        """
+        self.prepare()
+        for items in (self._recent, self._items):
+            position = bisect_left(items, item)
+            if position < len(items) and items[position] == item:
+                del items[position]
+                return True
+        return False
+
+    def keep(self, predicate):
+        """
+        Mantém apenas os itens para os quais `predicate` é verdadeiro, percorrendo
+        a lista uma única vez (remoções em lote).
+        """
+        self._items = [item for item in self._items if predicate(item)]
+        self._recent = [item for item in self._recent if predicate(item)]
+
+    def iter_from(self, low=None, strict: bool = False):
+        """
+        Percorre, em ordem, os itens a partir de `low`, intercalando a lista
+        principal e o buffer. Não altera a lista: chame prepare antes, se houver
+        um lote pendente.
+
+        Args:
+            low: Limite inferior, ou None para começar do primeiro item.
+            strict (bool): Se True, pula os itens iguais a `low`.
+        """
+        find = bisect_right if strict else bisect_left
+        parts = []
+        for items in (self._items, self._recent):
+            position = 0 if low is None else find(items, low)
+            if position < len(items):
+                parts.append(map(items.__getitem__, range(position, len(items))))
+        if len(parts) == 1:
+            return parts[0]
+        return heapq.merge(*parts)
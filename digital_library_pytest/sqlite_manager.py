@@ -0,0 +1,629 @@
+# digital_library_pytest/sqlite_manager.py
+
+import heapq
+import itertools
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+from digital_library_pytest.book import Book, isbn_key
+from digital_library_pytest.book_io import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_ERRORS,
+    ImportReport,
+    read_csv_rows,
+    read_jsonl_rows,
+    validated_batches,
+    write_csv,
+    write_jsonl,
+)
+from digital_library_pytest.book_manager import (
+    DEFAULT_JOURNAL_SIZE,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    consolidate_changes,
+    not_found_message,
+)
+from digital_library_pytest.filter_index import require_criteria
+from digital_library_pytest.fuzzy_index import token_similarity
+from digital_library_pytest.search_index import tokenize
+from digital_library_pytest.sorted_index import check_cursor, sort_fields
+
+# Quantidade padrão de conexões mantidas pelo pool.
+DEFAULT_POOL_SIZE = 4
+
+# Limite de parâmetros por consulta "IN (...)", abaixo do limite padrão do SQLite.
+_MAX_PARAMETERS = 900
+
+# Linhas buscadas por vez ao percorrer resultados grandes.
+_FETCH_SIZE = 10_000
+
+# Contador usado para nomear bancos em memória compartilhados entre as conexões do pool.
+_memory_ids = itertools.count()
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS books (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        isbn TEXT NOT NULL,
+        isbn_key INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        author TEXT NOT NULL,
+        read INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_books_isbn_key ON books (isbn_key)",
+    # Também atende aos filtros por autor, pelo prefixo; substitui o antigo idx_books_author.
+    "CREATE INDEX IF NOT EXISTS idx_books_author_title "
+    "ON books (author COLLATE NOCASE, title COLLATE NOCASE, isbn_key)",
+    "DROP INDEX IF EXISTS idx_books_author",
+    "CREATE INDEX IF NOT EXISTS idx_books_title ON books (title COLLATE NOCASE, isbn_key)",
+    "CREATE INDEX IF NOT EXISTS idx_books_read ON books (read)",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO meta (key, value) VALUES ('version', 0)",
+    # Journal de mudanças de changes_since (veja BookManager.changes_since).
+    """
+    CREATE TABLE IF NOT EXISTS changes (
+        id INTEGER PRIMARY KEY,
+        version INTEGER NOT NULL,
+        op TEXT NOT NULL,
+        isbn_key INTEGER NOT NULL,
+        isbn TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_changes_version ON changes (version)",
+    # Bancos criados antes do journal não têm as mudanças anteriores à versão atual.
+    "INSERT OR IGNORE INTO meta (key, value) SELECT 'journal_floor', value FROM meta WHERE key = 'version'",
+)
+
+# As instruções são constantes para que o cache de instruções preparadas de cada
+# conexão (cached_statements) as reaproveite em todas as chamadas.
+_INSERT = "INSERT INTO books (isbn, isbn_key, title, author, read) VALUES (?, ?, ?, ?, ?)"
+_SELECT_ALL = "SELECT title, author, isbn, read FROM books ORDER BY id"
+_MARK_AS_READ = "UPDATE books SET read = 1 WHERE isbn_key = ? AND read = 0"
+_MARK_AS_READ_RETURNING = _MARK_AS_READ + " RETURNING isbn"
+_EXISTS = "SELECT 1 FROM books WHERE isbn_key = ?"
+_DELETE = "DELETE FROM books WHERE isbn_key = ?"
+_DELETE_RETURNING = _DELETE + " RETURNING isbn"
+_COUNT = "SELECT COUNT(*) FROM books"
+_VERSION = "SELECT value FROM meta WHERE key = 'version'"
+_BUMP_VERSION = "UPDATE meta SET value = value + 1 WHERE key = 'version' RETURNING value"
+_JOURNAL_FLOOR = "SELECT value FROM meta WHERE key = 'journal_floor'"
+_SET_JOURNAL_FLOOR = "UPDATE meta SET value = ? WHERE key = 'journal_floor'"
+_INSERT_CHANGE = "INSERT INTO changes (version, op, isbn_key, isbn) VALUES (?, ?, ?, ?)"
+# Entrada mais recente entre as que excedem o tamanho do journal (o id cresce com as inserções).
+_OVERFLOW = "SELECT id, version FROM changes WHERE id <= (SELECT MAX(id) FROM changes) - ? ORDER BY id DESC LIMIT 1"
+_SELECT_CHANGES = "SELECT version, op, isbn_key, isbn FROM changes WHERE version > ? ORDER BY id"
+_SORTED_COLUMNS = {"title": 0, "author": 1} # Posição de cada campo nas linhas de sorted_page
+_SELECT_AFTER = "SELECT id, title, author, isbn, read FROM books WHERE id > ? ORDER BY id LIMIT ?"
+
+
+def _row_to_book(row) -> Book:
+    """
+    Converte uma linha (title, author, isbn, read) em um Book.
+    """
+    book = Book(row[0], row[1], row[2])
+    if row[3]:
+        book.mark_as_read()
+    return book
+
+
+class ConnectionPool:
+    """
+    Pool fixo de conexões SQLite compartilhado entre as threads que chamam a API.
+    Cada conexão é usada por uma thread de cada vez; o modo WAL permite que
+    leituras prossigam enquanto uma escrita está em andamento.
+    """
+    def __init__(self, database: str, size: int = DEFAULT_POOL_SIZE, timeout: float = 30.0):
+        """
+        Abre `size` conexões com o banco informado.
+
+        Args:
+            database (str): Caminho do arquivo do banco, ou ":memory:" para um banco
+                            em memória compartilhado pelas conexões do pool.
+            size (int): Quantidade de conexões.
+            timeout (float): Tempo máximo de espera por uma conexão livre ou por um lock do banco.
+        """
+        if size < 1:
+            raise ValueError("O pool precisa de pelo menos uma conexão.")
+        uri = False
+        if database == ":memory:":
+            database = f"file:digital_library_{next(_memory_ids)}?mode=memory&cache=shared"
+            uri = True
+        self._timeout = timeout
+        self._connections: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._all: list[sqlite3.Connection] = []
+        for _ in range(size):
+            connection = sqlite3.connect(database, timeout=timeout, uri=uri,
+                                         check_same_thread=False, cached_statements=128)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._all.append(connection)
+            self._connections.put(connection)
+
+    @contextmanager
+    def connection(self):
+        """
+        Empresta uma conexão do pool durante o bloco `with`.
+
+        Raises:
+            TimeoutError: Se nenhuma conexão ficar livre dentro do tempo limite.
+        """
+        try:
+            connection = self._connections.get(timeout=self._timeout)
+        except queue.Empty:
+            raise TimeoutError("Nenhuma conexão livre no pool.") from None
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        """
+        Fecha todas as conexões do pool.
+        """
+        for connection in self._all:
+            connection.close()
+        self._all.clear()
+
+
+class SQLiteBookManager:
+    """
+    Variante do BookManager que guarda os livros em um banco SQLite local,
+    com índice único na chave canônica do ISBN (veja isbn_key). Mantém os mesmos métodos públicos e as mesmas
+    mensagens de ValueError, permitindo catálogos maiores que a memória.
+
+    Os objetos Book retornados são cópias das linhas do banco: alterá-los
+    diretamente não altera a biblioteca; use mark_as_read do gerenciador.
+    """
+    def __init__(self, database: str = ":memory:", pool_size: int = DEFAULT_POOL_SIZE,
+                 journal_size: int = DEFAULT_JOURNAL_SIZE):
+        """
+        Abre (ou cria) a biblioteca no banco informado.
+
+        Args:
+            database (str): Caminho do arquivo do banco, ou ":memory:".
+            pool_size (int): Quantidade de conexões do pool.
+            journal_size (int): Quantidade máxima de mudanças guardadas no banco para changes_since.
+
+        Raises:
+            ValueError: Se journal_size for menor que 1.
+        """
+        if journal_size < 1:
+            raise ValueError("O journal de mudanças precisa guardar ao menos uma mudança.")
+        self._journal_size = journal_size
+        self._pool = ConnectionPool(database, pool_size)
+        with self._pool.connection() as connection, connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de livros na biblioteca.
+        """
+        with self._pool.connection() as connection:
+            return connection.execute(_COUNT).fetchone()[0]
+
+    @property
+    def version(self) -> int:
+        """
+        Versão monotônica da biblioteca (veja BookManager.version).
+        Fica gravada no próprio banco e é incrementada na mesma transação de cada
+        mutação, então reflete também escritas feitas por outros processos.
+        """
+        with self._pool.connection() as connection:
+            return connection.execute(_VERSION).fetchone()[0]
+
+    def _record_changes(self, connection: sqlite3.Connection, changes: list[tuple[str, int, str]]):
+        """
+        Incrementa a versão e grava as mudanças (operação, chave, ISBN) no journal do
+        banco, na transação da própria mutação. As entradas que excedem o tamanho do
+        journal são descartadas, e o piso do journal passa a ser a versão da mais
+        recente delas (veja BookManager.changes_since).
+        """
+        version = connection.execute(_BUMP_VERSION).fetchone()[0]
+        if len(changes) > self._journal_size:
+            # O lote não cabe no journal: nenhuma versão anterior pode ser sincronizada.
+            connection.execute("DELETE FROM changes")
+            connection.execute(_SET_JOURNAL_FLOOR, (version,))
+            return
+        connection.executemany(_INSERT_CHANGE, ((version, *change) for change in changes))
+        overflow = connection.execute(_OVERFLOW, (self._journal_size,)).fetchone()
+        if overflow is not None:
+            connection.execute("DELETE FROM changes WHERE id <= ?", (overflow[0],))
+            connection.execute(_SET_JOURNAL_FLOOR, (overflow[1],))
+
+    def add_book(self, book: Book):
+        """
+        Adiciona um livro à biblioteca.
+
+        Raises:
+            ValueError: Se um livro com o mesmo ISBN já existir na biblioteca.
+        """
+        try:
+            with self._pool.connection() as connection, connection:
+                connection.execute(_INSERT, (book.isbn, book.key, book.title, book.author, int(book.read)))
+                self._record_changes(connection, [("add", book.key, book.isbn)])
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Livro com este ISBN já existe na biblioteca.") from None
+
+    def add_books(self, books, partial: bool = False) -> list[str]:
+        """
+        Adiciona vários livros em uma única transação, com um único incremento de
+        versão (veja BookManager.add_books). Por padrão, nenhum livro é adicionado se
+        algum ISBN for repetido; com `partial`, os ISBNs já gravados são consultados
+        em blocos dentro da mesma transação (BEGIN IMMEDIATE) e os livros repetidos
+        são recusados.
+
+        Raises:
+            ValueError: Se algum ISBN se repetir no lote ou já existir na biblioteca
+                        e `partial` for False.
+        """
+        books = list(books)
+        results = ["added"] * len(books)
+        try:
+            with self._pool.connection() as connection, connection:
+                if partial:
+                    connection.execute("BEGIN IMMEDIATE")
+                    existing = self._keys_in(connection, list({book.key for book in books}))
+                    accepted = []
+                    for position, book in enumerate(books):
+                        if book.key in existing:
+                            results[position] = "already_exists"
+                        else:
+                            existing.add(book.key)
+                            accepted.append(book)
+                    books = accepted
+                connection.executemany(
+                    _INSERT, ((book.isbn, book.key, book.title, book.author, int(book.read)) for book in books))
+                if books:
+                    self._record_changes(connection, [("add", book.key, book.isbn) for book in books])
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Livro com este ISBN já existe na biblioteca.") from None
+        return results
+
+    def changes_since(self, version: int) -> list[tuple[str, Book | str]] | None:
+        """
+        Retorna as mudanças feitas depois da versão informada, consolidadas por livro
+        (veja BookManager.changes_since), a partir da tabela de mudanças. O journal e
+        os livros são lidos na mesma transação, então refletem um único estado do banco.
+        """
+        with self._pool.connection() as connection, connection:
+            connection.execute("BEGIN")
+            current = connection.execute(_VERSION).fetchone()[0]
+            if version < connection.execute(_JOURNAL_FLOOR).fetchone()[0] or version > current:
+                return None
+            entries = connection.execute(_SELECT_CHANGES, (version,)).fetchall()
+            keys = list({entry[2] for entry in entries})
+            books = {}
+            for start in range(0, len(keys), _MAX_PARAMETERS):
+                chunk = keys[start:start + _MAX_PARAMETERS]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT title, author, isbn, read, isbn_key FROM books WHERE isbn_key IN ({placeholders})", chunk)
+                books.update((row[4], _row_to_book(row)) for row in rows)
+        return consolidate_changes(entries, books.get)
+
+    def iter_books(self, after: int | None = None):
+        """
+        Gera tuplas (seq, Book) na ordem de inserção (veja BookManager.iter_books).
+        O seq é o id da linha; as linhas são buscadas em páginas pelo índice da chave
+        primária, sem manter uma conexão emprestada entre uma página e outra.
+        """
+        last_id = 0 if after is None else after
+        while True:
+            with self._pool.connection() as connection:
+                rows = connection.execute(_SELECT_AFTER, (last_id, _FETCH_SIZE)).fetchall()
+            for row in rows:
+                yield row[0], _row_to_book(row[1:])
+            if len(rows) < _FETCH_SIZE:
+                return
+            last_id = rows[-1][0]
+
+    def books_page(self, cursor: int | None = None,
+                   limit: int = DEFAULT_PAGE_SIZE) -> tuple[list[Book], int | None]:
+        """
+        Retorna uma página de livros na ordem de inserção (veja BookManager.books_page).
+        """
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"O limite da página deve estar entre 1 e {MAX_PAGE_SIZE}.")
+        with self._pool.connection() as connection:
+            rows = connection.execute(_SELECT_AFTER, (cursor or 0, limit + 1)).fetchall()
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [_row_to_book(row[1:]) for row in rows[:limit]], next_cursor
+
+    def list_books(self) -> list[Book]:
+        """
+        Retorna uma lista de todos os livros na biblioteca, na ordem de inserção.
+        """
+        with self._pool.connection() as connection:
+            return [_row_to_book(row) for row in connection.execute(_SELECT_ALL)]
+
+    def mark_as_read(self, isbn: str):
+        """
+        Marca um livro como lido, dado o seu ISBN.
+
+        Raises:
+            ValueError: Se o livro com o ISBN fornecido não for encontrado.
+        """
+        key = isbn_key(isbn) # None (ISBN inválido) não casa com nenhuma linha
+        with self._pool.connection() as connection, connection:
+            marked = connection.execute(_MARK_AS_READ_RETURNING, (key,)).fetchone()
+            if marked is not None:
+                self._record_changes(connection, [("read", key, marked[0])])
+            elif connection.execute(_EXISTS, (key,)).fetchone() is None:
+                raise ValueError(f"Livro com ISBN '{isbn}' não encontrado.")
+
+    def remove_book(self, isbn: str):
+        """
+        Remove um livro da biblioteca, dado o seu ISBN.
+
+        Raises:
+            ValueError: Se o livro com o ISBN fornecido não for encontrado.
+        """
+        key = isbn_key(isbn)
+        with self._pool.connection() as connection, connection:
+            removed = connection.execute(_DELETE_RETURNING, (key,)).fetchone()
+            if removed is None:
+                raise ValueError(f"Livro com ISBN '{isbn}' não encontrado para remoção.")
+            self._record_changes(connection, [("remove", key, removed[0])])
+
+    def _apply_many(self, isbns, partial: bool, removal: bool) -> dict[str, str]:
+        """
+        Aplica uma operação em lote em uma única transação (BEGIN IMMEDIATE, que
+        bloqueia outros escritores entre a verificação e a escrita): consulta o estado
+        dos livros em blocos e aplica todas as alterações com um único executemany.
+        """
+        keys = {isbn: isbn_key(isbn) for isbn in isbns}
+        lookup = [key for key in set(keys.values()) if key is not None]
+        with self._pool.connection() as connection, connection:
+            connection.execute("BEGIN IMMEDIATE")
+            read_of = {}
+            stored_isbn = {}
+            for start in range(0, len(lookup), _MAX_PARAMETERS):
+                chunk = lookup[start:start + _MAX_PARAMETERS]
+                placeholders = ", ".join("?" * len(chunk))
+                for key, read, isbn in connection.execute(
+                        f"SELECT isbn_key, read, isbn FROM books WHERE isbn_key IN ({placeholders})", chunk):
+                    read_of[key] = read
+                    stored_isbn[key] = isbn
+            missing = [isbn for isbn, key in keys.items() if key not in read_of]
+            if missing and not partial:
+                raise ValueError(not_found_message(missing, removal))
+            results = {}
+            changed = set()
+            for isbn, key in keys.items():
+                if key not in read_of:
+                    results[isbn] = "not_found"
+                elif removal:
+                    results[isbn] = "removed"
+                    changed.add(key)
+                elif read_of[key] or key in changed:
+                    results[isbn] = "already_read"
+                else:
+                    results[isbn] = "marked"
+                    changed.add(key)
+            connection.executemany(_DELETE if removal else _MARK_AS_READ, ((key,) for key in changed))
+            if changed:
+                operation = "remove" if removal else "read"
+                self._record_changes(connection, [(operation, key, stored_isbn[key]) for key in changed])
+        return results
+
+    def mark_many_as_read(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Marca vários livros como lidos em uma única transação
+        (veja BookManager.mark_many_as_read).
+        """
+        return self._apply_many(isbns, partial, removal=False)
+
+    def remove_many(self, isbns, partial: bool = False) -> dict[str, str]:
+        """
+        Remove vários livros em uma única transação (veja BookManager.remove_many).
+        """
+        return self._apply_many(isbns, partial, removal=True)
+
+    def search_books(self, query: str, limit: int | None = None, fuzzy: bool = False) -> list[Book]:
+        """
+        Busca livros cujo título ou autor contenham todos os termos da consulta,
+        ou cujo ISBN comece com ela. Diferente do BookManager em memória, a busca
+        percorre a tabela (LIKE) e não ignora acentos. Com `fuzzy`, usa fuzzy_matches.
+        """
+        terms = query.split()
+        if not terms:
+            books = self.list_books()
+            return books if limit is None else books[:limit]
+        if fuzzy:
+            return [book for _, book in self.fuzzy_matches(query, limit)]
+        conditions = " AND ".join("(title LIKE ? OR author LIKE ?)" for _ in terms)
+        parameters = [f"%{term}%" for term in terms for _ in range(2)]
+        sql = (f"SELECT title, author, isbn, read FROM books "
+               f"WHERE ({conditions}) OR isbn LIKE ? ORDER BY title, isbn")
+        parameters.append(f"{query.strip()}%")
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        with self._pool.connection() as connection:
+            return [_row_to_book(row) for row in connection.execute(sql, parameters)]
+
+    def fuzzy_matches(self, query: str, limit: int | None = None) -> list[tuple[float, Book]]:
+        """
+        Busca tolerante a erros de digitação, com a mesma pontuação do BookManager
+        (veja fuzzy_matches). Diferente dele, não há índice de trigramas: a tabela é
+        percorrida e cada token distinto é comparado uma única vez com cada termo,
+        sem o limite de tokens parecidos por termo.
+        """
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        similarities: dict[tuple[str, str], float] = {}
+        matches = []
+        with self._pool.connection() as connection:
+            rows = connection.execute("SELECT title, author, isbn, read, isbn_key FROM books ORDER BY id")
+            while batch := rows.fetchmany(_FETCH_SIZE):
+                for row in batch:
+                    tokens = set(tokenize(f"{row[0]} {row[1]}"))
+                    total = 0.0
+                    for term in terms:
+                        best = 0.0
+                        for token in tokens:
+                            pair = (term, token)
+                            score = similarities.get(pair)
+                            if score is None:
+                                score = similarities[pair] = token_similarity(term, token)
+                            best = max(best, score)
+                        total += best
+                    if total:
+                        matches.append((total / len(terms), row[4], row))
+        sort_key = lambda match: (-match[0], match[1])
+        matches = sorted(matches, key=sort_key) if limit is None else heapq.nsmallest(limit, matches, key=sort_key)
+        return [(score, _row_to_book(row)) for score, _, row in matches]
+
+    @staticmethod
+    def _filter_condition(author: str | None, read: bool | None) -> tuple[str, list]:
+        """
+        Monta a condição SQL (e os parâmetros) dos filtros por autor e status de leitura.
+        """
+        require_criteria(author, read)
+        conditions, parameters = [], []
+        if author is not None:
+            conditions.append("author = ? COLLATE NOCASE")
+            parameters.append(" ".join(author.split()))
+        if read is not None:
+            conditions.append("read = ?")
+            parameters.append(int(read))
+        return " AND ".join(conditions), parameters
+
+    def filter_books(self, author: str | None = None, read: bool | None = None,
+                     limit: int | None = None) -> list[Book]:
+        """
+        Retorna os livros de um autor e/ou com um status de leitura, na ordem de
+        inserção, pelos índices de autor e de leitura do banco. Diferente do
+        BookManager em memória, o autor é comparado sem diferenciar maiúsculas
+        apenas em ASCII e sem ignorar acentos.
+        """
+        condition, parameters = self._filter_condition(author, read)
+        sql = f"SELECT title, author, isbn, read FROM books WHERE {condition} ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        with self._pool.connection() as connection:
+            return [_row_to_book(row) for row in connection.execute(sql, parameters)]
+
+    def count_books(self, author: str | None = None, read: bool | None = None) -> int:
+        """
+        Retorna a quantidade de livros de um autor e/ou com um status de leitura,
+        contada pelo índice correspondente (veja filter_books).
+        """
+        condition, parameters = self._filter_condition(author, read)
+        with self._pool.connection() as connection:
+            return connection.execute(f"SELECT COUNT(*) FROM books WHERE {condition}", parameters).fetchone()[0]
+
+    def sorted_page(self, by: str = "title", cursor: tuple | None = None,
+                    limit: int = DEFAULT_PAGE_SIZE, start: str | None = None,
+                    stop: str | None = None) -> tuple[list[Book], tuple | None]:
+        """
+        Retorna uma página de livros ordenados por título ou por autor (veja
+        BookManager.sorted_page), percorrendo os índices idx_books_title e
+        idx_books_author_title a partir do cursor. Diferente do BookManager em
+        memória, a ordem não diferencia maiúsculas apenas em ASCII e não ignora
+        acentos, e o cursor guarda os valores das colunas como estão no banco.
+        """
+        fields = sort_fields(by)
+        if cursor is not None:
+            cursor = check_cursor(cursor, fields)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"O limite da página deve estar entre 1 e {MAX_PAGE_SIZE}.")
+        order = ", ".join(f"{field} COLLATE NOCASE" for field in fields) + ", isbn_key"
+        conditions, parameters = [], []
+        if start is not None:
+            conditions.append(f"{fields[0]} >= ? COLLATE NOCASE")
+            parameters.append(start)
+        if stop is not None:
+            conditions.append(f"{fields[0]} < ? COLLATE NOCASE")
+            parameters.append(stop)
+        if cursor is not None:
+            # A primeira condição permite ao SQLite saltar até o cursor no índice.
+            conditions.append(f"{fields[0]} >= ? COLLATE NOCASE")
+            conditions.append(f"({order}) > ({', '.join('?' * len(cursor))})")
+            parameters.append(cursor[0])
+            parameters.extend(cursor)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        sql = f"SELECT title, author, isbn, read, isbn_key FROM books {where}ORDER BY {order} LIMIT ?"
+        parameters.append(limit + 1)
+        with self._pool.connection() as connection:
+            rows = connection.execute(sql, parameters).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = (*(last[_SORTED_COLUMNS[field]] for field in fields), last[4])
+        return [_row_to_book(row) for row in rows[:limit]], next_cursor
+
+    @staticmethod
+    def _keys_in(connection: sqlite3.Connection, keys: list[int]) -> set[int]:
+        """
+        Retorna quais das chaves de ISBN informadas já estão no banco, consultando em blocos.
+        """
+        existing = set()
+        for start in range(0, len(keys), _MAX_PARAMETERS):
+            chunk = keys[start:start + _MAX_PARAMETERS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = connection.execute(f"SELECT isbn_key FROM books WHERE isbn_key IN ({placeholders})", chunk)
+            existing.update(row[0] for row in rows)
+        return existing
+
+    def _existing_keys(self, keys: list[int]) -> set[int]:
+        """
+        Retorna quais das chaves de ISBN informadas já estão no banco (veja _keys_in).
+        """
+        with self._pool.connection() as connection:
+            return self._keys_in(connection, keys)
+
+    def import_books(self, rows, batch_size: int = DEFAULT_BATCH_SIZE,
+                     max_errors: int = DEFAULT_MAX_ERRORS) -> ImportReport:
+        """
+        Importa livros em massa (veja BookManager.import_books).
+        Cada lote é gravado com um único executemany dentro de uma transação.
+        """
+        report = ImportReport(max_errors)
+        for accepted in validated_batches(rows, batch_size, report, self._existing_keys):
+            with self._pool.connection() as connection, connection:
+                connection.executemany(
+                    _INSERT,
+                    ((book.isbn, book.key, book.title, book.author, int(book.read)) for book in accepted.values()),
+                )
+                if accepted:
+                    self._record_changes(connection, [("add", key, book.isbn) for key, book in accepted.items()])
+            report.imported += len(accepted)
+        return report
+
+    def import_csv(self, path, batch_size: int = DEFAULT_BATCH_SIZE,
+                   max_errors: int = DEFAULT_MAX_ERRORS) -> ImportReport:
+        """
+        Importa livros de um arquivo CSV (veja BookManager.import_csv).
+        """
+        return self.import_books(read_csv_rows(path), batch_size, max_errors)
+
+    def import_jsonl(self, path, batch_size: int = DEFAULT_BATCH_SIZE,
+                     max_errors: int = DEFAULT_MAX_ERRORS) -> ImportReport:
+        """
+        Importa livros de um arquivo JSON Lines (veja BookManager.import_jsonl).
+        """
+        return self.import_books(read_jsonl_rows(path), batch_size, max_errors)
+
+    def export_csv(self, path) -> int:
+        """
+        Exporta todos os livros para um arquivo CSV, sem carregá-los todos em memória.
+        """
+        return write_csv(path, (book for _, book in self.iter_books()))
+
+    def export_jsonl(self, path) -> int:
+        """
+        Exporta todos os livros para um arquivo JSON Lines, sem carregá-los todos em memória.
+        """
+        return write_jsonl(path, (book for _, book in self.iter_books()))
+
+    def close(self):
+        """
+        Fecha as conexões do banco.
+        """
+        self._pool.close()
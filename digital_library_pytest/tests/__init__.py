@@ -0,0 +1,11 @@
+# digital_library_pytest/tests/__init__.py
+
+
+def make_isbn(number: int) -> str:
+    """
+    Gera um ISBN-13 válido (prefixo 978 e dígito verificador correto) a partir de um
+    número de até nove dígitos, para testes que precisam de muitos livros distintos.
+    """
+    body = f"978{number:09d}"
+    total = sum(int(digit) * (3 if position % 2 else 1) for position, digit in enumerate(body))
+    return f"{body}{(10 - total % 10) % 10}"
@@ -0,0 +1,297 @@
+# digital_library_pytest/tests/test_api_logic.py
+
+import json
+
+import pytest
+from digital_library_pytest import api_logic
+from digital_library_pytest.book import Book
+from digital_library_pytest.book_manager import BookManager
+from digital_library_pytest.persistence import write_snapshot
+
+
+@pytest.fixture
+def api_manager(monkeypatch):
+    """Fixture que substitui o gerenciador global da API por um novo BookManager com dois livros."""
+    manager = BookManager()
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225028"))
+    manager.add_book(Book("Clean Code", "Robert C. Martin", "978-0132350884"))
+    monkeypatch.setattr(api_logic, "library_manager", manager)
+    return manager
+
+
+def test_get_all_books_api_returns_dicts_in_order(api_manager):
+    """
+    RF002: Testa se a API lista os livros como dicionários, na ordem de inserção.
+    """
+    # Act
+    response = api_logic.get_all_books_api()
+
+    # Assert
+    assert response["success"] is True
+    assert response["books"] == [
+        {"title": "Python Fluente", "author": "Luciano Ramalho", "isbn": "978-8575225028", "read": False},
+        {"title": "Clean Code", "author": "Robert C. Martin", "isbn": "978-0132350884", "read": False},
+    ]
+
+
+def test_search_books_api(api_manager):
+    """
+    RF005: Testa se a API de busca retorna apenas os livros correspondentes.
+    """
+    # Act
+    response = api_logic.search_books_api("martin")
+
+    # Assert
+    assert response["success"] is True
+    assert [book["isbn"] for book in response["books"]] == ["978-0132350884"]
+
+
+def test_get_books_page_api_and_stream(api_manager):
+    """
+    RF002: Testa a listagem paginada e em streaming da API.
+    """
+    # Act
+    first = api_logic.get_books_page_api(limit=1)
+    second = api_logic.get_books_page_api(first["next_cursor"], limit=1)
+
+    # Assert
+    assert [book["isbn"] for book in first["books"]] == ["978-8575225028"]
+    assert [book["isbn"] for book in second["books"]] == ["978-0132350884"]
+    assert second["next_cursor"] is None
+    assert list(api_logic.stream_books_api()) == api_logic.get_all_books_api()["books"]
+
+
+def test_filter_and_count_books_api(api_manager):
+    """
+    Testa os endpoints de filtro e contagem por autor e status de leitura.
+    """
+    # Arrange
+    api_logic.mark_book_as_read_api("978-0132350884")
+
+    # Act & Assert
+    assert [book["isbn"] for book in api_logic.filter_books_api(read=False)["books"]] == ["978-8575225028"]
+    assert api_logic.filter_books_api(author="luciano ramalho")["books"][0]["title"] == "Python Fluente"
+    assert api_logic.count_books_api(read=True) == {"success": True, "count": 1}
+    with pytest.raises(ValueError):
+        api_logic.count_books_api()
+
+
+def test_get_all_books_api_conditional_read(api_manager):
+    """
+    Testa a leitura condicional: a mesma versão retorna "not_modified" sem livros,
+    e qualquer mutação muda a versão e invalida o cache.
+    """
+    # Arrange
+    first = api_logic.get_all_books_api()
+
+    # Act & Assert: Sem mudanças, a versão informada pelo cliente ainda vale.
+    assert api_logic.get_all_books_api(if_none_match=first["version"]) == {
+        "success": True, "not_modified": True, "version": first["version"]
+    }
+
+    # Act & Assert: Uma marcação muda a versão e a lista volta atualizada.
+    api_logic.mark_book_as_read_api("978-0132350884")
+    second = api_logic.get_all_books_api(if_none_match=first["version"])
+    assert second["version"] > first["version"]
+    assert second["books"][1]["read"] is True
+
+
+
+def test_get_all_books_api_skips_cache_when_version_changes_while_listing(api_manager, monkeypatch):
+    """
+    Testa se uma lista montada depois de uma mutação concluída após a leitura da
+    versão não fica em cache sob essa versão (a lista estaria à frente dela).
+    """
+    # Arrange: A marcação termina entre a leitura da versão e a da lista.
+    list_books = api_manager.list_books
+    def mark_then_list():
+        api_manager.mark_as_read("978-8575225028")
+        return list_books()
+    monkeypatch.setattr(api_manager, "list_books", mark_then_list)
+
+    # Act
+    response = api_logic.get_all_books_api()
+
+    # Assert: A resposta traz a marcação, mas o cache não a associa à versão antiga.
+    assert response["books"][0]["read"] is True
+    assert response["version"] < api_manager.version
+    assert api_logic._list_cache["version"] != response["version"]
+
+@pytest.fixture
+def uninitialized_api(monkeypatch):
+    """Fixture que volta a API ao estado de antes do primeiro uso, com o gerenciador em memória."""
+    for env in (api_logic.DATABASE_ENV, api_logic.DATA_DIR_ENV, api_logic.SHARDS_ENV,
+                api_logic.PROCESSES_ENV, api_logic.COMPACT_ENV, api_logic.SNAPSHOT_ENV):
+        monkeypatch.delenv(env, raising=False)
+    monkeypatch.setattr(api_logic, "library_manager", None)
+
+
+def test_library_is_created_and_seeded_on_first_use(uninitialized_api):
+    """
+    Testa se a biblioteca global só é criada (e semeada) no primeiro uso da API.
+    """
+    # Assert: Nada foi criado ainda.
+    assert api_logic.library_manager is None
+
+    # Act
+    response = api_logic.get_all_books_api()
+
+    # Assert
+    assert api_logic.library_manager is not None
+    assert [book["title"] for book in response["books"]] == [
+        "A Revolução dos Bichos", "1984", "Admirável Mundo Novo", "O Senhor dos Anéis"
+    ]
+
+
+def test_warm_up_loads_snapshot_instead_of_seeding(uninitialized_api, monkeypatch, tmp_path):
+    """
+    Testa se warm_up carrega o snapshot configurado no lugar dos livros de exemplo
+    e deixa a listagem pronta em cache.
+    """
+    # Arrange
+    path = tmp_path / "catalog.snapshot"
+    read_book = Book("Duna", "Frank Herbert", "978-0441172719")
+    read_book.mark_as_read()
+    write_snapshot(path, [Book("Clean Code", "Robert C. Martin", "978-0132350884"), read_book], last_seq=0)
+    monkeypatch.setenv(api_logic.SNAPSHOT_ENV, str(path))
+
+    # Act
+    loaded = api_logic.warm_up()
+
+    # Assert
+    assert loaded == 2
+    manager = api_logic.library_manager
+    assert api_logic._list_cache["manager"] is manager
+    assert api_logic.get_all_books_api()["books"] == [
+        {"title": "Clean Code", "author": "Robert C. Martin", "isbn": "978-0132350884", "read": False},
+        {"title": "Duna", "author": "Frank Herbert", "isbn": "978-0441172719", "read": True},
+    ]
+
+
+def test_get_changes_since_api(api_manager):
+    """
+    Testa a sincronização incremental: só as mudanças desde a versão do cliente,
+    ou um pedido de ressincronização quando a versão não é mais coberta.
+    """
+    # Arrange
+    version = api_logic.get_all_books_api()["version"]
+    api_logic.add_book_api("Duna", "Frank Herbert", "978-0441172719")
+    api_logic.remove_book_api("978-8575225028")
+
+    # Act
+    response = api_logic.get_changes_since_api(version)
+
+    # Assert
+    assert response["changes"] == [
+        {"op": "add", "book": {"title": "Duna", "author": "Frank Herbert", "isbn": "978-0441172719", "read": False}},
+        {"op": "remove", "isbn": "978-8575225028"},
+    ]
+    assert api_logic.get_changes_since_api(response["version"])["changes"] == []
+    assert api_logic.get_changes_since_api(response["version"] + 10)["resync"] is True
+
+
+def test_batch_mutation_apis(api_manager):
+    """
+    Testa as APIs de marcação e remoção em lote, com resultado por ISBN.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError, match="não encontrados; nenhuma alteração foi feita."):
+        api_logic.mark_many_as_read_api(["978-8575225028", "999-9999999999"])
+
+    assert api_logic.mark_many_as_read_api(["978-8575225028", "978-0132350884"])["results"] == {
+        "978-8575225028": "marked", "978-0132350884": "marked"
+    }
+    assert api_logic.remove_many_api(["978-8575225028", "999-9999999999"], partial=True)["results"] == {
+        "978-8575225028": "removed", "999-9999999999": "not_found"
+    }
+    assert [book["isbn"] for book in api_logic.get_all_books_api()["books"]] == ["978-0132350884"]
+
+
+def test_add_books_api_rejects_existing_isbns(api_manager):
+    """
+    Testa a inclusão em lote usada pela API assíncrona: os ISBNs já existentes ou
+    repetidos no lote são recusados e os demais livros são adicionados.
+    """
+    # Act
+    results = api_logic._add_books_api([
+        Book("Duna", "Frank Herbert", "978-0441172719"),
+        Book("Clean Code", "Robert C. Martin", "978-0132350884"),
+        Book("Duna de novo", "Frank Herbert", "978-0441172719"),
+    ])
+
+    # Assert
+    assert results == ["added", "already_exists", "already_exists"]
+    assert len(api_manager) == 3
+
+
+def test_get_sorted_books_api(api_manager):
+    """
+    Testa a listagem ordenada por título via API, com cursor serializável.
+    """
+    # Act
+    first = api_logic.get_sorted_books_api("title", limit=1)
+    second = api_logic.get_sorted_books_api("title", first["next_cursor"], limit=1)
+
+    # Assert
+    assert [book["title"] for book in first["books"] + second["books"]] == ["Clean Code", "Python Fluente"]
+    assert isinstance(first["next_cursor"], list)
+    assert second["next_cursor"] is None
+
+
+def test_search_books_api_fuzzy(api_manager):
+    """
+    RF005: Testa a busca via API com tolerância a erros de digitação.
+    """
+    # Act
+    exact = api_logic.search_books_api("martn")
+    fuzzy = api_logic.search_books_api("martn", fuzzy=True)
+
+    # Assert
+    assert exact["books"] == []
+    assert [book["isbn"] for book in fuzzy["books"]] == ["978-0132350884"]
+
+
+def test_json_apis_match_dict_apis(api_manager):
+    """
+    Testa se as respostas pré-serializadas equivalem às versões em dicionário e
+    acompanham inclusões e marcações.
+    """
+    # Act
+    added = json.loads(api_logic.add_book_json_api("Duna", "Frank Herbert", "978-0441172719"))
+    api_logic.get_all_books_json_api() # Monta o cache antes da marcação
+    api_logic.mark_book_as_read_api("978-0132350884")
+    listed = json.loads(api_logic.get_all_books_json_api())
+    page = json.loads(api_logic.get_books_page_json_api(limit=2))
+
+    # Assert
+    assert added == {"success": True, "book": api_logic.get_all_books_api()["books"][-1]}
+    assert listed == api_logic.get_all_books_api()
+    assert listed["books"][1]["read"] is True
+    assert page == api_logic.get_books_page_api(limit=2)
+    assert json.loads(api_logic.get_all_books_json_api(listed["version"])) == {
+        "success": True, "not_modified": True, "version": listed["version"]
+    }
+
+
+def test_library_in_worker_processes(uninitialized_api, monkeypatch):
+    """
+    Testa a API sobre a biblioteca particionada entre processos.
+    """
+    # Arrange
+    monkeypatch.setenv(api_logic.PROCESSES_ENV, "2")
+
+    # Act
+    listed = api_logic.get_all_books_api()
+    api_logic.mark_book_as_read_api("978-85-359-1484-9")
+    found = api_logic.search_books_api("orwell")
+
+    # Assert
+    manager = api_logic.library_manager
+    try:
+        assert len(listed["books"]) == 4
+        assert [(book["title"], book["read"]) for book in found["books"]] == [
+            ("1984", True), ("A Revolução dos Bichos", False)
+        ]
+        assert api_logic.count_books_api(read=True)["count"] == 1
+    finally:
+        manager.close()
@@ -0,0 +1,190 @@
+# digital_library_pytest/tests/test_async_api.py
+
+import asyncio
+import time
+
+import pytest
+from digital_library_pytest import api_logic, async_api
+from digital_library_pytest.book import Book
+from digital_library_pytest.book_manager import BookManager
+from digital_library_pytest.tests import make_isbn
+
+
+@pytest.fixture
+def api_manager(monkeypatch):
+    """Fixture que substitui o gerenciador global da API por um novo BookManager com um livro."""
+    manager = BookManager()
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225028"))
+    monkeypatch.setattr(api_logic, "library_manager", manager)
+    return manager
+
+
+def test_concurrent_identical_reads_are_coalesced(api_manager, monkeypatch):
+    """
+    Testa se leituras idênticas simultâneas executam a função síncrona uma única vez.
+    """
+    # Arrange: Conta as execuções reais da listagem.
+    calls = []
+    original = api_logic.get_all_books_api
+
+    def counting_get_all_books_api(if_none_match=None):
+        calls.append(if_none_match)
+        return original(if_none_match)
+
+    counting_get_all_books_api.__name__ = original.__name__
+    monkeypatch.setattr(api_logic, "get_all_books_api", counting_get_all_books_api)
+
+    async def scenario():
+        return await asyncio.gather(*(async_api.get_all_books_async() for _ in range(20)))
+
+    # Act
+    responses = asyncio.run(scenario())
+
+    # Assert
+    assert len(calls) == 1
+    assert all(response["books"][0]["isbn"] == "978-8575225028" for response in responses)
+    assert responses[0] is not responses[1] and responses[0]["books"] is not responses[1]["books"]
+
+
+def test_write_bursts_are_batched_in_order(api_manager, monkeypatch):
+    """
+    Testa se uma rajada de escritas é aplicada em um único lote, na ordem de
+    chegada, com o erro de uma operação entregue apenas ao seu chamador.
+    """
+    # Arrange: Conta os lotes executados.
+    batches = []
+    original = async_api._run_batch
+
+    def counting_run_batch(operations):
+        batches.append(len(operations))
+        return original(operations)
+
+    monkeypatch.setattr(async_api, "_run_batch", counting_run_batch)
+
+    async def scenario():
+        return await asyncio.gather(
+            async_api.add_book_async("Duna", "Frank Herbert", "978-0441172719"),
+            async_api.mark_book_as_read_async("978-0441172719"),
+            async_api.add_book_async("Duplicado", "Autor", "978-8575225028"),
+            async_api.remove_book_async("978-8575225028"),
+            return_exceptions=True,
+        )
+
+    # Act
+    results = asyncio.run(scenario())
+
+    # Assert
+    assert batches == [4]
+    assert results[0]["success"] is True
+    assert results[1]["success"] is True
+    assert isinstance(results[2], ValueError)
+    assert results[3]["success"] is True
+    assert [repr(book) for book in api_manager.list_books()] == [
+        "Book(title='Duna', author='Frank Herbert', isbn='978-0441172719', read=True)"
+    ]
+
+
+def test_read_after_write_sees_the_write(api_manager):
+    """
+    Testa se uma leitura feita após uma escrita concluída enxerga essa escrita.
+    """
+    async def scenario():
+        await async_api.add_book_async("Duna", "Frank Herbert", "978-0441172719")
+        return await async_api.get_all_books_async()
+
+    # Act
+    response = asyncio.run(scenario())
+
+    # Assert
+    assert [book["isbn"] for book in response["books"]] == ["978-8575225028", "978-0441172719"]
+
+
+def test_reads_and_writes_never_run_at_the_same_time(api_manager, monkeypatch):
+    """
+    Testa se leituras e lotes de escrita são executados um de cada vez, já que o
+    BookManager não é seguro para threads.
+    """
+    # Arrange: Mede quantas chamadas ao gerenciador ficam ativas ao mesmo tempo.
+    active, peak = [0], [0]
+
+    def tracked(function):
+        def wrapper(*args, **kwargs):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            time.sleep(0.001)
+            try:
+                return function(*args, **kwargs)
+            finally:
+                active[0] -= 1
+        wrapper.__name__ = function.__name__
+        return wrapper
+
+    for name in ("search_books_api", "get_all_books_api", "_add_books_api", "remove_many_api"):
+        monkeypatch.setattr(api_logic, name, tracked(getattr(api_logic, name)))
+
+    async def scenario():
+        calls = []
+        for index in range(20):
+            isbn = make_isbn(index)
+            calls.append(async_api.add_book_async(f"Livro {index}", "Autor", isbn))
+            calls.append(async_api.search_books_async(f"livro {index}"))
+            calls.append(async_api.get_all_books_async())
+            if index % 2:
+                calls.append(async_api.remove_book_async(isbn))
+        await asyncio.gather(*calls)
+
+    # Act
+    asyncio.run(scenario())
+
+    # Assert
+    assert peak[0] == 1
+    assert len(api_manager.search_books("livro")) == 10
+
+
+def test_write_burst_bumps_version_once_per_kind(api_manager):
+    """
+    Testa se escritas consecutivas do mesmo tipo viram uma única operação em
+    lote do gerenciador, com um único incremento de versão.
+    """
+    # Arrange
+    version = api_manager.version
+
+    async def scenario():
+        adds = [async_api.add_book_async(f"Livro {index}", "Autor", make_isbn(index)) for index in range(5)]
+        marks = [async_api.mark_book_as_read_async(make_isbn(index)) for index in range(3)]
+        removes = [async_api.remove_book_async(make_isbn(4)), async_api.remove_book_async(make_isbn(4))]
+        return await asyncio.gather(*adds, *marks, *removes, return_exceptions=True)
+
+    # Act
+    results = asyncio.run(scenario())
+
+    # Assert
+    assert api_manager.version == version + 3
+    assert all(result["success"] for result in results[:9])
+    assert isinstance(results[9], ValueError) # O livro já foi removido pela escrita anterior
+    assert api_manager.count_books(read=True) == 3
+
+
+def test_failed_batch_resolves_every_future(api_manager, monkeypatch):
+    """
+    Testa se uma falha na execução do lote chega a todos os chamadores, em vez
+    de deixá-los esperando para sempre.
+    """
+    # Arrange
+    def failing_run_batch(operations):
+        raise RuntimeError("thread da biblioteca indisponível")
+
+    monkeypatch.setattr(async_api, "_run_batch", failing_run_batch)
+
+    async def scenario():
+        return await asyncio.wait_for(asyncio.gather(
+            async_api.add_book_async("Duna", "Frank Herbert", "978-0441172719"),
+            async_api.remove_book_async("978-8575225028"),
+            return_exceptions=True,
+        ), timeout=5)
+
+    # Act
+    results = asyncio.run(scenario())
+
+    # Assert
+    assert all(isinstance(result, RuntimeError) for result in results)
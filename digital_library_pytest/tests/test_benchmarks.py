@@ -0,0 +1,121 @@
+# digital_library_pytest/tests/test_benchmarks.py
+#
+# Benchmarks dos caminhos críticos do BookManager e da api_logic.
+# Ficam fora da execução padrão (marcador slow_test); para rodá-los:
+#
+#     pytest -m slow_test
+#
+# Variáveis de ambiente:
+#     BENCH_SIZES     Tamanhos dos catálogos, separados por vírgula (padrão: 10000,100000,1000000).
+#     BENCH_RESULTS   Arquivo JSON onde os resultados são gravados (padrão: bench_results.json).
+#     BENCH_BASELINE  Arquivo JSON de uma execução anterior; o teste falha se alguma
+#                     medida piorar mais que BENCH_TOLERANCE (padrão: 0.5, ou seja, 50%).
+
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import pytest
+from digital_library_pytest import api_logic
+from digital_library_pytest.book import Book
+from digital_library_pytest.book_manager import BookManager
+from digital_library_pytest.tests import make_isbn
+
+SIZES = [int(size) for size in os.environ.get("BENCH_SIZES", "10000,100000,1000000").split(",")]
+RESULTS_PATH = os.environ.get("BENCH_RESULTS", "bench_results.json")
+BASELINE_PATH = os.environ.get("BENCH_BASELINE")
+TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", "0.5"))
+
+# Quantidade de operações pontuais (add, mark, remove, busca) medidas por catálogo.
+POINT_OPERATIONS = 1_000
+
+_AUTHORS = ["George Orwell", "Aldous Huxley", "J.R.R. Tolkien", "Machado de Assis",
+            "Clarice Lispector", "Jorge Amado", "Cecília Meireles", "Graciliano Ramos"]
+_WORDS = ["livro", "noite", "memórias", "sertão", "cidade", "mar", "vidas", "secas",
+          "capitães", "areia", "hora", "estrela", "dom", "casmurro", "brás", "cubas"]
+
+
+def synthetic_rows(size: int, start: int = 0):
+    """Gera linhas sintéticas (número_da_linha, campos) no formato de import_books."""
+    for index in range(start, start + size):
+        title = f"{_WORDS[index % 16]} {_WORDS[(index // 16) % 16]} {index}"
+        yield index, (title, _AUTHORS[index % len(_AUTHORS)], make_isbn(index), "")
+
+
+def _timed(function, *args):
+    """Executa a função e retorna (resultado, segundos)."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+@pytest.fixture(scope="module")
+def results():
+    """Fixture que acumula os resultados e os grava (e compara com a linha de base) ao final."""
+    collected = {}
+    yield collected
+    document = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": collected,
+    }
+    with open(RESULTS_PATH, "w", encoding="utf-8") as handle:
+        json.dump(document, handle, indent=2)
+
+
+@pytest.mark.slow_test
+@pytest.mark.parametrize("size", SIZES)
+def test_benchmark_hot_paths(size, results, monkeypatch):
+    """
+    Mede o tempo das operações principais e o pico de memória da carga em massa
+    para um catálogo sintético de `size` livros.
+    """
+    metrics = {}
+
+    # Carga em massa, com o pico de memória medido pelo tracemalloc.
+    tracemalloc.start()
+    manager = BookManager()
+    start = time.perf_counter()
+    manager.import_books(synthetic_rows(size))
+    metrics["bulk_load_s"] = time.perf_counter() - start
+    metrics["bulk_load_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert len(manager) == size
+
+    # Operações pontuais: tempo médio por operação.
+    new_books = [Book(*fields[:3]) for _, fields in synthetic_rows(POINT_OPERATIONS, start=size)]
+    _, elapsed = _timed(lambda: [manager.add_book(book) for book in new_books])
+    metrics["add_book_avg_s"] = elapsed / POINT_OPERATIONS
+
+    isbns = [book.isbn for book in new_books]
+    _, elapsed = _timed(lambda: [manager.mark_as_read(isbn) for isbn in isbns])
+    metrics["mark_as_read_avg_s"] = elapsed / POINT_OPERATIONS
+
+    _, metrics["list_books_s"] = _timed(manager.list_books)
+
+    monkeypatch.setattr(api_logic, "library_manager", manager)
+    _, metrics["get_all_books_api_s"] = _timed(api_logic.get_all_books_api)
+
+    _, metrics["search_first_s"] = _timed(manager.search_books, "sertão")
+    queries = [_WORDS[index % 16] + " " + str(index) for index in range(POINT_OPERATIONS)]
+    _, elapsed = _timed(lambda: [manager.search_books(query, 20) for query in queries])
+    metrics["search_avg_s"] = elapsed / POINT_OPERATIONS
+
+    _, elapsed = _timed(lambda: [manager.remove_book(isbn) for isbn in isbns])
+    metrics["remove_book_avg_s"] = elapsed / POINT_OPERATIONS
+
+    results[str(size)] = metrics
+
+    if BASELINE_PATH:
+        with open(BASELINE_PATH, encoding="utf-8") as handle:
+            baseline = json.load(handle)["results"].get(str(size), {})
+        regressions = {
+            name: (baseline[name], value)
+            for name, value in metrics.items()
+            if name in baseline and value > baseline[name] * (1 + TOLERANCE)
+        }
+        assert not regressions, f"Regressões em relação à linha de base: {regressions}"
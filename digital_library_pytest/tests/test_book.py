@@ -1,7 +1,7 @@
 # digital_library_pytest/tests/test_book.py
 
 import pytest
-from digital_library_pytest.book import Book
+from digital_library_pytest.book import Book, isbn_key
 
 @pytest.mark.priority_high
 @pytest.mark.fast_test 
@@ -12,7 +12,7 @@ def test_book_creation_success():
     # Arrange: Dados de entrada para a criação do livro
     title = "O Senhor dos Anéis"
     author = "J.R.R. Tolkien"
-    isbn = "978-0618053267"
+    isbn = "978-0618053261"
 
     # Act: Criação do objeto Book
     book = Book(title, author, isbn)
@@ -31,7 +31,7 @@ def test_book_creation_with_empty_title_raises_error():
     # Arrange: Título vazio
     title = ""
     author = "Autor Teste"
-    isbn = "123-4567890123"
+    isbn = "123-4567890128"
 
     # Act & Assert: Tentar criar o livro e verificar se a exceção é levantada
     with pytest.raises(ValueError, match="O título do livro não pode ser vazio."):
@@ -45,7 +45,7 @@ def test_book_creation_with_empty_author_raises_error():
     # Arrange: Autor vazio
     title = "Título Teste"
     author = ""
-    isbn = "123-4567890123"
+    isbn = "123-4567890128"
 
     # Act & Assert: Tentar criar o livro e verificar se a exceção é levantada
     with pytest.raises(ValueError, match="O autor do livro não pode ser vazio."):
@@ -81,18 +81,36 @@ def test_mark_as_read():
     assert book.read is True # Deve ser True após ser marcada como lida
 
 
+def test_to_json_is_cached_until_marked_as_read():
+    """
+    Testa se o JSON do livro é guardado e descartado ao marcá-lo como lido.
+    """
+    # Arrange
+    book = Book("Memórias", "Machado", "978-0451524935")
+
+    # Act
+    first = book.to_json()
+    cached = book.to_json()
+    book.mark_as_read()
+
+    # Assert
+    assert cached is first
+    assert first == '{"title":"Memórias","author":"Machado","isbn":"978-0451524935","read":false}'.encode()
+    assert book.to_json().endswith(b'"read":true}')
+
+
 def test_book_str_representation():
     """
     Testa a representação em string do livro (__str__).
     """
     # Arrange: Cria livros com diferentes status de leitura
     book_unread = Book("Duna", "Frank Herbert", "978-0441172719")
-    book_read = Book("Fundação", "Isaac Asimov", "978-0553803717")
+    book_read = Book("Fundação", "Isaac Asimov", "978-0553803716")
     book_read.mark_as_read()
 
     # Act & Assert: Verifica as representações em string
     assert str(book_unread) == "Título: Duna | Autor: Frank Herbert | ISBN: 978-0441172719 | Status: Não Lido"
-    assert str(book_read) == "Título: Fundação | Autor: Isaac Asimov | ISBN: 978-0553803717 | Status: Lido"
+    assert str(book_read) == "Título: Fundação | Autor: Isaac Asimov | ISBN: 978-0553803716 | Status: Lido"
 
 
 def test_book_repr_representation():
@@ -131,10 +149,10 @@ def test_book_hash_function():
     Testa o método __hash__ e a capacidade de usar Book em conjuntos.
     """
     # Arrange: Cria dois livros com o MESMO ISBN (devem ser considerados iguais e ter o mesmo hash)
-    book1 = Book("O Pequeno Príncipe", "Antoine de Saint-Exupéry", "978-8578270690")
+    book1 = Book("O Pequeno Príncipe", "Antoine de Saint-Exupéry", "978-8578270698")
     # Este livro tem o MESMO ISBN que book1 para testar a igualdade e hash
-    book_same_isbn = Book("O Pequeno Príncipe (Outra Edição)", "Antoine de Saint-Exupéry", "978-8578270690")
-    book_different_isbn = Book("Dom Quixote", "Miguel de Cervantes", "978-8572322521") # ISBN diferente
+    book_same_isbn = Book("O Pequeno Príncipe (Outra Edição)", "Antoine de Saint-Exupéry", "978-8578270698")
+    book_different_isbn = Book("Dom Quixote", "Miguel de Cervantes", "978-8572322522") # ISBN diferente
 
     # Act: Calcula os hashes
     hash1 = hash(book1)
@@ -154,3 +172,45 @@ def test_book_hash_function():
     # book_same_isbn deve ser encontrado no set porque é considerado igual a book1 (pelo ISBN)
     assert book_same_isbn in book_set
 
+
+
+@pytest.mark.parametrize("isbn, expected_key", [
+    ("978-0132350884", 9780132350884),
+    ("978 0 13 235088 4", 9780132350884),
+    ("85-359-0277-5", 9788535902778), # ISBN-10 convertido para ISBN-13
+    ("080442957X", 9780804429573), # Dígito verificador X
+    ("978-0132350885", None), # Dígito verificador errado
+    ("85-359-0277-4", None),
+    ("978-013235088", None), # Comprimento inválido
+    ("isbn-0", None),
+    (9780132350884, None), # Não é um texto
+])
+def test_isbn_key_normalizes_and_validates(isbn, expected_key):
+    """
+    Testa a normalização de ISBN-10 e ISBN-13 e a validação do dígito verificador.
+    """
+    # Act & Assert
+    assert isbn_key(isbn) == expected_key
+
+
+def test_book_with_invalid_isbn_raises_error():
+    """
+    Testa se um ValueError é levantado ao criar um livro com ISBN inválido.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError, match="O ISBN '978-0132350885' é inválido."):
+        Book("Clean Code", "Robert C. Martin", "978-0132350885")
+
+
+def test_books_with_different_isbn_spellings_are_equal():
+    """
+    Testa se grafias diferentes do mesmo ISBN (hífens, ISBN-10) representam o mesmo livro.
+    """
+    # Arrange
+    isbn_10 = Book("Os Sertões", "Euclides da Cunha", "85-359-0277-5")
+    isbn_13 = Book("Os Sertões", "Euclides da Cunha", "9788535902778")
+
+    # Act & Assert
+    assert isbn_10 == isbn_13
+    assert hash(isbn_10) == hash(isbn_13)
+    assert isbn_10.isbn == "85-359-0277-5" # O ISBN informado é mantido para exibição
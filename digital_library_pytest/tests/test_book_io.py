@@ -0,0 +1,152 @@
+# digital_library_pytest/tests/test_book_io.py
+
+import json
+
+import pytest
+from digital_library_pytest.book import Book
+from digital_library_pytest.book_io import batched, parse_read_flag
+from digital_library_pytest.book_manager import BookManager
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Fixture que cria um CSV com linhas válidas, inválidas e duplicadas."""
+    path = tmp_path / "books.csv"
+    path.write_text(
+        "title,author,isbn,read\n"
+        "Python Fluente,Luciano Ramalho,978-8575225028,false\n"
+        ",Autor Sem Título,978-0000000001,false\n"
+        "Clean Code,Robert C. Martin,978-0132350884,true\n"
+        "Python Fluente (Duplicado),Luciano Ramalho,978-8575225028,false\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.mark.fast_test
+def test_import_csv_reports_errors_without_aborting(csv_file):
+    """
+    Testa se a importação de CSV importa as linhas válidas e registra as inválidas.
+    """
+    # Arrange
+    manager = BookManager()
+
+    # Act
+    report = manager.import_csv(csv_file, batch_size=2)
+
+    # Assert: Duas linhas importadas, uma inválida e uma duplicada.
+    assert report.imported == 2
+    assert report.error_count == 2
+    assert report.errors == [
+        (3, "O título do livro não pode ser vazio."),
+        (5, "Livro com este ISBN já existe na biblioteca."),
+    ]
+    books = manager.list_books()
+    assert [book.isbn for book in books] == ["978-8575225028", "978-0132350884"]
+    assert books[1].read is True
+
+
+def test_import_skips_isbns_already_in_library(csv_file):
+    """
+    Testa se a importação detecta duplicidade com livros já existentes na biblioteca.
+    """
+    # Arrange
+    manager = BookManager()
+    manager.add_book(Book("Clean Code", "Robert C. Martin", "978-0132350884"))
+
+    # Act
+    report = manager.import_csv(csv_file)
+
+    # Assert
+    assert report.imported == 1
+    assert (4, "Livro com este ISBN já existe na biblioteca.") in report.errors
+
+
+def test_import_jsonl_handles_malformed_lines(tmp_path):
+    """
+    Testa se linhas JSON inválidas são registradas como erro por linha.
+    """
+    # Arrange
+    path = tmp_path / "books.jsonl"
+    path.write_text(
+        json.dumps({"title": "Duna", "author": "Frank Herbert", "isbn": "978-0441172719"}) + "\n"
+        "{nao e json\n"
+        "\n"
+        '["lista"]\n'
+        + json.dumps({"title": "Fundação", "author": "Isaac Asimov", "isbn": 9780553803716}) + "\n"
+        + json.dumps({"title": ["Neuromancer"], "author": "William Gibson", "isbn": "978-0441569595"}) + "\n",
+        encoding="utf-8",
+    )
+    manager = BookManager()
+
+    # Act
+    report = manager.import_jsonl(path)
+
+    # Assert
+    assert report.imported == 1
+    assert report.errors == [
+        (2, "JSON inválido: Expecting property name enclosed in double quotes."),
+        (4, "Cada linha deve ser um objeto JSON."),
+        (5, "O campo 'isbn' deve ser um texto."),
+        (6, "O campo 'title' deve ser um texto."),
+    ]
+
+
+def test_export_and_import_round_trip(tmp_path):
+    """
+    Testa se exportar e reimportar (CSV e JSONL) preserva livros, ordem e status.
+    """
+    # Arrange
+    manager = BookManager()
+    manager.add_book(Book("Fundação", "Isaac Asimov", "978-0553803716"))
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    manager.mark_as_read("978-0441172719")
+
+    for name, export, import_ in (
+        ("books.csv", BookManager.export_csv, BookManager.import_csv),
+        ("books.jsonl", BookManager.export_jsonl, BookManager.import_jsonl),
+    ):
+        # Act
+        path = tmp_path / name
+        assert export(manager, path) == 2
+        restored = BookManager()
+        report = import_(restored, path)
+
+        # Assert
+        assert report.ok
+        assert [repr(book) for book in restored.list_books()] == [repr(book) for book in manager.list_books()]
+
+
+def test_import_report_limits_stored_errors():
+    """
+    Testa se o relatório guarda no máximo max_errors erros, mas conta todos.
+    """
+    # Arrange
+    rows = ((line, ("", "A", str(line), False)) for line in range(10))
+
+    # Act
+    report = BookManager().import_books(rows, max_errors=3)
+
+    # Assert
+    assert report.error_count == 10
+    assert len(report.errors) == 3
+
+
+def test_parse_read_flag():
+    """
+    Testa a interpretação dos valores aceitos na coluna 'read'.
+    """
+    assert parse_read_flag("true") is True
+    assert parse_read_flag("Sim") is True
+    assert parse_read_flag("") is False
+    assert parse_read_flag(None) is False
+    assert parse_read_flag(0) is False
+    with pytest.raises(ValueError, match="Valor inválido para 'read'"):
+        parse_read_flag("talvez")
+
+
+def test_batched_groups_lazily():
+    """
+    Testa se batched agrupa o iterável em lotes do tamanho pedido.
+    """
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
@@ -5,6 +5,7 @@ from digital_library_pytest.book import Book
 # A classe BookManager ainda não existe ou está vazia.
 # O pytest reportará os erros de importação/TypeError, o que é esperado no TDD.
 from digital_library_pytest.book_manager import BookManager
+from digital_library_pytest.tests import make_isbn
 
 
 @pytest.fixture
@@ -16,7 +17,7 @@ def book_manager_empty():
 def book_manager_with_books():
     """Fixture que retorna uma instância de BookManager com alguns livros pré-adicionados."""
     manager = BookManager()
-    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225027"))
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225028"))
     manager.add_book(Book("Clean Code", "Robert C. Martin", "978-0132350884"))
     return manager
 
@@ -99,7 +100,7 @@ def test_list_books_with_multiple_books(book_manager_with_books):
 
     # Assert: Verifica se a quantidade de livros é a esperada e se os livros estão presentes.
     assert len(books) == 2 # Hardcoded para 2 livros na fixture book_manager_with_books
-    assert Book("Python Fluente", "Luciano Ramalho", "978-8575225027") in books
+    assert Book("Python Fluente", "Luciano Ramalho", "978-8575225028") in books
     assert Book("Clean Code", "Robert C. Martin", "978-0132350884") in books
     # Garante que a lista retornada é uma CÓPIA da lista interna, não a mesma referência.
     assert books is not book_manager_with_books._books
@@ -159,3 +160,411 @@ def test_remove_book_not_found(book_manager_empty):
     with pytest.raises(ValueError, match=f"Livro com ISBN '{non_existent_isbn}' não encontrado para remoção."):
         book_manager_empty.remove_book(non_existent_isbn)
 
+
+
+def test_list_books_preserves_insertion_order_after_removal(book_manager_with_books, book1):
+    """
+    RF002, RF004: Testa se a listagem mantém a ordem de inserção mesmo após remoções.
+    """
+    # Arrange: Adiciona um terceiro livro e remove o do meio.
+    book_manager_with_books.add_book(book1)
+
+    # Act: Remove o segundo livro e lista novamente.
+    book_manager_with_books.remove_book("978-0132350884")
+    books = book_manager_with_books.list_books()
+
+    # Assert: A ordem relativa dos livros restantes é preservada.
+    assert [book.isbn for book in books] == ["978-8575225028", book1.isbn]
+
+
+def test_search_books_by_title_author_and_isbn(book_manager_with_books, book1):
+    """
+    RF005: Testa a busca por prefixo de título/autor (sem acentos) e por ISBN.
+    """
+    # Arrange: Adiciona um livro com acentos no título.
+    book_manager_with_books.add_book(book1)
+    book_manager_with_books.add_book(Book("O Senhor dos Anéis", "J.R.R. Tolkien", "978-8533613379"))
+
+    # Act & Assert: Busca por prefixo de termos, em qualquer ordem e sem acentos.
+    assert [book.isbn for book in book_manager_with_books.search_books("ANEIS tolk")] == ["978-8533613379"]
+    assert [book.isbn for book in book_manager_with_books.search_books("pyth")] == ["978-8575225028"]
+    assert book_manager_with_books.search_books("python clean") == []
+
+    # Act & Assert: Busca por ISBN exato e por prefixo, ignorando hífens.
+    assert [book.isbn for book in book_manager_with_books.search_books("9780132350884")] == ["978-0132350884"]
+    assert {book.isbn for book in book_manager_with_books.search_books("978-0")} == {"978-0132350884", book1.isbn}
+
+
+def test_add_books_is_all_or_nothing(book_manager_with_books, book1):
+    """
+    Testa a inclusão em lote: todos os livros entram de uma vez, ou nenhum se
+    algum ISBN já existir.
+    """
+    # Act & Assert: Um ISBN repetido rejeita o lote inteiro.
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        book_manager_with_books.add_books([book1, Book("Clean Code", "Robert C. Martin", "978-0132350884")])
+    assert len(book_manager_with_books) == 2
+
+    # Act & Assert: Sem repetições, o lote entra com um único incremento de versão.
+    version = book_manager_with_books.version
+    book_manager_with_books.add_books([book1, Book("Duna", "Frank Herbert", "978-0441172719")])
+    assert len(book_manager_with_books) == 4
+    assert book_manager_with_books.version == version + 1
+
+    # Act & Assert: Com partial, os repetidos são apenas informados.
+    results = book_manager_with_books.add_books([
+        Book("Refactoring", "Martin Fowler", "978-0201485677"),
+        Book("Duna de novo", "Frank Herbert", "0441172717"), # ISBN-10 de um livro existente
+        Book("Refactoring de novo", "Martin Fowler", "978-0201485677"),
+    ], partial=True)
+    assert results == ["added", "already_exists", "already_exists"]
+    assert len(book_manager_with_books) == 5
+
+
+def test_isbn_spellings_are_deduplicated_and_found(book_manager_empty):
+    """
+    RF001, RNF005: Testa se grafias diferentes do mesmo ISBN são tratadas como o
+    mesmo livro na inclusão, na busca, na marcação e na remoção, e se um ISBN
+    inválido é apenas "não encontrado".
+    """
+    # Arrange: O livro é cadastrado com o ISBN-10 hifenizado.
+    book_manager_empty.add_book(Book("Os Sertões", "Euclides da Cunha", "85-359-0277-5"))
+
+    # Act & Assert: O ISBN-13 equivalente é duplicado e localiza o mesmo livro.
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        book_manager_empty.add_book(Book("Os Sertões", "Euclides da Cunha", "978-85-359-0277-8"))
+    assert "9788535902778" in book_manager_empty
+    assert [book.isbn for book in book_manager_empty.search_books("9788535902778")] == ["85-359-0277-5"]
+    book_manager_empty.mark_as_read("978 85 359 0277 8")
+    assert book_manager_empty.list_books()[0].read is True
+    with pytest.raises(ValueError, match="Livro com ISBN '85-359-0277-4' não encontrado para remoção."):
+        book_manager_empty.remove_book("85-359-0277-4")
+    book_manager_empty.remove_book("8535902775")
+    assert book_manager_empty.list_books() == []
+
+
+def test_search_index_follows_removals(book_manager_with_books):
+    """
+    RF004, RF005: Testa se o índice de busca é atualizado quando um livro é removido.
+    """
+    # Act: Remove um livro indexado.
+    book_manager_with_books.remove_book("978-0132350884")
+
+    # Assert: O livro removido não aparece mais na busca.
+    assert book_manager_with_books.search_books("clean") == []
+    assert book_manager_with_books.search_books("978-0132350884") == []
+
+
+def test_books_page_is_stable_across_mutations(book_manager_empty):
+    """
+    RF002: Testa se a paginação por cursor não repete nem pula livros quando a
+    coleção muda entre uma página e outra.
+    """
+    # Arrange: Cinco livros.
+    for index in range(5):
+        book_manager_empty.add_book(Book(f"Livro {index}", "Autor", make_isbn(index)))
+
+    # Act: Primeira página, seguida de uma remoção já entregue e de uma inclusão.
+    first_page, cursor = book_manager_empty.books_page(limit=2)
+    book_manager_empty.remove_book(make_isbn(0))
+    book_manager_empty.add_book(Book("Livro 5", "Autor", make_isbn(5)))
+    second_page, cursor = book_manager_empty.books_page(cursor, limit=2)
+    third_page, last_cursor = book_manager_empty.books_page(cursor, limit=2)
+
+    # Assert
+    assert [book.isbn for book in first_page] == [make_isbn(0), make_isbn(1)]
+    assert [book.isbn for book in second_page] == [make_isbn(2), make_isbn(3)]
+    assert [book.isbn for book in third_page] == [make_isbn(4), make_isbn(5)]
+    assert last_cursor is None
+
+
+def test_iter_books_survives_compaction(book_manager_empty):
+    """
+    Testa se a iteração continua correta quando a ordem interna é compactada
+    por muitas remoções durante a iteração.
+    """
+    # Arrange
+    for index in range(3000):
+        book_manager_empty.add_book(Book(f"Livro {index}", "Autor", make_isbn(index)))
+    iterator = book_manager_empty.iter_books()
+    seen = [next(iterator)[1].isbn]
+
+    # Act: Remove livros já entregues, forçando a compactação.
+    for index in range(1, 2000):
+        book_manager_empty.remove_book(make_isbn(index - 1))
+        seen.append(next(iterator)[1].isbn)
+    seen.extend(book.isbn for _, book in iterator)
+
+    # Assert
+    assert seen == [make_isbn(index) for index in range(3000)]
+
+
+def test_books_page_rejects_invalid_limit(book_manager_empty):
+    """
+    Testa se limites de página fora do intervalo levantam ValueError.
+    """
+    with pytest.raises(ValueError, match="O limite da página deve estar entre"):
+        book_manager_empty.books_page(limit=0)
+
+
+def test_version_changes_only_on_mutations(book_manager_with_books, book1):
+    """
+    Testa se a versão é incrementada a cada mutação e apenas nelas.
+    """
+    # Arrange
+    versions = [book_manager_with_books.version]
+
+    # Act: Leituras não mudam a versão; inclusão, marcação e remoção mudam.
+    book_manager_with_books.list_books()
+    versions.append(book_manager_with_books.version)
+    book_manager_with_books.add_book(book1)
+    versions.append(book_manager_with_books.version)
+    book_manager_with_books.mark_as_read(book1.isbn)
+    versions.append(book_manager_with_books.version)
+    book_manager_with_books.remove_book(book1.isbn)
+    versions.append(book_manager_with_books.version)
+
+    # Assert
+    assert versions[0] == versions[1]
+    assert versions[1] < versions[2] < versions[3] < versions[4]
+
+
+def test_filter_and_count_by_author_and_read_status(book_manager_with_books):
+    """
+    Testa os filtros por autor (sem acentos nem maiúsculas) e por status de leitura,
+    e as contagens, acompanhando inclusões, marcações e remoções.
+    """
+    # Arrange
+    book_manager_with_books.add_book(Book("Refactoring", "Robert C. Martin", "978-0201485677"))
+    book_manager_with_books.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+
+    # Act: A primeira filtragem constrói os índices; as mutações seguintes os atualizam.
+    assert [book.isbn for book in book_manager_with_books.filter_books(author="robert  c. MARTIN")] == [
+        "978-0132350884", "978-0201485677"
+    ]
+    book_manager_with_books.mark_as_read("978-0441172719")
+    book_manager_with_books.mark_as_read("978-0132350884")
+    book_manager_with_books.remove_book("978-8575225028")
+
+    # Assert
+    assert [book.isbn for book in book_manager_with_books.filter_books(read=True)] == [
+        "978-0132350884", "978-0441172719"
+    ]
+    assert [book.isbn for book in book_manager_with_books.filter_books(author="Robert C. Martin", read=False)] == [
+        "978-0201485677"
+    ]
+    assert book_manager_with_books.filter_books(read=True, limit=1)[0].isbn == "978-0132350884"
+    assert book_manager_with_books.count_books(read=False) == 1
+    assert book_manager_with_books.count_books(author="Frank Herbert") == 1
+    assert book_manager_with_books.count_books(author="Ninguém") == 0
+    with pytest.raises(ValueError, match="Informe ao menos um critério de filtro"):
+        book_manager_with_books.count_books()
+
+
+def test_changes_since_returns_consolidated_deltas(book_manager_with_books, book1):
+    """
+    Testa se changes_since devolve só as mudanças posteriores à versão do cliente,
+    consolidadas por livro.
+    """
+    # Arrange: O cliente conhece a biblioteca na versão atual.
+    version = book_manager_with_books.version
+
+    # Act
+    book_manager_with_books.add_book(book1)
+    book_manager_with_books.mark_as_read(book1.isbn)
+    book_manager_with_books.mark_as_read("978-0132350884")
+    book_manager_with_books.remove_book("978-8575225028")
+
+    # Assert: O livro incluído já vem marcado; o removido vem só com o ISBN.
+    changes = book_manager_with_books.changes_since(version)
+    assert [(operation, getattr(target, "isbn", target)) for operation, target in changes] == [
+        ("add", book1.isbn), ("read", "978-0132350884"), ("remove", "978-8575225028")
+    ]
+    assert changes[0][1].read is True
+    assert book_manager_with_books.changes_since(book_manager_with_books.version) == []
+    assert book_manager_with_books.changes_since(book_manager_with_books.version + 1) is None
+
+
+def test_changes_since_requires_resync_after_eviction():
+    """
+    Testa se uma versão que já saiu do journal limitado exige ressincronização.
+    """
+    # Arrange
+    manager = BookManager(journal_size=2)
+    manager.add_book(Book("Clean Code", "Robert C. Martin", "978-0132350884"))
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+
+    # Act: A terceira mudança descarta a primeira.
+    manager.mark_as_read("978-0441172719")
+
+    # Assert
+    assert manager.changes_since(0) is None
+    assert [operation for operation, _ in manager.changes_since(1)] == ["add"]
+
+
+def test_mark_many_and_remove_many_are_all_or_nothing(book_manager_with_books):
+    """
+    Testa as operações em lote: por padrão nada muda se algum ISBN faltar; no modo
+    parcial, os encontrados são alterados e o resultado vem por ISBN.
+    """
+    # Act & Assert: Tudo ou nada.
+    with pytest.raises(ValueError, match="Livros com ISBN '999-9999999999' não encontrados para remoção"):
+        book_manager_with_books.remove_many(["978-0132350884", "999-9999999999"])
+    assert len(book_manager_with_books) == 2
+
+    # Act & Assert: Marcação em lote, com um único incremento de versão.
+    version = book_manager_with_books.version
+    assert book_manager_with_books.mark_many_as_read(["978-0132350884", "9780132350884", "978-8575225028"]) == {
+        "978-0132350884": "marked", "9780132350884": "already_read", "978-8575225028": "marked"
+    }
+    assert book_manager_with_books.version == version + 1
+
+    # Act & Assert: Remoção parcial.
+    assert book_manager_with_books.remove_many(["978-0132350884", "999-9999999999"], partial=True) == {
+        "978-0132350884": "removed", "999-9999999999": "not_found"
+    }
+    assert [book.isbn for book in book_manager_with_books.list_books()] == ["978-8575225028"]
+    assert book_manager_with_books.search_books("clean") == []
+
+
+def test_remove_many_large_batch_keeps_indexes_consistent(book_manager_empty):
+    """
+    Testa a remoção de um lote grande (caminho de filtragem única dos índices).
+    """
+    # Arrange
+    book_manager_empty.add_books(Book(f"Livro {index}", "Autor", make_isbn(index)) for index in range(500))
+    book_manager_empty.search_books("livro") # Constrói o índice de busca
+    book_manager_empty.count_books(author="Autor") # Constrói os índices secundários
+
+    # Act
+    results = book_manager_empty.remove_many([make_isbn(index) for index in range(0, 500, 2)])
+
+    # Assert
+    assert set(results.values()) == {"removed"}
+    assert len(book_manager_empty.search_books("livro")) == 250
+    assert book_manager_empty.search_books(make_isbn(0)) == []
+    assert book_manager_empty.count_books(author="Autor") == 250
+    assert [book.isbn for book in book_manager_empty.list_books()[:2]] == [make_isbn(1), make_isbn(3)]
+
+
+def test_sorted_page_by_title_and_author(book_manager_empty):
+    """
+    Testa as páginas ordenadas por título e por autor, sem diferenciar maiúsculas
+    nem acentos, mantidas a cada inclusão e remoção.
+    """
+    # Arrange
+    book_manager_empty.add_book(Book("Zélia", "Jorge Amado", "978-0132350884"))
+    book_manager_empty.add_book(Book("érico", "Ana", "978-8575225028"))
+    book_manager_empty.add_book(Book("Ernesto", "Jorge Amado", "978-0441172719"))
+    book_manager_empty.add_book(Book("Eric", "ana", "978-0201485677"))
+
+    # Act
+    first, cursor = book_manager_empty.sorted_page("title", limit=2)
+    book_manager_empty.remove_book(first[-1].isbn) # O cursor segue válido sem o livro dele
+    book_manager_empty.add_book(Book("Abril", "Bia", "978-0321125217")) # Antes do cursor: não aparece
+    second, last_cursor = book_manager_empty.sorted_page("title", cursor, limit=2)
+
+    # Assert
+    assert [book.title for book in first] == ["Eric", "érico"]
+    assert [book.title for book in second] == ["Ernesto", "Zélia"]
+    assert last_cursor is None
+    by_author, _ = book_manager_empty.sorted_page("author", limit=10)
+    assert [(book.author, book.title) for book in by_author] == [
+        ("ana", "Eric"), ("Bia", "Abril"), ("Jorge Amado", "Ernesto"), ("Jorge Amado", "Zélia")
+    ]
+
+
+def test_sorted_page_range_and_errors(book_manager_empty):
+    """
+    Testa a faixa [start, stop) no campo principal e os erros de ordenação e cursor.
+    """
+    # Arrange
+    book_manager_empty.add_books(Book(f"{letter} {index}", "Autor", make_isbn(index))
+                                 for index, letter in enumerate("abcdefgh" * 3))
+
+    # Act
+    books, cursor = book_manager_empty.sorted_page("title", start="C", stop="e", limit=10)
+
+    # Assert
+    assert [book.title for book in books] == ["c 10", "c 18", "c 2", "d 11", "d 19", "d 3"]
+    assert cursor is None
+    with pytest.raises(ValueError, match="Ordenação 'isbn' inválida"):
+        book_manager_empty.sorted_page("isbn")
+    with pytest.raises(ValueError, match="Cursor de ordenação inválido."):
+        book_manager_empty.sorted_page("author", ["a", 1])
+
+
+def test_fuzzy_search_tolerates_typos_and_ranks_exact_first(book_manager_empty):
+    """
+    RF005: Testa a busca tolerante a erros de digitação, com a grafia exata antes
+    das aproximadas, e se ela acompanha as remoções.
+    """
+    # Arrange
+    book_manager_empty.add_book(Book("O Senhor dos Anéis", "J. R. R. Tolkien", "978-0132350884"))
+    book_manager_empty.add_book(Book("1984", "George Orwell", "978-8575225028"))
+    book_manager_empty.add_book(Book("A Revolução dos Bichos", "George Orwell", "978-0441172719"))
+    book_manager_empty.add_book(Book("Tolkein: uma biografia", "Humphrey Carpenter", "978-0201485677"))
+
+    # Act
+    tolkien = book_manager_empty.fuzzy_matches("Tolkein")
+    orwell = book_manager_empty.search_books("Orwel", fuzzy=True)
+    book_manager_empty.remove_book("978-0201485677")
+
+    # Assert
+    assert [book.isbn for _, book in tolkien] == ["978-0201485677", "978-0132350884"]
+    assert tolkien[0][0] == 1.0 > tolkien[1][0]
+    assert {book.isbn for book in orwell} == {"978-8575225028", "978-0441172719"}
+    assert [book.isbn for book in book_manager_empty.search_books("Tolkein", fuzzy=True)] == ["978-0132350884"]
+    assert book_manager_empty.search_books("xyzw", fuzzy=True) == []
+
+
+def test_fuzzy_search_limit_with_many_candidates(book_manager_empty):
+    """
+    Testa se o limite da busca aproximada retorna os mais relevantes, com vários
+    termos e empates na ordem dos ISBNs.
+    """
+    # Arrange
+    book_manager_empty.add_books(Book(f"Historia {index}", "Autor Comum", make_isbn(index))
+                                 for index in range(200))
+    book_manager_empty.add_book(Book("Histórias do Senhor", "Autor Comum", "978-0132350884"))
+
+    # Act
+    ranked = book_manager_empty.fuzzy_matches("sehnor hstoria", limit=3)
+    unlimited = book_manager_empty.fuzzy_matches("sehnor hstoria")
+
+    # Assert
+    assert ranked[0][1].isbn == "978-0132350884"
+    assert [book.isbn for _, book in ranked[1:]] == [make_isbn(0), make_isbn(1)]
+    assert ranked == unlimited[:3]
+    assert len(unlimited) == 201
+
+
+def test_indexes_stay_ordered_across_incremental_adds(book_manager_empty):
+    """
+    Testa se busca e ordenação continuam corretas com muitas inclusões uma a uma
+    (que passam pelo buffer de inclusões recentes dos índices) e remoções no meio.
+    """
+    # Arrange: Os índices já existem antes das inclusões.
+    book_manager_empty.search_books("livro")
+    book_manager_empty.sorted_page("title")
+    indexes = [index for index in range(3_000) if index % 7]
+
+    # Act
+    for index in reversed(range(3_000)):
+        book_manager_empty.add_book(Book(f"Livro {index:04d}", f"Autor {index % 10}", make_isbn(index)))
+    for index in range(0, 3_000, 7):
+        book_manager_empty.remove_book(make_isbn(index))
+    titles, cursor = [], None
+    while True:
+        books, cursor = book_manager_empty.sorted_page("title", cursor, limit=1_000)
+        titles.extend(book.title for book in books)
+        if cursor is None:
+            break
+
+    # Assert
+    assert titles == [f"Livro {index:04d}" for index in indexes]
+    assert [book.title for book in book_manager_empty.search_books("livro 299")] == [
+        f"Livro {index}" for index in range(2_990, 3_000) if index % 7
+    ]
+    assert [book.isbn for book in book_manager_empty.search_books(make_isbn(1))] == [make_isbn(1)]
+    assert len(book_manager_empty.search_books("livro")) == len(indexes)
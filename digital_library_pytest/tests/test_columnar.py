@@ -0,0 +1,139 @@
+# digital_library_pytest/tests/test_columnar.py
+
+import pytest
+from digital_library_pytest.book import Book
+from digital_library_pytest.book_manager import BookManager
+from digital_library_pytest.columnar import ColumnarBookStore
+from digital_library_pytest.tests import make_isbn
+
+
+@pytest.fixture
+def compact_manager():
+    """Fixture que retorna um BookManager colunar com três livros (dois do mesmo autor)."""
+    manager = BookManager(compact=True)
+    manager.add_book(Book("A Revolução dos Bichos", "George Orwell", "978-8535909555"))
+    manager.add_book(Book("1984", "George Orwell", "978-8535914849"))
+    manager.add_book(Book("Admirável Mundo Novo", "Aldous Huxley", "978-8525056009"))
+    return manager
+
+
+def test_compact_manager_keeps_book_manager_contract(compact_manager):
+    """
+    RF001-RF004: Testa listagem, duplicidade, marcação e remoção no modo colunar.
+    """
+    # Act & Assert
+    assert [book.isbn for book in compact_manager.list_books()] == [
+        "978-8535909555", "978-8535914849", "978-8525056009"
+    ]
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        compact_manager.add_book(Book("Outro", "Outro Autor", "978-8535914849"))
+
+    compact_manager.mark_as_read("978-8535914849")
+    compact_manager.remove_book("978-8535909555")
+    assert [repr(book) for book in compact_manager.list_books()] == [
+        "Book(title='1984', author='George Orwell', isbn='978-8535914849', read=True)",
+        "Book(title='Admirável Mundo Novo', author='Aldous Huxley', isbn='978-8525056009', read=False)",
+    ]
+
+
+def test_views_write_through_and_compare_by_isbn(compact_manager):
+    """
+    Testa se as visões refletem o armazenamento e mantêm igualdade e hash por ISBN.
+    """
+    # Arrange
+    view = compact_manager.list_books()[0]
+
+    # Act
+    compact_manager.mark_as_read(view.isbn)
+
+    # Assert
+    assert view.read is True
+    assert view == Book("Outro Título", "Outro Autor", "978-8535909555")
+    assert hash(view) == hash(Book("Outro Título", "Outro Autor", "978-8535909555"))
+
+
+def test_view_json_follows_the_store(compact_manager):
+    """
+    Testa se o JSON de uma visão acompanha marcações feitas por outra visão.
+    """
+    # Arrange
+    view = compact_manager.list_books()[1]
+    before = view.to_json()
+
+    # Act
+    compact_manager.mark_as_read(view.isbn)
+
+    # Assert
+    assert before.endswith(b'"read":false}')
+    assert view.to_json().endswith(b'"read":true}')
+
+
+def test_views_follow_compacted_rows():
+    """
+    Testa se uma visão continua no seu livro quando as linhas são compactadas,
+    se uma visão de livro removido levanta LookupError e se os cursores de
+    paginação continuam válidos após a compactação.
+    """
+    # Arrange
+    manager = BookManager(compact=True)
+    manager.add_books(Book(f"Livro {index}", "Autor", make_isbn(index)) for index in range(3_000))
+    removed_view = manager.list_books()[0]
+    kept_view = manager.list_books()[-1]
+    page, cursor = manager.books_page(limit=2_000)
+
+    # Act: Remover mais da metade dos livros compacta as linhas.
+    manager.remove_many([make_isbn(index) for index in range(0, 3_000, 3)])
+    manager.remove_many([make_isbn(index) for index in range(1, 3_000, 3)])
+
+    # Assert
+    assert manager._books.generation == 1
+    assert kept_view.title == "Livro 2999"
+    with pytest.raises(LookupError):
+        removed_view.title
+    assert [book.isbn for book in manager.books_page(cursor, limit=3)[0]] == [
+        make_isbn(2_000), make_isbn(2_003), make_isbn(2_006)
+    ]
+    manager.add_book(Book("Livro 0", "Autor", make_isbn(0)))
+    assert removed_view.title == "Livro 0" # O ISBN voltou: a visão encontra o livro de novo
+    assert manager.list_books()[-1].isbn == make_isbn(0)
+
+
+def test_store_finds_keys_across_index_rebuilds():
+    """
+    Testa a busca por chave com inclusões, remoções e reinclusões entre as
+    reconstruções do índice ordenado de chaves.
+    """
+    # Arrange
+    store = ColumnarBookStore()
+    books = [Book(f"Livro {index}", "Autor", make_isbn(index)) for index in range(3_000)]
+
+    # Act
+    for book in books:
+        store[book.key] = book
+    for book in books[::2]:
+        del store[book.key]
+    store[books[0].key] = books[0]
+
+    # Assert
+    assert len(store) == 1_501
+    assert [book.key in store for book in books[:4]] == [True, True, False, True]
+    assert store[books[0].key].title == "Livro 0"
+    assert list(store)[-2:] == [books[2_999].key, books[0].key]
+    assert store.seq_of(books[0].key) == 3_001
+
+
+def test_store_interns_authors():
+    """
+    Testa se cada autor é guardado uma única vez no armazenamento colunar.
+    """
+    # Arrange
+    store = ColumnarBookStore()
+
+    # Act
+    for index in range(100):
+        book = Book(f"Livro {index}", "George Orwell", make_isbn(index))
+        store[book.key] = book
+
+    # Assert
+    assert store._author_names == ["George Orwell"]
+    assert len(store) == 100
@@ -0,0 +1,293 @@
+# digital_library_pytest/tests/test_concurrent_manager.py
+
+import threading
+
+import pytest
+from digital_library_pytest.book import Book
+from digital_library_pytest.concurrent_manager import ReadWriteLock, ShardedBookManager
+from digital_library_pytest.tests import make_isbn
+
+
+@pytest.fixture
+def sharded_manager():
+    """Fixture que retorna um ShardedBookManager com dois livros."""
+    manager = ShardedBookManager(shards=4)
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225028"))
+    manager.add_book(Book("Clean Code", "Robert C. Martin", "978-0132350884"))
+    return manager
+
+
+def test_sharded_manager_keeps_book_manager_contract(sharded_manager):
+    """
+    RF001-RF004: Testa ordem de listagem, duplicidade, marcação e remoção.
+    """
+    # Act & Assert: Ordem global de inserção, mesmo com livros em shards diferentes.
+    assert [book.isbn for book in sharded_manager.list_books()] == ["978-8575225028", "978-0132350884"]
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        sharded_manager.add_book(Book("Outro", "Outro Autor", "978-8575225028"))
+
+    sharded_manager.mark_as_read("978-0132350884")
+    sharded_manager.remove_book("978-8575225028")
+    assert [repr(book) for book in sharded_manager.list_books()] == [
+        "Book(title='Clean Code', author='Robert C. Martin', isbn='978-0132350884', read=True)"
+    ]
+    with pytest.raises(ValueError, match="Livro com ISBN '999-9999999999' não encontrado para remoção."):
+        sharded_manager.remove_book("999-9999999999")
+
+
+def test_sharded_manager_pages_and_search(sharded_manager):
+    """
+    RF002, RF005: Testa paginação por cursor e busca espalhada pelos shards.
+    """
+    # Act
+    first_page, cursor = sharded_manager.books_page(limit=1)
+    second_page, last_cursor = sharded_manager.books_page(cursor, limit=1)
+
+    # Assert
+    assert [book.isbn for book in first_page + second_page] == ["978-8575225028", "978-0132350884"]
+    assert last_cursor is None
+    assert [book.isbn for book in sharded_manager.search_books("martin")] == ["978-0132350884"]
+
+    # Act & Assert: Filtros e contagens juntam os shards na ordem global de inserção.
+    sharded_manager.add_book(Book("Refactoring", "Robert C. Martin", "978-0201485677"))
+    assert [book.isbn for book in sharded_manager.filter_books(author="Robert C. Martin")] == [
+        "978-0132350884", "978-0201485677"
+    ]
+    assert sharded_manager.count_books(read=False) == 3
+
+
+def test_sharded_batch_mutations_span_shards():
+    """
+    Testa as operações em lote com livros espalhados por vários shards.
+    """
+    # Arrange
+    manager = ShardedBookManager(shards=4)
+    isbns = [make_isbn(index) for index in range(20)]
+    for isbn in isbns:
+        manager.add_book(Book(f"Livro {isbn}", "Autor", isbn))
+
+    # Act & Assert: Um ISBN ausente impede o lote inteiro.
+    with pytest.raises(ValueError, match="não encontrados para remoção"):
+        manager.remove_many(isbns + ["999-9999999999"])
+    assert len(manager) == 20
+
+    assert set(manager.mark_many_as_read(isbns[:10]).values()) == {"marked"}
+    assert set(manager.remove_many(isbns[10:]).values()) == {"removed"}
+    assert [book.isbn for book in manager.list_books()] == isbns[:10]
+    assert all(book.read for book in manager.list_books())
+
+
+def test_sharded_add_books_keeps_batch_order(sharded_manager):
+    """
+    Testa se a inclusão em lote respeita a ordem do lote e é tudo ou nada.
+    """
+    # Act
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        sharded_manager.add_books([Book("Novo", "Autor", make_isbn(1)), Book("Outro", "Autor", "978-0132350884")])
+    sharded_manager.add_books(Book(f"Livro {index}", "Autor", make_isbn(index)) for index in range(10))
+
+    results = sharded_manager.add_books([Book("Duna", "Frank Herbert", "978-0441172719"),
+                                         Book("Repetido", "Autor", make_isbn(3)),
+                                         Book("Livro 10", "Autor", make_isbn(10)),
+                                         Book("Duna de novo", "Frank Herbert", "978-0441172719")], partial=True)
+
+    # Assert
+    assert [book.isbn for book in sharded_manager.list_books()[2:]] == (
+        [make_isbn(index) for index in range(10)] + ["978-0441172719", make_isbn(10)]
+    )
+    assert results == ["added", "already_exists", "added", "already_exists"]
+    assert len(sharded_manager) == 14
+
+
+def test_sharded_sorted_page_merges_shards():
+    """
+    Testa se as páginas ordenadas juntam os shards na ordem global, sem repetir
+    nem pular livros entre páginas.
+    """
+    # Arrange
+    manager = ShardedBookManager(shards=4)
+    for index in range(30):
+        manager.add_book(Book(f"Livro {29 - index:02d}", "Autor", make_isbn(index)))
+
+    # Act
+    titles, cursor = [], None
+    while True:
+        books, cursor = manager.sorted_page("title", cursor, limit=7)
+        titles.extend(book.title for book in books)
+        if cursor is None:
+            break
+
+    # Assert
+    assert titles == [f"Livro {index:02d}" for index in range(30)]
+
+
+def test_sharded_fuzzy_search_merges_by_score():
+    """
+    RF005: Testa se a busca aproximada junta os shards pela pontuação.
+    """
+    # Arrange
+    manager = ShardedBookManager(shards=4)
+    for index in range(20):
+        manager.add_book(Book(f"Livro {index}", "Tolkien" if index % 5 else "Tolkein", make_isbn(index)))
+
+    # Act
+    ranked = manager.fuzzy_matches("tolkein", limit=6)
+
+    # Assert
+    assert [book.isbn for _, book in ranked[:4]] == [make_isbn(index) for index in (0, 5, 10, 15)]
+    assert [score for score, _ in ranked] == sorted((score for score, _ in ranked), reverse=True)
+    assert len(manager.search_books("tolkein", fuzzy=True)) == 20
+
+
+def test_sharded_changes_since_merges_shard_journals():
+    """
+    Testa se changes_since junta as mudanças de todos os shards sob a versão
+    global e pede uma ressincronização quando o journal não cobre mais a versão.
+    """
+    # Arrange
+    manager = ShardedBookManager(shards=4, journal_size=4)
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225028"))
+    version = manager.version
+
+    # Act
+    manager.add_books(Book(f"Livro {index}", "Autor", make_isbn(index)) for index in range(3))
+    manager.mark_as_read(make_isbn(1))
+    manager.mark_as_read(make_isbn(1)) # Já lido: não é uma mutação
+    manager.remove_many(["978-8575225028", make_isbn(2)])
+
+    # Assert
+    assert manager.version == version + 3
+    changes = manager.changes_since(version + 1)
+    assert [(operation, getattr(target, "isbn", target)) for operation, target in changes] == [
+        ("read", make_isbn(1)), ("remove", make_isbn(2)), ("remove", "978-8575225028"),
+    ]
+    assert [operation for operation, _ in manager.changes_since(manager.version - 1)] == ["remove", "remove"]
+    assert manager.changes_since(manager.version) == []
+    assert manager.changes_since(version) is None # As inclusões do lote saíram do journal
+
+
+def test_concurrent_writers_do_not_lose_updates():
+    """
+    Teste de estresse: várias threads incluem, marcam e removem livros enquanto
+    outras listam. Nenhuma atualização pode se perder e nenhuma leitura pode
+    observar um estado inconsistente (livros repetidos ou fora de ordem).
+    """
+    # Arrange
+    manager = ShardedBookManager(shards=8)
+    writers, per_writer = 8, 500
+    errors = []
+    done = threading.Event()
+
+    def write(writer):
+        for index in range(per_writer):
+            isbn = make_isbn(writer * per_writer + index)
+            manager.add_book(Book(f"Livro {isbn}", "Autor", isbn))
+            manager.mark_as_read(isbn)
+            if index % 2:
+                manager.remove_book(isbn)
+
+    def read():
+        while not done.is_set():
+            books = manager.list_books()
+            isbns = [book.isbn for book in books]
+            if len(isbns) != len(set(isbns)):
+                errors.append("livro repetido na listagem")
+            for writer in range(writers):
+                own = [isbn for isbn in isbns if int(isbn[3:12]) // per_writer == writer]
+                if own != sorted(own):
+                    errors.append("ordem de inserção violada")
+
+    threads = [threading.Thread(target=write, args=(writer,)) for writer in range(writers)]
+    readers = [threading.Thread(target=read) for _ in range(2)]
+
+    # Act
+    for thread in readers + threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    done.set()
+    for thread in readers:
+        thread.join()
+
+    # Assert
+    assert errors == []
+    books = manager.list_books()
+    assert len(books) == len(manager) == writers * per_writer // 2
+    assert all(book.read for book in books)
+
+
+def test_read_write_lock_excludes_writers_from_readers():
+    """
+    Testa se um escritor espera os leitores ativos liberarem o lock.
+    """
+    # Arrange
+    lock = ReadWriteLock()
+    events = []
+    lock.acquire_read()
+
+    def writer():
+        with lock.write_locked():
+            events.append("escrita")
+
+    thread = threading.Thread(target=writer)
+
+    # Act
+    thread.start()
+    thread.join(timeout=0.05)
+    events.append("leitura liberada")
+    lock.release_read()
+    thread.join()
+
+    # Assert
+    assert events == ["leitura liberada", "escrita"]
+
+
+def test_sharded_queries_share_the_read_lock(sharded_manager):
+    """
+    Testa se buscas, filtros, contagens e páginas ordenadas rodam sob o lock de
+    leitura dos shards, sem esperar outros leitores, e se os índices preparados
+    acompanham uma inclusão em lote.
+    """
+    # Arrange
+    sharded_manager.add_books(Book(f"Livro {index}", "Autor", make_isbn(index)) for index in range(8))
+    results = []
+
+    def query():
+        results.append([book.isbn for book in sharded_manager.search_books("livro 7")])
+        results.append(sharded_manager.count_books(author="autor"))
+        results.append(len(sharded_manager.filter_books(read=False, limit=3)))
+        results.append(sharded_manager.sorted_page("author", limit=1)[0][0].title)
+        results.append(sharded_manager.search_books("Ramalo", fuzzy=True)[0].title)
+
+    # Act
+    query() # Prepara os índices de todos os shards
+    results.clear()
+    for shard in sharded_manager._shards:
+        shard.lock.acquire_read()
+    thread = threading.Thread(target=query)
+    thread.start()
+    thread.join(timeout=5)
+    blocked = thread.is_alive()
+    for shard in sharded_manager._shards:
+        shard.lock.release_read()
+    thread.join()
+
+    # Assert
+    assert not blocked
+    assert results == [[make_isbn(7)], 8, 3, "Livro 0", "Python Fluente"]
+
+
+def test_sharded_count_builds_only_the_filter_indexes(sharded_manager):
+    """
+    Testa se uma contagem prepara apenas os índices de filtro dos shards,
+    mantendo os demais sob demanda.
+    """
+    # Act
+    count = sharded_manager.count_books(read=False)
+
+    # Assert
+    assert count == 2
+    for shard in sharded_manager._shards:
+        assert shard.manager.indexes_ready("filter")
+        assert not shard.manager.indexes_ready("search")
+        assert not shard.manager.indexes_ready("sorted:title")
@@ -0,0 +1,158 @@
+# digital_library_pytest/tests/test_metrics.py
+
+import pytest
+from digital_library_pytest import api_logic, metrics
+from digital_library_pytest.book import Book
+from digital_library_pytest.book_manager import BookManager
+
+
+@pytest.fixture
+def instrumented_api(monkeypatch):
+    """Fixture com a instrumentação ligada e zerada sobre um novo BookManager com um livro."""
+    manager = BookManager()
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225028"))
+    monkeypatch.setattr(api_logic, "library_manager", manager)
+    metrics.reset()
+    metrics.enable()
+    yield manager
+    metrics.disable()
+    metrics.reset()
+
+
+def test_disabled_instrumentation_records_nothing(monkeypatch):
+    """
+    Testa se, com a instrumentação desligada, as chamadas da API não geram métricas.
+    """
+    # Arrange
+    monkeypatch.setattr(api_logic, "library_manager", BookManager())
+    metrics.disable()
+    metrics.reset()
+
+    # Act
+    api_logic.add_book_api("Clean Code", "Robert C. Martin", "978-0132350884")
+
+    # Assert
+    assert metrics.snapshot() == {}
+
+
+def test_counts_errors_and_stages(instrumented_api):
+    """
+    Testa contagens por função, erros de ValueError e a separação entre o tempo
+    dentro do gerenciador e o de serialização.
+    """
+    # Act
+    api_logic.get_all_books_api()
+    api_logic.mark_book_as_read_api("978-8575225028")
+    with pytest.raises(ValueError):
+        api_logic.remove_book_api("000-0000000000")
+
+    # Assert
+    snapshot = metrics.snapshot()
+    assert snapshot["get_all_books"]["requests"] == 1
+    assert snapshot["get_all_books"]["errors"] == 0
+    assert snapshot["mark_book_as_read"]["requests"] == 1
+    assert (snapshot["remove_book"]["requests"], snapshot["remove_book"]["errors"]) == (1, 1)
+    stages = snapshot["get_all_books"]
+    assert stages["total"]["count"] == stages["manager"]["count"] == stages["serialization"]["count"] == 1
+    assert stages["manager"]["sum"] + stages["serialization"]["sum"] == pytest.approx(stages["total"]["sum"])
+    assert 0 < stages["total"]["p50"] <= stages["total"]["p99"]
+
+
+def test_histogram_quantiles():
+    """
+    Testa a estimativa de p50 e p99 a partir dos baldes do histograma.
+    """
+    # Arrange
+    histogram = metrics._Histogram()
+    for _ in range(99):
+        histogram.observe(0.001)
+    histogram.observe(1.0)
+
+    # Act
+    summary = histogram.summary()
+
+    # Assert: Cada quantil cai no balde da amostra correspondente.
+    assert 0.001 / 1.5 < summary["p50"] <= 0.001 * 1.5
+    assert 0.001 / 1.5 < summary["p99"] <= 0.001 * 1.5
+    assert histogram.quantile(1.0) == pytest.approx(1.0, rel=0.5)
+    assert summary["count"] == 100
+
+
+def test_prometheus_text(instrumented_api):
+    """
+    Testa o formato de texto do Prometheus: contadores e baldes cumulativos.
+    """
+    # Arrange
+    api_logic.search_books_api("python")
+
+    # Act
+    text = metrics.prometheus_text()
+
+    # Assert
+    lines = text.splitlines()
+    assert 'digital_library_requests_total{endpoint="search_books"} 1' in lines
+    assert 'digital_library_errors_total{endpoint="search_books"} 0' in lines
+    assert 'digital_library_request_duration_seconds_bucket{endpoint="search_books",stage="total",le="+Inf"} 1' in lines
+    assert "# TYPE digital_library_request_duration_seconds histogram" in lines
+    buckets = [int(line.rsplit(" ", 1)[1]) for line in lines
+               if line.startswith('digital_library_request_duration_seconds_bucket{endpoint="search_books",stage="manager"')]
+    assert buckets == sorted(buckets) and buckets[-1] == 1
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Fixture que substitui o relógio das métricas por um controlado pelo teste (lista com o instante atual)."""
+    now = [0.0]
+    monkeypatch.setattr(metrics, "perf_counter", lambda: now[0])
+    return now
+
+
+def test_nested_calls_keep_the_outer_request(instrumented_api, fake_clock):
+    """
+    Testa se uma chamada instrumentada dentro de outra não descarta a medição da
+    externa: o tempo no gerenciador das duas entra na externa.
+    """
+    # Arrange
+    @metrics.instrumented("inner")
+    def inner():
+        metrics.manager_started()
+        fake_clock[0] += 1.0
+        metrics.manager_finished()
+
+    @metrics.instrumented("outer")
+    def outer():
+        inner()
+        metrics.manager_started()
+        fake_clock[0] += 2.0
+        metrics.manager_finished()
+        fake_clock[0] += 4.0
+
+    # Act
+    outer()
+
+    # Assert
+    snapshot = metrics.snapshot()
+    assert snapshot["inner"]["manager"]["sum"] == 1.0
+    assert snapshot["outer"]["manager"]["sum"] == 3.0
+    assert snapshot["outer"]["serialization"]["sum"] == 4.0
+
+
+def test_lazy_initialization_is_not_manager_time(instrumented_api, monkeypatch, fake_clock):
+    """
+    Testa se a criação do gerenciador no primeiro uso da API não é contada como
+    tempo dentro do gerenciador da chamada que a provocou.
+    """
+    # Arrange: A criação (e carga) do gerenciador leva 10 segundos no relógio falso.
+    def slow_create():
+        fake_clock[0] += 10.0
+        return BookManager()
+    monkeypatch.setattr(api_logic, "library_manager", None)
+    monkeypatch.setattr(api_logic, "_create_library_manager", slow_create)
+
+    # Act
+    api_logic.count_books_api(read=False)
+
+    # Assert
+    stages = metrics.snapshot()["count_books"]
+    assert stages["total"]["sum"] == 10.0
+    assert stages["manager"]["sum"] == 0.0
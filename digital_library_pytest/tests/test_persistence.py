@@ -0,0 +1,240 @@
+# digital_library_pytest/tests/test_persistence.py
+
+import struct
+
+import pytest
+from digital_library_pytest import persistence
+from digital_library_pytest.book import Book
+from digital_library_pytest.columnar import ColumnarBookStore
+from digital_library_pytest.persistence import (
+    COMPACTING_LOG_FILE,
+    LOG_FILE,
+    PersistentBookManager,
+    load_snapshot,
+    load_snapshot_store,
+    snapshot_version,
+    write_snapshot,
+)
+from digital_library_pytest.tests import make_isbn
+
+
+def _state(manager):
+    """Retorna o estado da biblioteca de forma comparável."""
+    return [repr(book) for book in manager.list_books()]
+
+
+def test_operations_survive_restart(tmp_path):
+    """
+    RF007: Testa se inclusões, marcações e remoções sobrevivem a um reinício.
+    """
+    # Arrange
+    manager = PersistentBookManager(tmp_path)
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    manager.add_book(Book("Fundação", "Isaac Asimov", "978-0553803716"))
+    manager.add_book(Book("Neuromancer", "William Gibson", "978-0441569595"))
+    manager.mark_as_read("978-0441172719")
+    manager.remove_book("978-0553803716")
+    manager.close()
+
+    # Act
+    restored = PersistentBookManager(tmp_path)
+
+    # Assert
+    assert _state(restored) == _state(manager)
+    assert restored.list_books()[0].read is True
+
+
+def test_version_survives_restart(tmp_path):
+    """
+    Testa se a versão continua de onde parou após um reinício, com e sem
+    compactação, e se mudanças anteriores ao reinício pedem ressincronização.
+    """
+    # Arrange
+    manager = PersistentBookManager(tmp_path, compact_every=3)
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    manager.add_book(Book("Fundação", "Isaac Asimov", "978-0553803716"))
+    manager.remove_many(["978-0441172719", "978-0553803716"])
+    manager.add_book(Book("Neuromancer", "William Gibson", "978-0441569595"))
+    version = manager.version
+    manager.close()
+
+    # Act
+    restored = PersistentBookManager(tmp_path)
+    restored.mark_as_read("978-0441569595")
+
+    # Assert
+    assert snapshot_version(tmp_path / "books.snapshot") == 3
+    assert version == 4
+    assert restored.version == 5
+    assert restored.changes_since(version - 1) is None
+    assert restored.changes_since(version) == [("read", restored.list_books()[0])]
+
+
+def test_compaction_writes_snapshot_and_truncates_log(tmp_path):
+    """
+    RF007: Testa se o log é compactado em um snapshot após compact_every operações.
+    """
+    # Arrange
+    manager = PersistentBookManager(tmp_path, compact_every=3)
+
+    # Act: Três operações disparam a compactação; a quarta fica apenas no log.
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    manager.add_book(Book("Fundação", "Isaac Asimov", "978-0553803716"))
+    manager.mark_as_read("978-0441172719")
+    manager.add_book(Book("Neuromancer", "William Gibson", "978-0441569595"))
+    manager.close()
+
+    # Assert
+    assert len((tmp_path / LOG_FILE).read_text(encoding="utf-8").splitlines()) == 1
+    assert _state(PersistentBookManager(tmp_path)) == _state(manager)
+
+
+def test_compact_restart_loads_snapshot_columns(tmp_path):
+    """
+    RF007: Testa se a biblioteca colunar é restaurada direto das colunas do
+    snapshot, com os status de leitura e a ordem de inserção preservados.
+    """
+    # Arrange
+    manager = PersistentBookManager(tmp_path)
+    manager.add_books(Book(f"Livro {index}", f"Autor {index % 3}", make_isbn(index)) for index in range(20))
+    manager.mark_many_as_read([make_isbn(index) for index in (0, 7, 8, 19)])
+    manager.compact()
+    manager.close()
+
+    # Act
+    restored = PersistentBookManager(tmp_path, compact=True)
+
+    # Assert
+    assert isinstance(restored._books, ColumnarBookStore)
+    assert _state(restored) == _state(manager)
+    assert [book.isbn for book in restored.filter_books(read=True)] == [make_isbn(index) for index in (0, 7, 8, 19)]
+    restored.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    assert restored.list_books()[-1].title == "Duna"
+
+
+def test_failed_background_compaction_loses_no_operation(tmp_path, monkeypatch):
+    """
+    RF007: Testa se uma compactação em segundo plano que falha mantém o log girado
+    (com as operações seguintes acrescentadas a ele na próxima tentativa) e se a
+    recuperação reaplica tudo e conclui a compactação.
+    """
+    # Arrange
+    failures = []
+
+    def failing_write_snapshot(*args):
+        failures.append(args)
+        raise OSError(f"Disco cheio ({len(failures)}).")
+
+    monkeypatch.setattr(persistence, "write_snapshot", failing_write_snapshot)
+    manager = PersistentBookManager(tmp_path, compact_every=2)
+
+    # Act: Duas compactações falham; a segunda acrescenta o log atual ao girado.
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    manager.add_book(Book("Fundação", "Isaac Asimov", "978-0553803716"))
+    manager._compaction.join()
+    manager.mark_as_read("978-0441172719")
+    manager.mark_as_read("978-0441172719") # Já lido: não gera registro no log
+    manager.remove_book("978-0553803716")
+    with pytest.raises(OSError, match=r"Disco cheio \(1\)."): # O primeiro erro não é substituído
+        manager.close()
+    monkeypatch.undo()
+    restored = PersistentBookManager(tmp_path)
+
+    # Assert
+    assert len(failures) == 2
+    assert _state(restored) == _state(manager)
+    assert not (tmp_path / COMPACTING_LOG_FILE).exists()
+    assert load_snapshot(tmp_path / "books.snapshot")[1] == 4
+
+
+def test_recovery_ignores_operations_already_in_snapshot(tmp_path):
+    """
+    RF007: Testa a queda entre gravar o snapshot e esvaziar o log: as operações
+    já incluídas no snapshot não são reaplicadas.
+    """
+    # Arrange: Grava o snapshot sem esvaziar o log, como em uma queda no meio da compactação.
+    manager = PersistentBookManager(tmp_path)
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    write_snapshot(tmp_path / "books.snapshot", manager.list_books(), last_seq=1)
+    manager.remove_book("978-0441172719")
+    manager.close()
+
+    # Act
+    restored = PersistentBookManager(tmp_path)
+
+    # Assert: A inclusão não é reaplicada (evitando duplicidade), mas a remoção é.
+    assert restored.list_books() == []
+
+
+def test_truncated_last_log_line_is_discarded(tmp_path):
+    """
+    RF007: Testa se uma linha incompleta no fim do log é descartada na recuperação.
+    """
+    # Arrange
+    manager = PersistentBookManager(tmp_path)
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    manager.close()
+    with open(tmp_path / LOG_FILE, "a", encoding="utf-8") as handle:
+        handle.write('{"op": "remove", "isb')
+
+    # Act
+    restored = PersistentBookManager(tmp_path)
+    restored.add_book(Book("Fundação", "Isaac Asimov", "978-0553803716"))
+    restored.close()
+
+    # Assert
+    assert [book.isbn for book in PersistentBookManager(tmp_path).list_books()] == [
+        "978-0441172719", "978-0553803716"
+    ]
+
+
+def test_snapshot_round_trip_with_separator_characters(tmp_path):
+    """
+    Testa se campos contendo os caracteres de controle do formato são preservados.
+    """
+    # Arrange
+    book = Book("Título\x1fcom\x1bcontrole", "Autor", "978-0441172719")
+    book.mark_as_read()
+    path = tmp_path / "books.snapshot"
+
+    # Act
+    write_snapshot(path, [book, Book("Duna", "Frank Herbert", "978-0553803716")], last_seq=7)
+    books, last_seq = load_snapshot(path)
+
+    # Assert
+    assert last_seq == 7
+    assert [repr(restored) for restored in books] == [repr(book), repr(Book("Duna", "Frank Herbert", "978-0553803716"))]
+
+
+def test_load_snapshot_reads_previous_format(tmp_path):
+    """
+    Testa se um snapshot do formato anterior (sem versão nem chaves) ainda é lido.
+    """
+    # Arrange
+    payload = "\x1f".join(["Duna", "Frank Herbert", "0441172717", "Neuromancer", "William Gibson",
+                            "978-0441569595"]).encode()
+    path = tmp_path / "books.snapshot"
+    path.write_bytes(struct.pack("<8sQQQ", b"DLSNAP01", 2, 5, len(payload)) + b"\x01\x00" + payload)
+
+    # Act
+    books, last_seq = load_snapshot(path)
+    store, _ = load_snapshot_store(path)
+
+    # Assert
+    assert last_seq == 5
+    assert snapshot_version(path) == 0
+    assert [(book.key, book.read) for book in books] == [(9780441172719, True), (9780441569595, False)]
+    assert [(book.key, book.read) for book in store.values()] == [(9780441172719, True), (9780441569595, False)]
+
+
+def test_load_snapshot_rejects_other_files(tmp_path):
+    """
+    Testa se um arquivo que não é snapshot é rejeitado com ValueError.
+    """
+    # Arrange
+    path = tmp_path / "books.snapshot"
+    path.write_bytes(b"nao e um snapshot da biblioteca digital" * 2)
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="não é um snapshot"):
+        load_snapshot(path)
@@ -0,0 +1,185 @@
+# digital_library_pytest/tests/test_process_manager.py
+
+import os
+import signal
+import threading
+
+import pytest
+from digital_library_pytest.book import Book
+from digital_library_pytest.process_manager import ProcessShardedBookManager, WorkerDiedError
+from digital_library_pytest.tests import make_isbn
+
+
+@pytest.fixture
+def process_manager():
+    """Fixture que retorna um ProcessShardedBookManager com três processos e dois livros."""
+    manager = ProcessShardedBookManager(workers=3)
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225028"))
+    manager.add_book(Book("Clean Code", "Robert C. Martin", "978-0132350884"))
+    yield manager
+    manager.close()
+
+
+def test_process_manager_keeps_book_manager_contract(process_manager):
+    """
+    RF001-RF004: Testa ordem de listagem, duplicidade, marcação e remoção.
+    """
+    # Act
+    process_manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    process_manager.mark_as_read("978-0441172719")
+    process_manager.remove_book("978-8575225028")
+
+    # Assert
+    assert [repr(book) for book in process_manager.list_books()] == [
+        "Book(title='Clean Code', author='Robert C. Martin', isbn='978-0132350884', read=False)",
+        "Book(title='Duna', author='Frank Herbert', isbn='978-0441172719', read=True)",
+    ]
+    assert len(process_manager) == 2
+    assert process_manager.version == 5
+    assert "978-0441172719" in process_manager
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        process_manager.add_book(Book("Outro", "Outro Autor", "978-0132350884"))
+    with pytest.raises(ValueError, match="Livro com ISBN '999-9999999999' não encontrado."):
+        process_manager.mark_as_read("999-9999999999")
+
+
+def test_process_manager_scatter_gather_queries(process_manager):
+    """
+    RF002, RF005: Testa paginação, buscas, ordenação, filtros e contagens com
+    livros espalhados pelos processos.
+    """
+    # Arrange
+    process_manager.add_books(Book(f"Livro {index:02d}", "Autor", make_isbn(index)) for index in range(20))
+    process_manager.mark_many_as_read([make_isbn(index) for index in range(0, 20, 5)])
+
+    # Act
+    isbns, cursor = [], None
+    while True:
+        books, cursor = process_manager.books_page(cursor, limit=6)
+        isbns.extend(book.isbn for book in books)
+        if cursor is None:
+            break
+    by_title, _ = process_manager.sorted_page("title", limit=3)
+
+    # Assert
+    assert isbns == ["978-8575225028", "978-0132350884"] + [make_isbn(index) for index in range(20)]
+    assert [book.isbn for book in process_manager.search_books("livro 1", limit=2)] == [make_isbn(10), make_isbn(11)]
+    assert [book.title for book in process_manager.search_books("Ramalo", fuzzy=True)] == ["Python Fluente"]
+    assert [book.title for book in by_title] == ["Clean Code", "Livro 00", "Livro 01"]
+    assert [book.isbn for book in process_manager.filter_books(read=True)] == [
+        make_isbn(index) for index in range(0, 20, 5)
+    ]
+    assert process_manager.count_books(author="autor") == 20
+
+
+def test_process_manager_listing_follows_shard_changes(process_manager):
+    """
+    Testa se a listagem, atualizada com as mudanças de cada shard, acompanha
+    inclusões, marcações, remoções e reinclusões sem alterar listas já entregues.
+    """
+    # Arrange
+    process_manager.add_books(Book(f"Livro {index:02d}", "Autor", make_isbn(index)) for index in range(6))
+    before = process_manager.list_books()
+    entries = process_manager._ordered_entries()
+
+    # Act
+    process_manager.mark_as_read(make_isbn(1))
+    process_manager.remove_many([make_isbn(2), "978-8575225028"])
+    process_manager.add_book(Book("Livro 02", "Autor", make_isbn(2)))
+    process_manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+
+    # Assert
+    assert [(book.isbn, book.read) for book in process_manager.list_books()] == [
+        ("978-0132350884", False), (make_isbn(0), False), (make_isbn(1), True), (make_isbn(3), False),
+        (make_isbn(4), False), (make_isbn(5), False), (make_isbn(2), False), ("978-0441172719", False),
+    ]
+    assert [book.isbn for book in before] == [book.isbn for _, book in entries]
+    assert len(entries) == 8
+    assert [seq for seq, _ in process_manager.iter_books(after=entries[-1][0])] == [9, 10]
+
+
+def test_process_manager_listing_after_journal_overflow():
+    """
+    Testa se um shard cujo journal não cobre mais a versão listada é enviado inteiro.
+    """
+    # Arrange
+    manager = ProcessShardedBookManager(workers=2)
+    manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+    manager.list_books()
+
+    # Act
+    manager.add_books(Book(f"Livro {index}", "Autor", make_isbn(index)) for index in range(10_001))
+    isbns = [book.isbn for book in manager.list_books()]
+
+    # Assert
+    assert isbns == ["978-0441172719"] + [make_isbn(index) for index in range(10_001)]
+    manager.close()
+
+
+def test_process_manager_batches_are_all_or_nothing(process_manager):
+    """
+    Testa se as inclusões, marcações e remoções em lote não alteram nenhum
+    processo quando algum ISBN é inválido.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        process_manager.add_books([Book("Duna", "Frank Herbert", "978-0441172719"),
+                                   Book("Outro", "Outro Autor", "978-0132350884")])
+    with pytest.raises(ValueError, match="nenhuma alteração foi feita"):
+        process_manager.remove_many(["978-8575225028", "978-0441172719"])
+    assert len(process_manager) == 2
+
+    assert process_manager.remove_many(["978-8575225028", "978-0441172719"], partial=True) == {
+        "978-8575225028": "removed", "978-0441172719": "not_found"
+    }
+    assert [book.isbn for book in process_manager.list_books()] == ["978-0132350884"]
+
+    assert process_manager.add_books([Book("Clean Code", "Robert C. Martin", "978-0132350884"),
+                                      Book("Duna", "Frank Herbert", "978-0441172719"),
+                                      Book("Duna de novo", "Frank Herbert", "978-0441172719")], partial=True) == [
+        "already_exists", "added", "already_exists"
+    ]
+    assert [book.isbn for book in process_manager.list_books()] == ["978-0132350884", "978-0441172719"]
+
+
+def test_process_manager_dead_worker_does_not_desync_others(process_manager):
+    """
+    Testa se a morte do processo de um shard levanta WorkerDiedError nas
+    operações que dependem dele, sem misturar as respostas dos demais processos.
+    """
+    # Arrange
+    first, dead, last = process_manager._workers
+    expected = [process_manager._call(first, "size"), process_manager._call(last, "size")]
+    os.kill(dead.process.pid, signal.SIGKILL)
+    dead.process.join()
+
+    # Act & Assert
+    for _ in range(2):
+        with pytest.raises(WorkerDiedError, match="shard 1"):
+            process_manager.count_books()
+    assert [process_manager._call(first, "size"), process_manager._call(last, "size")] == expected
+
+
+def test_process_manager_concurrent_writers():
+    """
+    Testa se escritas de várias threads, em processos diferentes, não perdem livros.
+    """
+    # Arrange
+    manager = ProcessShardedBookManager(workers=2)
+
+    def add_range(start):
+        for index in range(start, start + 50):
+            manager.add_book(Book(f"Livro {index}", "Autor", make_isbn(index)))
+
+    threads = [threading.Thread(target=add_range, args=(start,)) for start in range(0, 200, 50)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert len(manager) == 200
+    assert len({book.isbn for book in manager.list_books()}) == 200
+    manager.close()
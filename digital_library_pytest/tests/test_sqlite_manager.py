@@ -0,0 +1,252 @@
+# digital_library_pytest/tests/test_sqlite_manager.py
+
+import threading
+
+import pytest
+from digital_library_pytest.book import Book
+from digital_library_pytest.sqlite_manager import SQLiteBookManager
+from digital_library_pytest.tests import make_isbn
+
+
+@pytest.fixture
+def sqlite_manager(tmp_path):
+    """Fixture que retorna um SQLiteBookManager em um arquivo temporário, com dois livros."""
+    manager = SQLiteBookManager(str(tmp_path / "books.db"))
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "978-8575225028"))
+    manager.add_book(Book("Clean Code", "Robert C. Martin", "978-0132350884"))
+    yield manager
+    manager.close()
+
+
+def test_sqlite_list_books_in_insertion_order(sqlite_manager):
+    """
+    RF002: Testa se os livros são listados na ordem de inserção.
+    """
+    # Act
+    books = sqlite_manager.list_books()
+
+    # Assert
+    assert [book.isbn for book in books] == ["978-8575225028", "978-0132350884"]
+    assert len(sqlite_manager) == 2
+
+
+def test_sqlite_add_duplicate_raises_same_error(sqlite_manager):
+    """
+    RF001: Testa se a duplicidade de ISBN levanta o mesmo ValueError do BookManager.
+    """
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        sqlite_manager.add_book(Book("Outro", "Outro Autor", "978-8575225028"))
+
+
+def test_sqlite_mark_and_remove(sqlite_manager):
+    """
+    RF003, RF004: Testa marcação e remoção, incluindo os erros para ISBN inexistente.
+    """
+    # Act
+    sqlite_manager.mark_as_read("978-0132350884")
+    sqlite_manager.remove_book("978-8575225028")
+
+    # Assert
+    assert [repr(book) for book in sqlite_manager.list_books()] == [
+        "Book(title='Clean Code', author='Robert C. Martin', isbn='978-0132350884', read=True)"
+    ]
+    with pytest.raises(ValueError, match="Livro com ISBN '999-9999999999' não encontrado."):
+        sqlite_manager.mark_as_read("999-9999999999")
+    with pytest.raises(ValueError, match="Livro com ISBN '999-9999999999' não encontrado para remoção."):
+        sqlite_manager.remove_book("999-9999999999")
+
+
+def test_sqlite_import_reports_duplicates(sqlite_manager):
+    """
+    Testa se a importação em lote registra ISBNs já existentes no banco.
+    """
+    # Arrange
+    rows = [
+        (1, ("Duna", "Frank Herbert", "978-0441172719", "true")),
+        (2, ("Clean Code", "Robert C. Martin", "978-0132350884", "")),
+    ]
+
+    # Act
+    report = sqlite_manager.import_books(rows)
+
+    # Assert
+    assert report.imported == 1
+    assert report.errors == [(2, "Livro com este ISBN já existe na biblioteca.")]
+    assert sqlite_manager.list_books()[-1].read is True
+
+
+def test_sqlite_concurrent_writers(tmp_path):
+    """
+    Testa se escritas concorrentes por várias threads, via pool, não perdem livros.
+    """
+    # Arrange
+    manager = SQLiteBookManager(str(tmp_path / "books.db"), pool_size=4)
+
+    def add_range(start):
+        for index in range(start, start + 50):
+            manager.add_book(Book(f"Livro {index}", "Autor", make_isbn(index)))
+
+    threads = [threading.Thread(target=add_range, args=(start,)) for start in range(0, 400, 50)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert len(manager) == 400
+    manager.close()
+
+
+def test_sqlite_books_page(sqlite_manager):
+    """
+    RF002: Testa a paginação por cursor sobre o id das linhas.
+    """
+    # Act
+    first_page, cursor = sqlite_manager.books_page(limit=1)
+    second_page, last_cursor = sqlite_manager.books_page(cursor, limit=1)
+
+    # Assert
+    assert [book.isbn for book in first_page + second_page] == ["978-8575225028", "978-0132350884"]
+    assert last_cursor is None
+    assert [book.isbn for _, book in sqlite_manager.iter_books(cursor)] == ["978-0132350884"]
+
+
+def test_sqlite_version_is_bumped_by_mutations(sqlite_manager):
+    """
+    Testa se a versão gravada no banco acompanha as mutações.
+    """
+    # Arrange
+    version = sqlite_manager.version
+
+    # Act
+    sqlite_manager.mark_as_read("978-0132350884")
+    sqlite_manager.mark_as_read("978-0132350884") # Já lido: não é uma mutação
+    sqlite_manager.remove_book("978-8575225028")
+
+    # Assert
+    assert sqlite_manager.version == version + 2
+
+
+def test_sqlite_changes_since_survives_reopening(tmp_path):
+    """
+    Testa se changes_since lê as mudanças gravadas no banco, mesmo depois de
+    reabri-lo, e pede uma ressincronização quando o journal não cobre mais a versão.
+    """
+    # Arrange
+    path = str(tmp_path / "books.db")
+    manager = SQLiteBookManager(path, journal_size=3)
+    manager.add_book(Book("Python Fluente", "Luciano Ramalho", "8575225022")) # ISBN-10
+    version = manager.version
+    manager.add_books([Book("Duna", "Frank Herbert", "978-0441172719")])
+    manager.mark_many_as_read(["978-0441172719"])
+    manager.close()
+
+    # Act
+    manager = SQLiteBookManager(path, journal_size=3)
+    changes = manager.changes_since(version)
+    manager.remove_book("978-8575225028") # A outra grafia do mesmo ISBN
+    manager.add_book(Book("Clean Code", "Robert C. Martin", "978-0132350884"))
+
+    # Assert
+    assert [(operation, book.isbn, book.read) for operation, book in changes] == [("add", "978-0441172719", True)]
+    assert manager.changes_since(version + 2) == [
+        ("remove", "8575225022"), ("add", manager.list_books()[-1]),
+    ]
+    assert manager.changes_since(version) is None # Entradas descartadas pelo tamanho do journal
+    assert manager.changes_since(manager.version + 1) is None
+    manager.close()
+
+
+def test_sqlite_filter_and_count(sqlite_manager):
+    """
+    Testa os filtros por autor e status de leitura no SQLite.
+    """
+    # Arrange
+    sqlite_manager.add_book(Book("Refactoring", "Robert C. Martin", "978-0201485677"))
+    sqlite_manager.mark_as_read("978-0132350884")
+
+    # Act & Assert
+    assert [book.isbn for book in sqlite_manager.filter_books(author="robert c. martin")] == [
+        "978-0132350884", "978-0201485677"
+    ]
+    assert [book.isbn for book in sqlite_manager.filter_books(read=False)] == ["978-8575225028", "978-0201485677"]
+    assert sqlite_manager.count_books(author="Robert C. Martin", read=True) == 1
+
+
+def test_sqlite_batch_mutations(sqlite_manager):
+    """
+    Testa marcação e remoção em lote no SQLite, tudo ou nada e parcial.
+    """
+    # Act & Assert
+    with pytest.raises(ValueError, match="não encontrados"):
+        sqlite_manager.mark_many_as_read(["978-0132350884", "999-9999999999"])
+    assert not any(book.read for book in sqlite_manager.list_books())
+
+    assert sqlite_manager.mark_many_as_read(["978-0132350884"]) == {"978-0132350884": "marked"}
+    assert sqlite_manager.remove_many(["978-8575225028", "999-9999999999"], partial=True) == {
+        "978-8575225028": "removed", "999-9999999999": "not_found"
+    }
+    assert [repr(book) for book in sqlite_manager.list_books()] == [
+        "Book(title='Clean Code', author='Robert C. Martin', isbn='978-0132350884', read=True)"
+    ]
+
+
+def test_sqlite_sorted_page(sqlite_manager):
+    """
+    Testa as páginas ordenadas por título e por autor no SQLite.
+    """
+    # Arrange
+    sqlite_manager.add_book(Book("duna", "Frank Herbert", "978-0441172719"))
+
+    # Act
+    first, cursor = sqlite_manager.sorted_page("title", limit=2)
+    second, last_cursor = sqlite_manager.sorted_page("title", cursor, limit=2)
+
+    # Assert
+    assert [book.title for book in first + second] == ["Clean Code", "duna", "Python Fluente"]
+    assert last_cursor is None
+    by_author, _ = sqlite_manager.sorted_page("author", start="G", limit=5)
+    assert [book.author for book in by_author] == ["Luciano Ramalho", "Robert C. Martin"]
+
+
+def test_sqlite_fuzzy_search(sqlite_manager):
+    """
+    RF005: Testa a busca tolerante a erros de digitação no SQLite.
+    """
+    # Arrange
+    sqlite_manager.add_book(Book("Duna", "Frank Herbert", "978-0441172719"))
+
+    # Act
+    ranked = sqlite_manager.fuzzy_matches("Ramalo pyton")
+
+    # Assert
+    assert [book.isbn for _, book in ranked] == ["978-8575225028"]
+    assert [book.isbn for book in sqlite_manager.search_books("herbet", fuzzy=True)] == ["978-0441172719"]
+
+
+def test_sqlite_add_books_is_all_or_nothing(sqlite_manager):
+    """
+    Testa a inclusão em lote no SQLite, em uma única transação.
+    """
+    # Arrange
+    version = sqlite_manager.version
+
+    # Act & Assert
+    with pytest.raises(ValueError, match="Livro com este ISBN já existe na biblioteca."):
+        sqlite_manager.add_books([Book("Duna", "Frank Herbert", "978-0441172719"),
+                                  Book("Outro", "Outro Autor", "978-0132350884")])
+    assert len(sqlite_manager) == 2
+
+    sqlite_manager.add_books([Book("Duna", "Frank Herbert", "978-0441172719"),
+                              Book("Refactoring", "Martin Fowler", "978-0201485677")])
+    assert len(sqlite_manager) == 4
+    assert sqlite_manager.version == version + 1
+
+    assert sqlite_manager.add_books([Book("Duna de novo", "Frank Herbert", "978-0441172719"),
+                                     Book("Domain-Driven Design", "Eric Evans", "978-0321125217"),
+                                     Book("DDD", "Eric Evans", "978-0321125217")], partial=True) == [
+        "already_exists", "added", "already_exists"
+    ]
+    assert len(sqlite_manager) == 5